@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+ASR Backends
+Interchangeable speech recognition engines behind one Whisper-style interface
+"""
+
+import importlib.util
+import zlib
+
+import numpy as np
+
+class ASRBackend:
+    """Base class for speech recognition engines.
+
+    `transcribe` returns an openai-whisper style dict: 'text', 'language'
+    and 'segments', where each segment has 'start', 'end', 'text',
+    'avg_logprob', 'no_speech_prob', 'compression_ratio' and, when word
+    timestamps are requested, 'words' ({'word', 'start', 'end', 'probability'}).
+
+    The `max_tokens` option caps the tokens decoded per 30 s window, which
+    bounds how long a repetition loop can run.
+    """
+
+    name = 'base'
+    requires = ()  # importable modules the backend needs
+    sample_rate = 16000  # input audio rate every backend expects
+
+    def __init__(self, model_size='base', language='sq'):
+        self.model_size = model_size
+        self.language = language
+        self.model = None
+
+    @classmethod
+    def is_available(cls):
+        """Cheap check that the backend's packages are installed (no import)"""
+        return all(importlib.util.find_spec(module) is not None for module in cls.requires)
+
+    @property
+    def is_loaded(self):
+        return self.model is not None
+
+    def load(self):
+        """Load model weights; safe to call more than once"""
+        raise NotImplementedError
+
+    def transcribe(self, audio, word_timestamps=False, initial_prompt=None,
+                   condition_on_previous_text=False, **options):
+        """Transcribe float32 16 kHz mono audio"""
+        raise NotImplementedError
+
+    def no_speech_probability(self, audio, mel=None):
+        """Probability that the audio holds no speech, from the first decoder step
+
+        `mel` is an optional precomputed Whisper log-mel window (n_mels x 3000).
+        Returns None when the backend has no cheap way to tell.
+        """
+        return None
+
+    def align(self, audio, text):
+        """Word timings for known text without decoding it again
+
+        Returns [{'word', 'start', 'end', 'probability'}] (seconds from the
+        audio start), or None when the backend cannot force-align.
+        """
+        return None
+
+    def clone(self, model_size=None):
+        """A new, unloaded backend with the same settings (one per worker thread)"""
+        return type(self)(model_size=model_size or self.model_size, language=self.language)
+
+    def describe(self):
+        return f"{self.name} ({self.model_size})"
+
+class WhisperBackend(ASRBackend):
+    name = 'whisper'
+    requires = ('whisper', 'torch')
+
+    def load(self):
+        if self.model is None:
+            import whisper
+            self.model = whisper.load_model(self.model_size)
+        return self.model
+
+    def transcribe(self, audio, word_timestamps=False, initial_prompt=None,
+                   condition_on_previous_text=False, **options):
+        return self.model.transcribe(
+            audio,
+            language=self.language,
+            fp16=False,         # CPU inference
+            temperature=options.pop('temperature', 0.0),
+            sample_len=options.pop('max_tokens', None),
+            word_timestamps=word_timestamps,
+            condition_on_previous_text=condition_on_previous_text,
+            initial_prompt=initial_prompt,
+            **options
+        )
+
+    def no_speech_probability(self, audio, mel=None):
+        # One encoder pass and a single decoder step on the start-of-transcript
+        # sequence - the same <|nospeech|> probability Whisper computes before
+        # decoding, without the beam search or word-timestamp alignment
+        import torch
+        import whisper
+        from whisper.tokenizer import get_tokenizer
+
+        model = self.model
+        tokenizer = get_tokenizer(
+            model.is_multilingual,
+            num_languages=getattr(model, 'num_languages', 99),
+            language=self.language,
+            task='transcribe'
+        )
+        if tokenizer.no_speech is None:
+            return None
+
+        if mel is not None and mel.shape[0] == model.dims.n_mels:
+            mel = torch.from_numpy(mel)
+        else:
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=model.dims.n_mels)
+        with torch.no_grad():
+            features = model.embed_audio(mel.unsqueeze(0).to(model.device))
+            tokens = torch.tensor([list(tokenizer.sot_sequence)], device=model.device)
+            logits = model.logits(tokens, features)
+            probabilities = logits[0, 0].float().softmax(dim=-1)
+        return float(probabilities[tokenizer.no_speech])
+
+    def align(self, audio, text):
+        # The same cross-attention DTW that word_timestamps=True runs, but on
+        # the final text only (one forward pass, no decoding)
+        import torch
+        from whisper.audio import N_FRAMES, log_mel_spectrogram, pad_or_trim
+        from whisper.timing import find_alignment
+        from whisper.tokenizer import get_tokenizer
+
+        model = self.model
+        tokenizer = get_tokenizer(
+            model.is_multilingual,
+            num_languages=getattr(model, 'num_languages', 99),
+            language=self.language,
+            task='transcribe'
+        )
+        text_tokens = tokenizer.encode(' ' + text.strip())
+        if not text_tokens:
+            return []
+
+        mel = log_mel_spectrogram(torch.from_numpy(np.asarray(audio, dtype=np.float32)), model.dims.n_mels)
+        num_frames = min(mel.shape[-1], N_FRAMES)
+        mel = pad_or_trim(mel, N_FRAMES).to(model.device)
+
+        with torch.no_grad():
+            timings = find_alignment(model, tokenizer, text_tokens, mel, num_frames)
+        return [
+            {'word': t.word, 'start': float(t.start), 'end': float(t.end), 'probability': float(t.probability)}
+            for t in timings if t.word
+        ]
+
+class QuantizedWhisperBackend(WhisperBackend):
+    """openai-whisper with int8 dynamic quantization of its Linear layers (cached on disk)"""
+
+    name = 'whisper-int8'
+
+    def load(self):
+        if self.model is None:
+            from model_quantization import load_quantized_whisper
+            self.model = load_quantized_whisper(self.model_size)
+        return self.model
+
+class SpeculativeWhisperBackend(WhisperBackend):
+    """openai-whisper greedy decoding with a tiny draft model proposing tokens
+
+    The transcript is the larger model's own greedy output; the draft only
+    saves target decoder passes. Beam search is not supported - requested
+    beam sizes are ignored.
+    """
+
+    name = 'whisper-speculative'
+
+    def __init__(self, model_size='small', language='sq', draft_size='tiny', draft_tokens=4):
+        super().__init__(model_size=model_size, language=language)
+        self.draft_size = draft_size
+        self.draft_tokens = draft_tokens
+        self.decoder = None
+
+    def load(self):
+        if self.model is None:
+            import whisper
+            from speculative_decoding import SpeculativeDecoder
+            model = whisper.load_model(self.model_size, device='cpu')
+            draft = whisper.load_model(self.draft_size, device='cpu')
+            self.decoder = SpeculativeDecoder(model, draft, language=self.language,
+                                              draft_tokens=self.draft_tokens)
+            self.model = model
+        return self.model
+
+    def transcribe(self, audio, word_timestamps=False, initial_prompt=None,
+                   condition_on_previous_text=False, **options):
+        return self.decoder.transcribe(
+            audio,
+            initial_prompt=initial_prompt,
+            condition_on_previous_text=condition_on_previous_text,
+            word_timestamps=word_timestamps,
+            max_tokens=options.get('max_tokens')
+        )
+
+    def get_stats(self):
+        return self.decoder.get_stats() if self.decoder else None
+
+    def clone(self, model_size=None):
+        return type(self)(model_size=model_size or self.model_size, language=self.language,
+                          draft_size=self.draft_size, draft_tokens=self.draft_tokens)
+
+    def describe(self):
+        return f"{self.name} ({self.draft_size} → {self.model_size})"
+
+class FasterWhisperBackend(ASRBackend):
+    """CTranslate2 Whisper with int8 weights - the fast path on CPU-only machines"""
+
+    name = 'faster-whisper'
+    requires = ('faster_whisper',)
+
+    def __init__(self, model_size='base', language='sq', compute_type='int8', cpu_threads=0):
+        super().__init__(model_size=model_size, language=language)
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+
+    def load(self):
+        if self.model is None:
+            from faster_whisper import WhisperModel
+            self.model = WhisperModel(
+                self.model_size,
+                device='cpu',
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads
+            )
+        return self.model
+
+    def transcribe(self, audio, word_timestamps=False, initial_prompt=None,
+                   condition_on_previous_text=False, **options):
+        segments, info = self.model.transcribe(
+            audio,
+            language=self.language,
+            beam_size=options.pop('beam_size', 1) or 1,
+            temperature=options.pop('temperature', 0.0),
+            max_new_tokens=options.pop('max_tokens', None),
+            word_timestamps=word_timestamps,
+            initial_prompt=initial_prompt,
+            condition_on_previous_text=condition_on_previous_text,
+            vad_filter=False,   # our own VAD already cut the audio
+            **options
+        )
+
+        result_segments = []
+        for segment in segments:
+            entry = {
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'avg_logprob': segment.avg_logprob,
+                'no_speech_prob': segment.no_speech_prob,
+                'compression_ratio': segment.compression_ratio,
+            }
+            if word_timestamps and segment.words:
+                entry['words'] = [
+                    {'word': w.word, 'start': w.start, 'end': w.end, 'probability': w.probability}
+                    for w in segment.words
+                ]
+            result_segments.append(entry)
+
+        return {
+            'text': ''.join(s['text'] for s in result_segments),
+            'segments': result_segments,
+            'language': info.language,
+        }
+
+    def clone(self, model_size=None):
+        return type(self)(model_size=model_size or self.model_size, language=self.language,
+                          compute_type=self.compute_type, cpu_threads=self.cpu_threads)
+
+class FakeBackend(ASRBackend):
+    """Deterministic stand-in for tests and demos - no model, no randomness
+
+    Emits one word per 0.4 s of audio louder than the threshold. Word text is
+    derived from the audio energy so identical input always gives identical
+    output.
+    """
+
+    name = 'fake'
+    word_seconds = 0.4
+    energy_threshold = 0.01
+
+    def load(self):
+        self.model = self.name
+        return self.model
+
+    def transcribe(self, audio, word_timestamps=False, initial_prompt=None,
+                   condition_on_previous_text=False, sample_rate=16000, **options):
+        step = int(self.word_seconds * sample_rate)
+        n_words = len(audio) // step
+        words = []
+        if n_words:
+            frames = np.asarray(audio[:n_words * step], dtype=np.float32).reshape(n_words, step)
+            energies = np.sqrt(np.mean(frames ** 2, axis=1))
+            for i, energy in enumerate(energies):
+                if energy < self.energy_threshold:
+                    continue
+                words.append({
+                    'word': f" fjala{int(energy * 1000) % 97}",
+                    'start': i * self.word_seconds,
+                    'end': (i + 1) * self.word_seconds,
+                    'probability': 0.9,
+                })
+
+        text = ''.join(w['word'] for w in words)
+        segment = {
+            'start': 0.0,
+            'end': len(audio) / sample_rate,
+            'text': text,
+            'avg_logprob': -0.2 if words else -1.5,
+            'no_speech_prob': 0.05 if words else 0.9,
+            'compression_ratio': compression_ratio(text),
+        }
+        if word_timestamps:
+            segment['words'] = words
+
+        return {'text': text, 'segments': [segment] if words else [], 'language': self.language}
+
+def compression_ratio(text):
+    """gzip-style compression ratio Whisper uses to spot repetition loops"""
+    data = text.encode('utf-8')
+    return len(data) / len(zlib.compress(data)) if data else 0.0
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    QuantizedWhisperBackend.name: QuantizedWhisperBackend,
+    SpeculativeWhisperBackend.name: SpeculativeWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    FakeBackend.name: FakeBackend,
+}
+
+def create_backend(name='whisper', **kwargs):
+    """Instantiate a backend by name, falling back to openai-whisper when unavailable"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown ASR backend: {name} (expected one of {', '.join(BACKENDS)})")
+
+    backend_class = BACKENDS[name]
+    if not backend_class.is_available():
+        print(f"⚠ ASR backend '{name}' not installed")
+        if issubclass(backend_class, WhisperBackend) or not WhisperBackend.is_available():
+            return None
+        print("  Falling back to openai-whisper")
+        backend_class = WhisperBackend
+        kwargs = {key: value for key, value in kwargs.items() if key in ('model_size', 'language')}
+
+    return backend_class(**kwargs)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Meeting Audio Archive
+Consumes captured audio blocks from the bounded audio queue and writes them to WAV
+"""
+
+import threading
+import wave
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+class AudioArchiveWriter:
+    def __init__(self, audio_queue, sample_rate=16000, recordings_dir="recordings"):
+        self.audio_queue = audio_queue
+        self.sample_rate = sample_rate
+
+        # File paths
+        self.recordings_dir = Path(recordings_dir)
+        self.recordings_dir.mkdir(exist_ok=True)
+        self.archive_path = None
+
+        # Writer state
+        self.wav_file = None
+        self.writer_thread = None
+        self.running = False
+        self.samples_written = 0
+        self.gap_samples = 0  # silence inserted for blocks the queue dropped
+
+    def start(self, meeting_name=None):
+        """Open a new archive file and start consuming the queue"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        name = (meeting_name or "meeting").replace(' ', '_').replace(':', '')
+        self.archive_path = self.recordings_dir / f"{name}_{timestamp}.wav"
+
+        self.wav_file = wave.open(str(self.archive_path), 'wb')
+        self.wav_file.setnchannels(1)
+        self.wav_file.setsampwidth(2)
+        self.wav_file.setframerate(self.sample_rate)
+
+        self.samples_written = 0
+        self.gap_samples = 0
+        self.running = True
+        self.writer_thread = threading.Thread(target=self.writer_loop, daemon=True)
+        self.writer_thread.start()
+
+        print(f"💾 Archiving meeting audio to {self.archive_path}")
+        return str(self.archive_path)
+
+    def writer_loop(self):
+        """Drain (position, samples) blocks into the WAV file"""
+        while self.running or self.audio_queue.qsize():
+            item = self.audio_queue.get(timeout=0.5)
+            if item is None:
+                if self.audio_queue.closed:
+                    break
+                continue
+
+            try:
+                position, samples = item
+                self.write_block(position, samples)
+            except Exception as e:
+                print(f"⚠ Archive write error: {e}")
+
+    def write_block(self, position, samples):
+        """Write one block, padding gaps so file offsets match capture positions"""
+        if position > self.samples_written:
+            gap = position - self.samples_written
+            self.wav_file.writeframes(np.zeros(gap, dtype=np.int16).tobytes())
+            self.samples_written += gap
+            self.gap_samples += gap
+        elif position < self.samples_written:
+            # Overlaps what we already wrote - keep only the new tail
+            samples = samples[self.samples_written - position:]
+
+        pcm = np.clip(samples * 32768.0, -32768, 32767).astype(np.int16)
+        self.wav_file.writeframes(pcm.tobytes())
+        self.samples_written += len(pcm)
+
+    def stop(self):
+        """Flush queued audio and close the archive file"""
+        self.running = False
+        self.audio_queue.close()
+        if self.writer_thread:
+            # No timeout: the file is closed below, and readers expect every queued block in it
+            self.writer_thread.join()
+            self.writer_thread = None
+
+        if self.wav_file:
+            self.wav_file.close()
+            self.wav_file = None
+
+        duration = self.samples_written / self.sample_rate
+        print(f"💾 Archived {duration:.1f}s of audio ({self.gap_samples / self.sample_rate:.1f}s gaps)")
+        return str(self.archive_path) if self.archive_path else None
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Callback Audio Capture
+Loss-free PyAudio capture that writes into a preallocated ring buffer
+"""
+
+import time
+import numpy as np
+
+from audio_ring_buffer import AudioRingBuffer
+from lazy_imports import lazy_import
+
+# Imported when the first stream is opened, not at startup
+pyaudio = lazy_import('pyaudiowpatch', 'pyaudio')
+
+# PortAudio status flags (fixed by the PortAudio API, same in pyaudio and pyaudiowpatch)
+PA_INPUT_UNDERFLOW = 0x1
+PA_INPUT_OVERFLOW = 0x2
+PA_CONTINUE = 0
+
+# Clock anchors kept: one per callback, ~4 minutes at 1024-frame buffers
+CLOCK_ANCHORS = 4096
+
+class CallbackAudioCapture:
+    def __init__(self, sample_rate=16000, channels=1, frames_per_buffer=1024, buffer_seconds=60):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames_per_buffer = frames_per_buffer
+
+        # Mono samples normalized to float32 on write, sized to ride out long stalls downstream
+        self.ring = AudioRingBuffer(sample_rate * buffer_seconds, dtype=np.float32)
+
+        self.stream = None
+        self.read_position = 0
+        self.start_time = None  # wall-clock time the stream was opened
+
+        # (write position, time.time()) at every callback: the device clock drifts
+        # against the system clock and loopback streams stall, so sample counts
+        # alone do not give wall-clock time. Preallocated - the callback only stores.
+        self.anchor_positions = np.zeros(CLOCK_ANCHORS, dtype=np.int64)
+        self.anchor_times = np.zeros(CLOCK_ANCHORS, dtype=np.float64)
+        self.anchor_count = 0
+
+        self.stats = {
+            'callbacks': 0,
+            'frames_captured': 0,
+            'input_overflows': 0,   # PortAudio dropped input before our callback ran
+            'input_underflows': 0,
+            'reader_underruns': 0,  # reader asked for a block that never arrived in time
+        }
+
+    def start(self, audio, device_index=None, audio_format=None):
+        """Open a callback-driven input stream on an initialized PyAudio instance"""
+        self.ring.reset()
+        self.read_position = 0
+        self.start_time = time.time()
+        self.anchor_count = 0
+        for key in self.stats:
+            self.stats[key] = 0
+
+        self.stream = audio.open(
+            format=audio_format if audio_format is not None else pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            input_device_index=device_index,
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=self._stream_callback
+        )
+        self.stream.start_stream()
+        return self.stream
+
+    def _stream_callback(self, in_data, frame_count, time_info, status_flags):
+        """PortAudio callback - must stay allocation-light and never block"""
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1).astype(np.int16)
+
+        self.ring.write(samples)
+
+        # The block's last sample has just arrived
+        slot = self.anchor_count % CLOCK_ANCHORS
+        self.anchor_positions[slot] = self.ring.write_position
+        self.anchor_times[slot] = time.time()
+        self.anchor_count += 1
+
+        self.stats['callbacks'] += 1
+        self.stats['frames_captured'] += frame_count
+        if status_flags & PA_INPUT_OVERFLOW:
+            self.stats['input_overflows'] += 1
+        if status_flags & PA_INPUT_UNDERFLOW:
+            self.stats['input_underflows'] += 1
+
+        return (None, PA_CONTINUE)
+
+    def read_block(self, block_size, timeout=1.0):
+        """Return the next (start_position, samples) block, or None on timeout
+
+        Blocks are contiguous and sample-accurate: each one starts exactly
+        where the previous one ended unless the ring buffer overran. Samples
+        are a zero-copy float32 view into the ring buffer.
+        """
+        if not self.ring.wait_for(self.read_position + block_size, timeout):
+            if not self.ring.closed:
+                self.stats['reader_underruns'] += 1
+            return None
+
+        start, samples = self.ring.view(self.read_position, block_size)
+        self.read_position = start + len(samples)
+        return start, samples
+
+    def window(self, start, end):
+        """Zero-copy float32 view of samples in [start, end)"""
+        return self.ring.view(start, end - start)
+
+    def clock_anchors(self):
+        """Recorded (positions, times) in capture order"""
+        count = self.anchor_count
+        # Leave out the oldest slots - the callback may be overwriting them right now
+        kept = min(count, CLOCK_ANCHORS - 8)
+        slots = np.arange(count - kept, count) % CLOCK_ANCHORS
+        return self.anchor_positions[slots], self.anchor_times[slots]
+
+    def position_to_time(self, position):
+        """Convert an absolute sample position to wall-clock time
+
+        Interpolated between the callback anchors around it, so clock drift
+        and stalls before it do not shift the result. Outside the anchored
+        range it extrapolates at the nominal sample rate.
+        """
+        positions, times = self.clock_anchors()
+        if len(positions) == 0:
+            return (self.start_time or 0) + position / self.sample_rate
+        if position <= positions[0]:
+            return times[0] - (positions[0] - position) / self.sample_rate
+        if position >= positions[-1]:
+            return times[-1] + (position - positions[-1]) / self.sample_rate
+        return float(np.interp(position, positions, times))
+
+    def arrival_time(self, position):
+        """Wall-clock time the sample at `position` was handed to us (its callback's anchor)
+
+        This is when the audio became available, so time.time() minus it is
+        the pipeline's own latency - independent of clock drift and stalls.
+        """
+        positions, times = self.clock_anchors()
+        if len(positions) == 0 or position <= positions[0] - self.frames_per_buffer:
+            return self.position_to_time(position)
+        index = int(np.searchsorted(positions, position))
+        return float(times[min(index, len(times) - 1)])
+
+    def get_stats(self):
+        """Capture counters including ring buffer overruns"""
+        stats = dict(self.stats)
+        stats['ring_overruns'] = self.ring.overrun_count
+        stats['ring_overrun_samples'] = self.ring.overrun_samples
+        stats['buffered_samples'] = self.ring.write_position - self.read_position
+        return stats
+
+    def stop(self):
+        """Stop the stream and release waiting readers"""
+        if self.stream:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception as e:
+                print(f"⚠ Stream close error: {e}")
+            self.stream = None
+        self.ring.close()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Bounded Audio Queue
+Fixed-size hand-off queue with configurable backpressure and drop accounting
+"""
+
+import os
+import pickle
+import tempfile
+import threading
+from collections import deque
+
+import numpy as np
+
+POLICY_BLOCK = 'block'
+POLICY_DROP_OLDEST = 'drop_oldest'
+POLICY_DROP_NEWEST = 'drop_newest'
+POLICY_SPILL = 'spill_to_disk'
+
+POLICIES = (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_DROP_NEWEST, POLICY_SPILL)
+
+class BoundedAudioQueue:
+    def __init__(self, maxsize=256, policy=POLICY_DROP_OLDEST, block_timeout=None,
+                 spill_dir=None, copy_arrays=True, drop_callback=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy} (expected one of {', '.join(POLICIES)})")
+
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.spill_dir = spill_dir
+        self.copy_arrays = copy_arrays  # producers often hand us ring buffer views
+        self.drop_callback = drop_callback  # called with each discarded item
+
+        self.items = deque()
+        self.condition = threading.Condition()
+        self.closed = False
+
+        # Spill file state (only used by the spill_to_disk policy)
+        self.spill_file = None
+        self.spill_path = None
+        self.spill_count = 0
+        self.spill_read_offset = 0
+
+        self.stats = {
+            'put': 0,
+            'got': 0,
+            'high_water': 0,
+            'blocked': 0,          # block: producer had to wait
+            'block_timeouts': 0,   # block: gave up waiting, item dropped
+            'dropped_oldest': 0,   # drop_oldest: queued items discarded
+            'dropped_newest': 0,   # drop_newest: incoming items discarded
+            'spilled': 0,          # spill_to_disk: items written to disk
+            'unspilled': 0,        # spill_to_disk: items read back from disk
+        }
+
+    def put(self, item):
+        """Enqueue an item, applying the backpressure policy when full"""
+        if self.copy_arrays:
+            item = self._own(item)
+
+        with self.condition:
+            if self.closed:
+                return False
+
+            self.stats['put'] += 1
+
+            if self.spill_count or (self.policy == POLICY_SPILL and len(self.items) >= self.maxsize):
+                # Keep FIFO order: once spilling, everything goes to disk until it drains
+                # (even after a switch to another policy)
+                self._spill(item)
+                self.condition.notify()
+                return True
+
+            if len(self.items) >= self.maxsize:
+                if self.policy == POLICY_DROP_NEWEST:
+                    self.stats['dropped_newest'] += 1
+                    self._dropped(item)
+                    return False
+
+                if self.policy == POLICY_DROP_OLDEST:
+                    self._dropped(self.items.popleft())
+                    self.stats['dropped_oldest'] += 1
+
+                elif self.policy == POLICY_BLOCK:
+                    self.stats['blocked'] += 1
+                    if not self.condition.wait_for(
+                        lambda: len(self.items) < self.maxsize or self.closed,
+                        self.block_timeout
+                    ) or self.closed:
+                        self.stats['block_timeouts'] += 1
+                        self._dropped(item)
+                        return False
+
+            self.items.append(item)
+            self.stats['high_water'] = max(self.stats['high_water'], len(self.items))
+            self.condition.notify()
+            return True
+
+    def get(self, timeout=None):
+        """Dequeue the oldest item, or None on timeout / when closed and empty"""
+        with self.condition:
+            if not self.condition.wait_for(
+                lambda: self.items or self.spill_count or self.closed,
+                timeout
+            ):
+                return None
+
+            if not self.items and self.spill_count:
+                self._unspill()
+            if not self.items:
+                return None
+
+            item = self.items.popleft()
+
+            # Refill memory from disk as space frees up
+            if self.spill_count and len(self.items) < self.maxsize // 2:
+                while self.spill_count and len(self.items) < self.maxsize:
+                    self._unspill()
+
+            self.stats['got'] += 1
+            self.condition.notify_all()
+            return item
+
+    def set_policy(self, policy):
+        """Switch the backpressure policy for items put from now on"""
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy} (expected one of {', '.join(POLICIES)})")
+        with self.condition:
+            self.policy = policy
+
+    def update_newest(self, update):
+        """Replace the newest queued item with update(item), unless that returns None
+
+        Only items still in memory qualify; spilled items are never rewritten.
+        """
+        with self.condition:
+            if self.spill_count or not self.items:
+                return False
+            replacement = update(self.items[-1])
+            if replacement is None:
+                return False
+            self.items[-1] = self._own(replacement) if self.copy_arrays else replacement
+            return True
+
+    def qsize(self):
+        """Number of queued items, including spilled ones"""
+        with self.condition:
+            return len(self.items) + self.spill_count
+
+    def _own(self, item):
+        """Copy numpy views so queued data cannot be overwritten by the producer"""
+        if isinstance(item, np.ndarray):
+            return item.copy()
+        if isinstance(item, tuple):
+            return tuple(self._own(x) for x in item)
+        if isinstance(item, dict):
+            return {key: value.copy() if isinstance(value, np.ndarray) else value for key, value in item.items()}
+        return item
+
+    def _dropped(self, item):
+        if self.drop_callback:
+            try:
+                self.drop_callback(item)
+            except Exception as e:
+                print(f"⚠ Drop callback error: {e}")
+
+    def _spill(self, item):
+        if self.spill_file is None:
+            fd, self.spill_path = tempfile.mkstemp(prefix='audio_spill_', suffix='.bin', dir=self.spill_dir)
+            self.spill_file = os.fdopen(fd, 'w+b')
+
+        self.spill_file.seek(0, os.SEEK_END)
+        pickle.dump(item, self.spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.spill_count += 1
+        self.stats['spilled'] += 1
+
+    def _unspill(self):
+        self.spill_file.seek(self.spill_read_offset)
+        item = pickle.load(self.spill_file)
+        self.spill_read_offset = self.spill_file.tell()
+        self.spill_count -= 1
+        self.stats['unspilled'] += 1
+
+        # Reclaim disk space once everything has been read back
+        if self.spill_count == 0:
+            self.spill_file.seek(0)
+            self.spill_file.truncate()
+            self.spill_read_offset = 0
+
+        self.items.append(item)
+
+    def get_stats(self):
+        """Counters plus current depth"""
+        with self.condition:
+            stats = dict(self.stats)
+            stats['policy'] = self.policy
+            stats['queued'] = len(self.items)
+            stats['queued_on_disk'] = self.spill_count
+            return stats
+
+    def close(self):
+        """Stop accepting items and wake up waiting producers/consumers"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def cleanup(self):
+        """Remove the spill file"""
+        if self.spill_file is not None:
+            try:
+                self.spill_file.close()
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+            self.spill_file = None
+            self.spill_path = None
+            self.spill_count = 0
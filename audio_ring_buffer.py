@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Audio Ring Buffer
+Preallocated sample ring buffer shared between the capture callback and readers
+"""
+
+import threading
+import numpy as np
+
+INT16_SCALE = 1.0 / 32768.0
+
+class AudioRingBuffer:
+    """Mirrored ring buffer of mono samples.
+
+    Every sample is stored twice, at `i` and `i + capacity`, so any window of
+    up to `capacity` samples is one contiguous slice. Readers get zero-copy
+    views instead of stitching wrapped halves together.
+
+    With a float32 buffer, int16 input is normalized to [-1, 1) while it is
+    written, so the conversion happens exactly once per sample.
+    """
+
+    def __init__(self, capacity_samples, dtype=np.float32):
+        self.capacity = int(capacity_samples)
+        self.dtype = np.dtype(dtype)
+        self.buffer = np.zeros(self.capacity * 2, dtype=self.dtype)
+
+        # Absolute sample positions (never wrap)
+        self.write_position = 0
+
+        # Accounting
+        self.overrun_samples = 0  # samples overwritten before a reader got them
+        self.overrun_count = 0
+
+        self.closed = False
+        self.condition = threading.Condition()
+
+    @property
+    def oldest_position(self):
+        """Oldest absolute position still held in the buffer"""
+        return max(0, self.write_position - self.capacity)
+
+    def write(self, samples):
+        """Append samples, overwriting the oldest data when full"""
+        samples = np.asarray(samples)
+        count = len(samples)
+        if count == 0:
+            return
+
+        # Only the newest `capacity` samples can survive a single write
+        skipped = max(0, count - self.capacity)
+        if skipped:
+            samples = samples[skipped:]
+
+        start = (self.write_position + skipped) % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self._store(start, samples[:first])
+        if first < len(samples):
+            self._store(0, samples[first:])
+
+        with self.condition:
+            self.write_position += count
+            self.condition.notify_all()
+
+    def _store(self, offset, samples):
+        """Write one unwrapped run into both mirror halves"""
+        n = len(samples)
+        primary = self.buffer[offset:offset + n]
+        if samples.dtype == np.int16 and self.dtype.kind == 'f':
+            np.multiply(samples, INT16_SCALE, out=primary, casting='unsafe')
+        else:
+            primary[...] = samples
+        mirror = offset + self.capacity
+        self.buffer[mirror:mirror + n] = primary
+
+    def wait_for(self, position, timeout=None):
+        """Block until samples up to `position` are available"""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: self.write_position >= position or self.closed,
+                timeout
+            ) and self.write_position >= position
+
+    def view(self, start, count):
+        """Zero-copy view of `count` samples from absolute position `start`
+
+        Returns (start, samples). If part of the requested range was already
+        overwritten, the range is moved forward to the oldest valid sample and
+        the loss is counted as an overrun. The view stays valid until the
+        writer laps it; use `is_valid` or `read` when holding it longer.
+        """
+        oldest = self.oldest_position
+        if start < oldest:
+            self._record_overrun(oldest - start)
+            start = oldest
+
+        count = max(0, min(count, self.write_position - start))
+        offset = start % self.capacity
+        return start, self.buffer[offset:offset + count]
+
+    def read(self, start, count):
+        """Like `view`, but returns an owned copy safe to keep indefinitely"""
+        start, samples = self.view(start, count)
+        out = samples.copy()
+
+        # The writer may have lapped us while copying
+        torn = self.oldest_position - start
+        if torn > 0:
+            drop = min(torn, len(out))
+            self._record_overrun(drop)
+            return start + drop, out[drop:]
+
+        return start, out
+
+    def is_valid(self, start):
+        """True if data from `start` onward has not been overwritten"""
+        return start >= self.oldest_position
+
+    def _record_overrun(self, samples):
+        self.overrun_samples += samples
+        self.overrun_count += 1
+
+    def close(self):
+        """Wake up all waiting readers"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def reset(self):
+        """Clear positions and counters for a new recording"""
+        with self.condition:
+            self.write_position = 0
+            self.overrun_samples = 0
+            self.overrun_count = 0
+            self.closed = False
+            self.buffer.fill(0)
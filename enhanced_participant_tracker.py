@@ -11,27 +11,26 @@ import json
 from datetime import datetime
 from collections import defaultdict
 
-# Multiple detection methods
-try:
-    import psutil
-    import win32gui
-    import win32process
-    import win32api
-    import win32con
-    WINDOWS_API_AVAILABLE = True
-except ImportError:
-    WINDOWS_API_AVAILABLE = False
+import numpy as np
 
-try:
-    import pygetwindow as gw
-    import pyautogui
-    import cv2
-    import numpy as np
-    from PIL import Image
-    import pytesseract
-    SCREEN_CAPTURE_AVAILABLE = True
-except ImportError:
-    SCREEN_CAPTURE_AVAILABLE = False
+from lazy_imports import has_capability, lazy_import
+from speaker_tiles import SpeakingIntervals, TileSpeakerLocator
+
+# Multiple detection methods - Windows API and screen capture packages are
+# probed now and imported on first use
+psutil = lazy_import('psutil')
+win32gui = lazy_import('win32gui')
+win32process = lazy_import('win32process')
+win32api = lazy_import('win32api')
+win32con = lazy_import('win32con')
+WINDOWS_API_AVAILABLE = has_capability('windows_api')
+
+gw = lazy_import('pygetwindow')
+pyautogui = lazy_import('pyautogui')
+cv2 = lazy_import('cv2')
+Image = lazy_import('PIL.Image')
+pytesseract = lazy_import('pytesseract')
+SCREEN_CAPTURE_AVAILABLE = has_capability('screen')
 
 class EnhancedParticipantTracker:
     def __init__(self):
@@ -56,6 +55,10 @@ class EnhancedParticipantTracker:
         self.check_interval = 1.0  # More frequent checking
         self.confidence_threshold = 0.7
         
+        # Speaking border -> gallery tile -> OCR'd name label
+        self.tile_locator = TileSpeakerLocator(read_name=self.read_tile_name)
+        self.speaking_intervals = SpeakingIntervals()
+        
         print("🔍 Enhanced Participant Tracker initialized")
         self.check_capabilities()
     
@@ -276,6 +279,15 @@ class EnhancedParticipantTracker:
         
         return list(set(names))  # Remove duplicates
     
+    def read_tile_name(self, label):
+        """OCR the name label of a gallery tile"""
+        gray = cv2.cvtColor(np.ascontiguousarray(label), cv2.COLOR_RGB2GRAY)
+        gray = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+        text = pytesseract.image_to_string(gray, config='--psm 7')
+        
+        names = self.extract_participant_names(text)
+        return names[0] if names else None
+    
     def detect_active_speakers(self):
         """Detect who is currently speaking"""
         speakers = {}
@@ -327,25 +339,40 @@ class EnhancedParticipantTracker:
                 teams_window.height - 200
             ))
             
-            # Convert to OpenCV format
-            frame = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-            
-            # Look for speaking indicators (green borders, waveforms)
-            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-            
-            # Green color range (speaking indicator)
-            lower_green = np.array([40, 50, 50])
-            upper_green = np.array([80, 255, 255])
-            green_mask = cv2.inRange(hsv, lower_green, upper_green)
+            # Find the tile carrying the speaking border and read its name label
+            participant_count = len(self.get_active_participants()) or None
+            tiles = self.tile_locator.locate(np.array(screenshot), participant_count)
             
-            # Count green pixels (speaking indicators)
-            green_pixels = cv2.countNonZero(green_mask)
-            
-            if green_pixels > 1000:  # Threshold for speaking indicator
-                speakers['visual_speaker'] = {
+            names = []
+            for name, score, (rows, cols, tile) in tiles:
+                if not name:
+                    # Label unreadable - still report that someone is speaking
+                    speakers['visual_speaker'] = {
+                        'active': True,
+                        'confidence': min(score, 1.0),
+                        'method': 'visual_detection'
+                    }
+                    continue
+                names.append(name)
+                speakers[name] = {
                     'active': True,
-                    'confidence': min(green_pixels / 10000, 1.0),
-                    'method': 'visual_detection'
+                    'confidence': min(score, 1.0),
+                    'method': 'tile_detection',
+                    'tile': (rows, cols, tile)
+                }
+            
+            # Interval bounds for the named speakers, plus those who stopped
+            current, ended = self.speaking_intervals.update(names, tick=self.check_interval)
+            for name, start, end in current:
+                speakers[name].update({'start': start, 'end': end})
+            for name, start, end in ended:
+                if name in self.participants:
+                    self.participants[name]['speaking_time'] += end - start
+                speakers[name] = {
+                    'active': False,
+                    'start': start,
+                    'end': end,
+                    'method': 'tile_detection'
                 }
         
         except Exception as e:
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Frame Features
+One vectorized STFT pass per audio hop shared by VAD, speech gate, speaker detection and Whisper's log-mel input
+"""
+
+import os
+
+import numpy as np
+
+from lazy_imports import is_installed
+
+class FrameFeatures:
+    """Per-frame features of a stretch of audio
+
+    Frame i is a 25 ms window centred on sample (first_frame + i) * hop, the
+    same framing as Whisper's log-mel spectrogram.
+    """
+
+    FIELDS = ('rms', 'zcr', 'energy', 'band_energy', 'flatness', 'centroid', 'log_mel')
+
+    def __init__(self, first_frame, hop, rms, zcr, energy, band_energy, flatness, centroid, log_mel):
+        self.first_frame = first_frame
+        self.hop = hop
+        self.rms = rms                  # RMS of the raw frame
+        self.zcr = zcr                  # zero-crossing rate
+        self.energy = energy            # total windowed power
+        self.band_energy = band_energy  # power in the 300-3400 Hz speech band
+        self.flatness = flatness        # spectral flatness (1.0 = white noise)
+        self.centroid = centroid        # spectral centroid in Hz
+        self.log_mel = log_mel          # log10 mel power, frames x n_mels
+
+    def __len__(self):
+        return len(self.rms)
+
+    @classmethod
+    def concatenate(cls, parts):
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return None
+        return cls(parts[0].first_frame, parts[0].hop,
+                   *(np.concatenate([getattr(part, field) for part in parts]) for field in cls.FIELDS))
+
+    def subset(self, first_frame, end_frame):
+        """Frames [first_frame, end_frame) by absolute frame index (copied)"""
+        a = max(0, first_frame - self.first_frame)
+        b = max(a, min(len(self), end_frame - self.first_frame))
+        return FrameFeatures(self.first_frame + a, self.hop,
+                             *(getattr(self, field)[a:b].copy() for field in self.FIELDS))
+
+    def overall_rms(self):
+        """RMS of the whole stretch (frames overlap evenly, so mean square carries over)"""
+        return float(np.sqrt(np.mean(self.rms ** 2))) if len(self) else 0.0
+
+    def whisper_mel(self, n_frames=3000):
+        """Normalized log-mel padded to one 30 s window - what Whisper's encoder takes"""
+        log_spec = self.log_mel.T[:, :n_frames]
+        floor = log_spec.max() - 8.0 if log_spec.size else -10.0
+        mel = np.full((self.log_mel.shape[1], n_frames), (floor + 4.0) / 4.0, dtype=np.float32)
+        mel[:, :log_spec.shape[1]] = (np.maximum(log_spec, floor) + 4.0) / 4.0
+        return mel
+
+def mel_filterbank(sample_rate=16000, n_fft=400, n_mels=80):
+    """Slaney-style mel filters (what Whisper ships), from Whisper's asset file when installed"""
+    if is_installed('whisper') and sample_rate == 16000 and n_fft == 400:
+        import importlib.util
+        assets = os.path.join(os.path.dirname(importlib.util.find_spec('whisper').origin), 'assets')
+        path = os.path.join(assets, 'mel_filters.npz')
+        if os.path.exists(path):
+            with np.load(path) as filters:
+                key = f"mel_{n_mels}"
+                if key in filters:
+                    return filters[key].astype(np.float32)
+
+    def hz_to_mel(hz):
+        hz = np.asarray(hz, dtype=np.float64)
+        linear = hz / (200.0 / 3)
+        return np.where(hz >= 1000.0, 15.0 + np.log(np.maximum(hz, 1e-10) / 1000.0) / (np.log(6.4) / 27), linear)
+
+    def mel_to_hz(mel):
+        return np.where(mel >= 15.0, 1000.0 * np.exp((np.log(6.4) / 27) * (mel - 15.0)), mel * (200.0 / 3))
+
+    edges = mel_to_hz(np.linspace(hz_to_mel(0.0), hz_to_mel(sample_rate / 2), n_mels + 2))
+    frequencies = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    ramps = edges[:, None] - frequencies[None, :]
+    widths = np.diff(edges)
+    lower = -ramps[:-2] / widths[:-1, None]
+    upper = ramps[2:] / widths[1:, None]
+    weights = np.maximum(0.0, np.minimum(lower, upper))
+    weights *= (2.0 / (edges[2:] - edges[:-2]))[:, None]
+    return weights.astype(np.float32)
+
+class FeatureExtractor:
+    """Computes FrameFeatures for whole buffers (Whisper's 25 ms / 10 ms STFT framing)"""
+
+    def __init__(self, sample_rate=16000, n_fft=400, hop=160, n_mels=80):
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop = hop
+        self.n_mels = n_mels
+
+        # Periodic Hann window, as torch.hann_window uses
+        self.window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n_fft) / n_fft)).astype(np.float32)
+        self.frequencies = np.fft.rfftfreq(n_fft, 1.0 / sample_rate).astype(np.float32)
+        self.speech_band = (self.frequencies >= 300) & (self.frequencies <= 3400)
+        self.filters = mel_filterbank(sample_rate, n_fft, n_mels)
+
+    def frames_features(self, frames, first_frame=0):
+        """Features of a (n_frames x n_fft) frame matrix in one pass"""
+        rms = np.sqrt(np.einsum('ij,ij->i', frames, frames) / frames.shape[1])
+
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1)
+
+        power = np.abs(np.fft.rfft(frames * self.window, axis=1)) ** 2
+        energy = power.sum(axis=1) + 1e-12
+        band_energy = power[:, self.speech_band].sum(axis=1)
+        centroid = power @ self.frequencies / energy
+
+        power += 1e-12
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        log_mel = np.log10(np.maximum(power @ self.filters.T, 1e-10))
+
+        return FrameFeatures(first_frame, self.hop, rms.astype(np.float32), zcr.astype(np.float32),
+                             energy.astype(np.float32), band_energy.astype(np.float32),
+                             flatness.astype(np.float32), centroid.astype(np.float32),
+                             log_mel.astype(np.float32))
+
+    def compute(self, audio):
+        """Features of a standalone buffer, one frame per hop (edges reflect-padded like Whisper)"""
+        audio = np.asarray(audio, dtype=np.float32)
+        n_frames = len(audio) // self.hop
+        half = self.n_fft // 2
+        if n_frames == 0:
+            return self.frames_features(np.zeros((0, self.n_fft), dtype=np.float32))
+        padded = np.pad(audio, half, mode='reflect' if len(audio) > half else 'constant')
+        frames = np.lib.stride_tricks.sliding_window_view(padded, self.n_fft)[::self.hop][:n_frames]
+        return self.frames_features(frames)
+
+class FrameFeatureStream:
+    """Incremental FrameFeatures over the capture stream, with recent history kept for slicing
+
+    Frames are indexed by absolute capture position, so an utterance found by
+    the VAD can pick up the features already computed for it.
+    """
+
+    def __init__(self, sample_rate=16000, n_fft=400, hop=160, n_mels=80, history_s=45):
+        self.extractor = FeatureExtractor(sample_rate=sample_rate, n_fft=n_fft, hop=hop, n_mels=n_mels)
+        self.hop = hop
+        self.history_frames = int(history_s * sample_rate / hop)
+        self.reset()
+
+    def reset(self, position=0):
+        """Start over at absolute sample `position` (zero-padded like a fresh STFT)"""
+        half = self.extractor.n_fft // 2
+        self.next_frame = -(-position // self.hop)  # first frame centred at or after position
+        self.buffer_position = self.next_frame * self.hop - half  # sample position of buffer[0]
+        self.buffer = np.zeros(position - self.buffer_position, dtype=np.float32)
+        self.history = []
+
+    def process(self, position, samples):
+        """Feed a block at absolute `position`; returns FrameFeatures of the newly complete frames"""
+        if position != self.buffer_position + len(self.buffer):
+            # Capture gap (ring overrun) - earlier frames no longer line up
+            self.reset(position)
+        buffer = np.concatenate((self.buffer, np.asarray(samples, dtype=np.float32)))
+
+        n_fft, hop = self.extractor.n_fft, self.hop
+        n_frames = (len(buffer) - n_fft) // hop + 1 if len(buffer) >= n_fft else 0
+        first_frame = self.next_frame
+        if n_frames:
+            frames = np.lib.stride_tricks.sliding_window_view(buffer, n_fft)[::hop][:n_frames]
+            features = self.extractor.frames_features(frames, first_frame)
+            self.history.append(features)
+            self.next_frame += n_frames
+            self._trim_history()
+        else:
+            features = self.extractor.frames_features(np.zeros((0, n_fft), dtype=np.float32), first_frame)
+
+        consumed = n_frames * hop
+        self.buffer = buffer[consumed:].copy()
+        self.buffer_position += consumed
+        return features
+
+    def _trim_history(self):
+        oldest = self.next_frame - self.history_frames
+        while self.history and self.history[0].first_frame + len(self.history[0]) <= oldest:
+            self.history.pop(0)
+
+    def slice(self, start, end):
+        """Features for samples [start, end), or None if they are no longer (or not yet) held"""
+        first = -(-start // self.hop)
+        last = end // self.hop
+        if not self.history or first < self.history[0].first_frame or last > self.next_frame or last <= first:
+            return None
+        parts = [part.subset(first, last) for part in self.history
+                 if part.first_frame < last and part.first_frame + len(part) > first]
+        return FrameFeatures.concatenate(parts)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark
+Measures cold-start import cost with `python -X importtime` and flags regressions
+"""
+
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BENCHMARK_DIR = Path("benchmarks")
+BASELINE_PATH = BENCHMARK_DIR / "import_time_baseline.json"
+
+# Packages that must stay behind lazy_imports - importing any of them at startup is a regression
+HEAVY_MODULES = ('torch', 'whisper', 'faster_whisper', 'ctranslate2', 'cv2', 'pyautogui',
+                 'pytesseract', 'pyaudiowpatch', 'pyaudio', 'PIL', 'pygetwindow')
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\s*)(\S+)")
+
+def parse_importtime(stderr):
+    """Cumulative import time in milliseconds per module from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2)) / 1000.0
+    return modules
+
+def measure_import_time(module="main", runs=5):
+    """Import `module` in fresh interpreters; returns median cumulative ms per module"""
+    samples = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c",
+             f"import sys, {module}; print('\\n'.join(sys.modules))"],
+            capture_output=True, text=True, cwd=Path(__file__).resolve().parent
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+        samples.append(parse_importtime(completed.stderr))
+        # -X importtime also logs imports that failed; only modules that loaded count
+        loaded = set(completed.stdout.split())
+
+    names = set().union(*samples)
+    modules = {name: float(np.median([run.get(name, 0.0) for run in samples])) for name in names}
+    return {
+        'module': module,
+        'runs': runs,
+        'total_ms': modules.get(module, 0.0),
+        'heavy_modules': sorted(name for name in loaded if name in HEAVY_MODULES),
+        'modules': modules,
+    }
+
+def check_regression(result, baseline, tolerance=0.25, min_delta_ms=20.0):
+    """Compare against a baseline; returns a list of human-readable problems"""
+    problems = [f"heavy module imported at startup: {name}" for name in result['heavy_modules']]
+
+    if baseline:
+        allowed = baseline['total_ms'] * (1 + tolerance) + min_delta_ms
+        if result['total_ms'] > allowed:
+            problems.append(f"total import time {result['total_ms']:.0f}ms exceeds baseline "
+                            f"{baseline['total_ms']:.0f}ms (+{tolerance:.0%})")
+    return problems
+
+def print_report(result, top=15):
+    print(f"⏱ import {result['module']}: {result['total_ms']:.1f}ms (median of {result['runs']})")
+    slowest = sorted(result['modules'].items(), key=lambda item: item[1], reverse=True)
+    for name, ms in slowest[:top]:
+        print(f"  {ms:8.1f}ms  {name}")
+
+def write_result(result, path):
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+    print(f"📄 Import timings written: {path}")
+
+# Benchmark run: python import_benchmark.py [module] [--save-baseline]
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    module = args[0] if args else "main"
+
+    result = measure_import_time(module)
+    print_report(result)
+    write_result(result, BENCHMARK_DIR / "import_time.json")
+
+    if '--save-baseline' in sys.argv:
+        write_result(result, BASELINE_PATH)
+        sys.exit(0)
+
+    baseline = None
+    if BASELINE_PATH.exists():
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    problems = check_regression(result, baseline)
+    for problem in problems:
+        print(f"❌ {problem}")
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Inference Scheduler
+Bounded work queue feeding a fixed pool of model workers with in-order result delivery
+"""
+
+import threading
+import time
+
+from audio_queue import BoundedAudioQueue, POLICY_DROP_OLDEST
+
+DROPPED = object()  # result placeholder for jobs the backlog discarded
+
+class InferenceScheduler:
+    def __init__(self, handler, result_callback, num_workers=1, max_backlog=8,
+                 policy=POLICY_DROP_OLDEST, worker_init=None, batch_handler=None, can_batch=None,
+                 release_context=None, drop_callback=None):
+        self.handler = handler                  # handler(job, context) -> result, runs on a worker
+        self.batch_handler = batch_handler      # batch_handler(jobs, context) -> [result, ...] for backlogged jobs
+        self.can_batch = can_batch              # can_batch(jobs, job) -> True if job may join the batch
+        self.result_callback = result_callback  # result_callback(job, result), called in submit order
+        self.worker_init = worker_init          # worker_init(worker_id) -> per-worker context (e.g. a model)
+        self.release_context = release_context  # release_context(context) once a replaced context is unused
+        self.drop_callback = drop_callback      # drop_callback(job) for discarded jobs, in submit order
+        self.num_workers = max(1, int(num_workers))
+
+        self.work_queue = BoundedAudioQueue(
+            maxsize=max_backlog,
+            policy=policy,
+            drop_callback=self._on_dropped
+        )
+
+        # Ordered delivery state
+        self.lock = threading.Lock()
+        self.delivery_lock = threading.Lock()  # serializes result_callback calls
+        self.next_sequence = 0
+        self.next_to_deliver = 0
+        self.completed = {}  # sequence -> (job, result), result DROPPED for discarded jobs
+        self.in_flight = 0
+
+        self.workers = []
+        self.contexts = {}  # worker_id -> context, swappable while running
+        self.retired = {}   # worker_id -> replaced contexts the worker may still be using
+        self.running = False
+
+        self.stats = {
+            'submitted': 0,
+            'processed': 0,
+            'dropped': 0,
+            'abandoned': 0,  # still queued when stop() gave up waiting
+            'errors': 0,
+            'batches': 0,
+            'batched_jobs': 0,
+            'busy_seconds': 0.0,
+        }
+
+    def start(self):
+        """Start the worker threads"""
+        if self.running:
+            return
+        self.running = True
+        for worker_id in range(self.num_workers):
+            worker = threading.Thread(target=self.worker_loop, args=(worker_id,), daemon=True)
+            worker.start()
+            self.workers.append(worker)
+        print(f"⚙️ Inference scheduler started ({self.num_workers} worker{'s' if self.num_workers != 1 else ''})")
+
+    def submit(self, job):
+        """Queue a job; returns its sequence number"""
+        with self.lock:
+            sequence = self.next_sequence
+            self.next_sequence += 1
+            self.stats['submitted'] += 1
+            dropped = self.stats['dropped']
+
+        self.work_queue.put((sequence, job))
+
+        # A drop can complete the sequence later results are waiting on. Delivered
+        # here rather than in _on_dropped, which runs under the queue's lock.
+        if self.stats['dropped'] != dropped:
+            self._deliver_ready()
+        return sequence
+
+    def coalesce(self, merge):
+        """Fold new work into the newest job still waiting for a worker
+
+        merge(job) returns the combined job, or None to leave it alone.
+        Returns True if the newest job was replaced.
+        """
+        def update(item):
+            sequence, job = item
+            merged = merge(job)
+            return None if merged is None else (sequence, merged)
+
+        return self.work_queue.update_newest(update)
+
+    def set_policy(self, policy):
+        """Change what happens to new jobs when the backlog is full"""
+        self.work_queue.set_policy(policy)
+
+    @property
+    def queued(self):
+        """Jobs waiting for a worker (not counting those already running)"""
+        return self.work_queue.qsize()
+
+    @property
+    def backlog(self):
+        """Jobs waiting for or currently running on a worker"""
+        return self.work_queue.qsize() + self.in_flight
+
+    def worker_loop(self, worker_id):
+        """Pull jobs and run the handler with this worker's context"""
+        if self.worker_init and worker_id not in self.contexts:
+            try:
+                self.contexts[worker_id] = self.worker_init(worker_id)
+            except Exception as e:
+                print(f"⚠ Inference worker {worker_id} init error: {e}")
+
+        # Every job taken off the queue counts as in flight until its result is
+        # stored, so the backlog never reads empty while a held job is pending;
+        # a held job is run even after stop() before the worker exits
+        held = None  # job taken off the queue that did not fit the previous batch
+        while self.running or held:
+            self._release_retired(worker_id)
+            item = held or self._take(timeout=0.5)
+            held = None
+            if item is None:
+                if self.work_queue.closed:
+                    break
+                continue
+
+            # Under backlog, take more waiting jobs and run them in one pass
+            batch = [item]
+            if self.batch_handler and self.can_batch:
+                while self.work_queue.qsize():
+                    extra = self._take(timeout=0)
+                    if extra is None:
+                        break
+                    if not self.can_batch([job for _, job in batch], extra[1]):
+                        held = extra
+                        break
+                    batch.append(extra)
+
+            started = time.perf_counter()
+            context = self.contexts.get(worker_id)
+            jobs = [job for _, job in batch]
+            try:
+                if len(batch) > 1:
+                    results = self.batch_handler(jobs, context)
+                else:
+                    results = [self.handler(jobs[0], context)]
+            except Exception as e:
+                print(f"⚠ Inference error: {e}")
+                self.stats['errors'] += 1
+                results = [None] * len(batch)
+
+            with self.lock:
+                self.in_flight -= len(batch)
+                self.stats['processed'] += len(batch)
+                self.stats['busy_seconds'] += time.perf_counter() - started
+                if len(batch) > 1:
+                    self.stats['batches'] += 1
+                    self.stats['batched_jobs'] += len(batch)
+                for (sequence, job), result in zip(batch, results):
+                    self.completed[sequence] = (job, result)
+
+            self._deliver_ready()
+
+    def _take(self, timeout):
+        """Next queued job, counted as in flight from the moment it leaves the queue"""
+        item = self.work_queue.get(timeout=timeout)
+        if item is not None:
+            with self.lock:
+                self.in_flight += 1
+        return item
+
+    def set_context(self, worker_id, context):
+        """Replace a worker's context; takes effect from its next job
+
+        The replaced context is handed to release_context only after the
+        worker has finished the job it may be running with it.
+        """
+        with self.lock:
+            previous = self.contexts.get(worker_id)
+            self.contexts[worker_id] = context
+            if previous is not None and previous is not context:
+                self.retired.setdefault(worker_id, []).append(previous)
+
+    def _release_retired(self, worker_id):
+        """Release contexts this worker has stopped using (called between jobs)"""
+        with self.lock:
+            retired = self.retired.pop(worker_id, [])
+        for context in retired:
+            if self.release_context:
+                try:
+                    self.release_context(context)
+                except Exception as e:
+                    print(f"⚠ Context release error: {e}")
+
+    def _on_dropped(self, item):
+        """Queue discarded a job - mark it skipped so delivery does not stall"""
+        sequence, job = item
+        with self.lock:
+            self.stats['dropped'] += 1
+            self.completed[sequence] = (job, DROPPED)
+
+    def _deliver_ready(self):
+        """Deliver every consecutive completed result, oldest first"""
+        with self.delivery_lock:
+            while True:
+                with self.lock:
+                    if self.next_to_deliver not in self.completed:
+                        return
+                    entry = self.completed.pop(self.next_to_deliver)
+                    self.next_to_deliver += 1
+
+                job, result = entry
+                try:
+                    if result is not DROPPED:
+                        self.result_callback(job, result)
+                    elif self.drop_callback:
+                        self.drop_callback(job)
+                except Exception as e:
+                    print(f"⚠ Result delivery error: {e}")
+
+    def get_stats(self):
+        """Counters plus current backlog"""
+        with self.lock:
+            stats = dict(self.stats)
+        stats['backlog'] = self.backlog
+        stats['queue'] = self.work_queue.get_stats()
+        return stats
+
+    def stop(self, drain_timeout=5.0):
+        """Stop accepting work, let queued jobs finish, then stop the workers
+
+        Gives up only once the backlog has not shrunk for `drain_timeout`
+        seconds, so a long (e.g. spilled) backlog that is still draining is
+        not cut off. Jobs left behind are counted and reported.
+        """
+        self.work_queue.close()
+        backlog = self.backlog
+        deadline = time.time() + drain_timeout
+        while backlog and time.time() < deadline:
+            time.sleep(0.05)
+            if self.backlog < backlog:
+                deadline = time.time() + drain_timeout
+            backlog = self.backlog
+
+        self.running = False
+        for worker in self.workers:
+            worker.join(timeout=2)
+        self.workers = []
+        for worker_id in list(self.retired):
+            self._release_retired(worker_id)
+
+        abandoned = self.work_queue.qsize()
+        if abandoned:
+            self.stats['abandoned'] += abandoned
+            print(f"⚠ {abandoned} queued utterance{'s' if abandoned != 1 else ''} discarded untranscribed at shutdown")
+        self.work_queue.cleanup()
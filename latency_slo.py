@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Latency SLO
+Trades decode quality for speed when transcripts fall behind a target end-to-end latency
+"""
+
+import threading
+
+# Quality levels, cheapest last
+LEVEL_FULL = 0       # beam search if one is configured, word timestamps where the caller needs them
+LEVEL_GREEDY = 1     # greedy decoding
+LEVEL_NO_WORDS = 2   # greedy, no word-timestamp alignment even for packed windows
+LEVEL_MERGE = 3      # also merge adjacent queued utterances into one decode
+
+LEVEL_NAMES = ('full', 'greedy', 'no word timing', 'merging')
+
+class LatencySLO:
+    def __init__(self, target_s=4.0, recover_ratio=0.5, recover_after=3, beam_size=None):
+        self.target = target_s
+        self.recover_ratio = recover_ratio   # step back up only once well inside the target
+        self.recover_after = recover_after   # ...for this many consecutive observations
+        self.beam_size = beam_size            # None: live decoding stays greedy even at full quality
+
+        # Latency (as a multiple of the target) that calls for each level
+        self.escalate_at = (0.0, 1.0, 1.5, 2.0)
+
+        self.level = LEVEL_FULL
+        self.good_run = 0
+        self.lock = threading.Lock()
+
+        self.stats = {'observations': 0, 'late': 0, 'escalations': 0, 'recoveries': 0, 'max_latency': 0.0}
+
+    def observe(self, latency_s):
+        """Record an utterance's end-to-end latency (once, at delivery); returns the level to use"""
+        # Capture timestamps come from the audio clock and can be slightly ahead of time.time()
+        latency_s = max(0.0, latency_s)
+        with self.lock:
+            self.stats['observations'] += 1
+            self.stats['max_latency'] = max(self.stats['max_latency'], latency_s)
+            if latency_s > self.target:
+                self.stats['late'] += 1
+
+            needed = max(level for level, ratio in enumerate(self.escalate_at) if latency_s >= ratio * self.target)
+            if needed > self.level:
+                self.level = needed
+                self.good_run = 0
+                self.stats['escalations'] += 1
+            elif self.level > LEVEL_FULL and latency_s < self.target * self.recover_ratio:
+                self.good_run += 1
+                if self.good_run >= self.recover_after:
+                    self.level -= 1
+                    self.good_run = 0
+                    self.stats['recoveries'] += 1
+            else:
+                self.good_run = 0
+
+            return self.level
+
+    def decode_options(self, level=None):
+        """transcribe() keyword arguments for a quality level"""
+        level = self.level if level is None else level
+        return {
+            'beam_size': self.beam_size if level == LEVEL_FULL else None,
+            'word_timestamps': level < LEVEL_NO_WORDS,
+        }
+
+    @property
+    def merging(self):
+        return self.level >= LEVEL_MERGE
+
+    def describe(self):
+        return LEVEL_NAMES[self.level]
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Lazy Imports
+Cheap capability probes and on-first-use imports for heavy optional dependencies
+"""
+
+import importlib
+import importlib.util
+import threading
+
+# Optional features -> (top-level modules they need, install hint)
+CAPABILITIES = {
+    'audio': (('pyaudiowpatch',), "pip install pyaudiowpatch"),
+    'audio_fallback': (('pyaudio',), "pip install pyaudio"),
+    'whisper': (('whisper',), "pip install openai-whisper"),
+    'torch': (('torch',), "pip install torch"),
+    'screen': (('pygetwindow', 'pyautogui', 'cv2', 'PIL', 'pytesseract'),
+               "pip install pygetwindow pyautogui opencv-python pillow pytesseract"),
+    'process': (('psutil',), "pip install psutil"),
+    'windows_api': (('psutil', 'win32gui', 'win32process', 'win32api', 'win32con'), "pip install pywin32 psutil"),
+}
+
+_probe_cache = {}
+_probe_lock = threading.Lock()
+
+def is_installed(module_name):
+    """True if a top-level module can be imported, without importing it"""
+    with _probe_lock:
+        if module_name not in _probe_cache:
+            try:
+                _probe_cache[module_name] = importlib.util.find_spec(module_name) is not None
+            except (ImportError, ValueError):
+                _probe_cache[module_name] = False
+        return _probe_cache[module_name]
+
+def has_capability(name):
+    """True if every module a registered capability needs is installed"""
+    modules, _ = CAPABILITIES[name]
+    return all(is_installed(module) for module in modules)
+
+def install_hint(name):
+    return CAPABILITIES[name][1]
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access
+
+    Several candidate names may be given; the first one that is installed
+    is used (e.g. pyaudiowpatch before plain pyaudio).
+    """
+
+    def __init__(self, *names):
+        self._names = names
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    for name in self._names:
+                        if is_installed(name.split('.')[0]):
+                            self._module = importlib.import_module(name)
+                            break
+                    else:
+                        raise ImportError(f"None of {', '.join(self._names)} is installed")
+        return self._module
+
+    @property
+    def is_loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = self._module.__name__ if self._module is not None else 'not loaded'
+        return f"<LazyModule {'|'.join(self._names)} ({state})>"
+
+def lazy_import(*names):
+    """A module proxy that defers the import until the module is first used"""
+    return LazyModule(*names)
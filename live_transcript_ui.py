@@ -234,6 +234,28 @@ class LiveTranscriptUI:
         self.confidence_var = tk.StringVar(value="0%")
         tk.Label(conf_frame, textvariable=self.confidence_var, font=("Segoe UI", 10, "bold"),
                 fg=self.theme['success'], bg=self.theme['bg_tertiary']).pack(side='right')
+        
+        # Inference backlog
+        backlog_frame = tk.Frame(stats_frame, bg=self.theme['bg_tertiary'])
+        backlog_frame.pack(fill='x', padx=10, pady=5)
+        
+        tk.Label(backlog_frame, text="Backlog:", font=("Segoe UI", 10),
+                fg=self.theme['text_secondary'], bg=self.theme['bg_tertiary']).pack(side='left')
+        
+        self.backlog_var = tk.StringVar(value="0")
+        tk.Label(backlog_frame, textvariable=self.backlog_var, font=("Segoe UI", 10, "bold"),
+                fg=self.theme['warning'], bg=self.theme['bg_tertiary']).pack(side='right')
+        
+        # Active model and real-time factor
+        model_frame = tk.Frame(stats_frame, bg=self.theme['bg_tertiary'])
+        model_frame.pack(fill='x', padx=10, pady=5)
+        
+        tk.Label(model_frame, text="Model:", font=("Segoe UI", 10),
+                fg=self.theme['text_secondary'], bg=self.theme['bg_tertiary']).pack(side='left')
+        
+        self.model_status_var = tk.StringVar(value="-")
+        tk.Label(model_frame, textvariable=self.model_status_var, font=("Segoe UI", 10, "bold"),
+                fg=self.theme['accent_primary'], bg=self.theme['bg_tertiary']).pack(side='right')
     
     def toggle_transcription(self):
         """Toggle transcription state"""
@@ -273,6 +295,20 @@ class LiveTranscriptUI:
         self.transcript_area.see(tk.END)
         self.transcript_area.config(state=tk.DISABLED)
     
+    def append_transcript_text(self, text):
+        """Extend the most recent entry with more text (streaming mode)"""
+        if not self.transcript_data:
+            return
+        
+        entry = self.transcript_data[-1]
+        entry['text'] = f"{entry['text']} {text}".strip()
+        
+        # The entry's text ends with a newline - insert just before it
+        self.transcript_area.config(state=tk.NORMAL)
+        self.transcript_area.insert("end-2c", f" {text}", 'content')
+        self.transcript_area.see(tk.END)
+        self.transcript_area.config(state=tk.DISABLED)
+    
     def clear_transcript(self):
         """Clear transcript with confirmation"""
         if messagebox.askyesno("Clear Transcript", "Clear all transcript data?"):
@@ -326,6 +362,20 @@ class LiveTranscriptUI:
         except Exception as e:
             print(f"Stats update error: {e}")
     
+    def update_backlog(self, backlog):
+        """Show how many audio windows are waiting for transcription"""
+        try:
+            self.backlog_var.set(str(backlog))
+        except Exception as e:
+            print(f"Backlog update error: {e}")
+    
+    def update_model_status(self, status):
+        """Show the active model and its real-time factor"""
+        try:
+            self.model_status_var.set(status)
+        except Exception as e:
+            print(f"Model status update error: {e}")
+    
     def run(self):
         """Start the beautiful UI"""
         self.window.mainloop()
@@ -4,6 +4,8 @@ Albanian Teams Transcriber - Main Entry Point
 Beautiful real-time transcription for Microsoft Teams
 """
 
+import sys
+
 from working_transcriber import WorkingAlbanianTranscriber
 
 def main():
@@ -14,7 +16,40 @@ def main():
     print()
     
     try:
-        app = WorkingAlbanianTranscriber()
+        # --streaming shows words as soon as they are stable instead of per utterance
+        # --backend faster-whisper uses the int8 CTranslate2 engine on CPU,
+        # --backend whisper-int8 a dynamically quantized openai-whisper model
+        # --backend whisper-speculative has tiny draft tokens for the larger model to verify
+        backend = 'whisper'
+        if '--backend' in sys.argv[:-1]:
+            backend = sys.argv[sys.argv.index('--backend') + 1]
+        
+        # --latency SECONDS sets the end-to-end latency target (default 4 s)
+        latency = 4.0
+        if '--latency' in sys.argv[:-1]:
+            latency = float(sys.argv[sys.argv.index('--latency') + 1])
+        
+        # --final-model SIZE re-transcribes the recording with a larger model after the meeting
+        final_model = None
+        if '--final-model' in sys.argv[:-1]:
+            final_model = sys.argv[sys.argv.index('--final-model') + 1]
+        
+        # --processes N runs N inference workers, each in its own process with its own model
+        processes = 0
+        if '--processes' in sys.argv[:-1]:
+            processes = int(sys.argv[sys.argv.index('--processes') + 1])
+        
+        # --rediarize re-clusters the speakers over the whole recording after the meeting
+        # --adaptive-model moves between tiny/base/small to keep up with real time
+        app = WorkingAlbanianTranscriber(
+            streaming='--streaming' in sys.argv,
+            asr_backend=backend,
+            adaptive_model='--adaptive-model' in sys.argv,
+            latency_target=latency,
+            final_model=final_model,
+            inference_processes=processes,
+            rediarize='--rediarize' in sys.argv
+        )
         app.run()
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Meeting Re-diarizer
+Post-meeting pass that re-clusters the speakers of the whole recording and relabels the session
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from frame_features import FeatureExtractor
+from meeting_retranscriber import SAMPLE_RATE, check_recording, load_recording, make_shards
+from meeting_session_manager import MeetingSessionManager
+from speaker_diarizer import SpeakerEmbedder, speaker_label
+from voiceprint_index import VoiceprintIndex
+
+# Per-process feature pipeline, built once by the pool initializer
+_extractor = None
+_embedder = None
+
+def _init_worker():
+    global _extractor, _embedder
+    _extractor = FeatureExtractor(sample_rate=SAMPLE_RATE)
+    _embedder = SpeakerEmbedder()
+
+def _embed_shard(shard):
+    """Runs in a pool process: (entry_id, offset_s, audio) -> (entry_id, embedding or None)"""
+    entry_id, offset, audio = shard
+    return entry_id, _embedder.embed(_extractor.compute(audio))
+
+MAX_LINKAGE_ITEMS = 512   # the linkage step is cubic - longer meetings are summarized first
+SUMMARY_THRESHOLD = 0.95  # cosine similarity within one summary group (well inside one voice)
+
+def summarize_embeddings(vectors, max_items=MAX_LINKAGE_ITEMS, threshold=SUMMARY_THRESHOLD):
+    """Group near-identical utterances so at most `max_items` groups remain
+
+    One pass in recording order: an utterance joins the closest group when
+    it is at least `threshold` similar (or when there is no room left),
+    otherwise it starts a new group. Returns (group sums, group sizes,
+    group of each utterance).
+    """
+    sums = np.zeros((max_items, vectors.shape[1]), dtype=np.float32)
+    sizes = np.zeros(max_items)
+    groups = np.empty(len(vectors), dtype=int)
+    used = 0
+    for i, vector in enumerate(vectors):
+        if used:
+            scores = sums[:used] @ vector / (np.linalg.norm(sums[:used], axis=1) + 1e-9)
+            best = int(np.argmax(scores))
+            if scores[best] >= threshold or used == max_items:
+                sums[best] += vector
+                sizes[best] += 1
+                groups[i] = best
+                continue
+        sums[used] = vector
+        sizes[used] = 1
+        groups[i] = used
+        used += 1
+    return sums[:used], sizes[:used], groups
+
+def average_linkage(vectors, sizes, threshold, max_clusters):
+    """Merge rows (with `sizes` members each) by average cosine similarity; cluster index per row"""
+    count = len(vectors)
+    vectors = vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-9)
+    similarity = (vectors @ vectors.T).astype(np.float32)
+    np.fill_diagonal(similarity, -np.inf)
+
+    sizes = np.array(sizes, dtype=np.float64)
+    clusters = np.arange(count)
+    remaining = count
+    while remaining > 1:
+        a, b = divmod(int(np.argmax(similarity)), count)
+        if similarity[a, b] < threshold and remaining <= max_clusters:
+            break
+        # Lance-Williams update: average similarity of the merged cluster to every other
+        merged = (sizes[a] * similarity[a] + sizes[b] * similarity[b]) / (sizes[a] + sizes[b])
+        similarity[a, :] = merged
+        similarity[:, a] = merged
+        similarity[a, a] = -np.inf
+        similarity[b, :] = -np.inf
+        similarity[:, b] = -np.inf
+        sizes[a] += sizes[b]
+        clusters[clusters == b] = a
+        remaining -= 1
+    return clusters
+
+def cluster_embeddings(embeddings, threshold=0.85, max_clusters=8, max_items=MAX_LINKAGE_ITEMS):
+    """Average-linkage agglomerative clustering on cosine similarity; one cluster index per row
+
+    Unlike the online diarizer, every utterance is compared with every other
+    before anything is decided, so an early utterance is not stuck with the
+    speaker it was first given. Merging stops when the closest clusters fall
+    below `threshold` (and no more than `max_clusters` remain). Clusters are
+    numbered in order of first appearance.
+    Past `max_items` utterances the linkage runs over summary groups of
+    near-identical utterances (weighted by their size), which keeps time
+    and memory bounded for meetings of any length.
+    """
+    count = len(embeddings)
+    if count == 0:
+        return np.zeros(0, dtype=int)
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    vectors = vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-9)
+
+    if count > max_items:
+        sums, sizes, groups = summarize_embeddings(vectors, max_items)
+        clusters = average_linkage(sums, sizes, threshold, max_clusters)[groups]
+    else:
+        clusters = average_linkage(vectors, np.ones(count), threshold, max_clusters)
+
+    _, first, inverse = np.unique(clusters, return_index=True, return_inverse=True)
+    order = np.argsort(np.argsort(first))
+    return order[inverse]
+
+def name_clusters(clusters, live_speakers, participants, centroids=None, voiceprints=None):
+    """Speaker name for each cluster
+
+    Live labels that are participant names vote for their cluster, and each
+    name goes to the cluster with the most votes (one cluster per name).
+    Clusters left over are looked up in the voiceprint index, and otherwise
+    become Speaker A, B, ...
+    """
+    votes = {}
+    for cluster, speaker in zip(clusters, live_speakers):
+        if speaker in participants:
+            votes[(int(cluster), speaker)] = votes.get((int(cluster), speaker), 0) + 1
+
+    names = {}
+    for (cluster, speaker), _ in sorted(votes.items(), key=lambda item: item[1], reverse=True):
+        if cluster not in names and speaker not in names.values():
+            names[cluster] = speaker
+
+    next_label = 0
+    for cluster in sorted(set(int(cluster) for cluster in clusters)):
+        if cluster in names:
+            continue
+        if voiceprints is not None and centroids is not None:
+            name, _ = voiceprints.lookup(centroids[cluster])
+            if name and name not in names.values():
+                names[cluster] = name
+                continue
+        while speaker_label(next_label) in names.values():
+            next_label += 1
+        names[cluster] = speaker_label(next_label)
+        next_label += 1
+    return names
+
+def rediarize(session_manager, audio_path=None, workers=None, threshold=0.85, max_speakers=8,
+              voiceprints_dir="voiceprints"):
+    """Re-cluster the speakers of a session's recording and relabel its entries in place"""
+    session = session_manager.session_data
+    audio_path = audio_path or session.get('audio_path')
+    if not audio_path or not Path(audio_path).exists():
+        raise FileNotFoundError(f"Session has no meeting recording: {audio_path}")
+
+    audio = load_recording(audio_path)
+    with session_manager.lock:
+        transcript = [dict(entry) for entry in session['transcript']]
+    # A recording still being written would leave the late utterances without a voice
+    check_recording(transcript, audio)
+    # No padding: context from a neighbouring utterance would blur the voice
+    shards = make_shards(transcript, audio, padding_s=0.0)
+    if not shards:
+        print("⚠ No transcript entries with recording positions - nothing to re-diarize")
+        return None
+
+    workers = workers or max(1, min(8, (os.cpu_count() or 2) - 1))
+    print(f"🔁 Re-diarizing {len(shards)} utterances with {workers} processes...")
+
+    started = time.perf_counter()
+    embeddings = {}
+    # spawn: a fork would copy the live transcriber's threads, audio stream and GUI state
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        # Embedding is cheap per utterance - hand them out in batches
+        chunksize = max(1, len(shards) // (workers * 4))
+        for entry_id, embedding in pool.map(_embed_shard, shards, chunksize=chunksize):
+            embeddings[entry_id] = embedding
+
+    # Entries in recording order; those too short to embed keep the voice before them
+    ordered = sorted((entry for entry in transcript if entry['entry_id'] in embeddings),
+                     key=lambda entry: entry['audio_start'])
+    embedded = [entry['entry_id'] for entry in ordered if embeddings[entry['entry_id']] is not None]
+    if not embedded:
+        print("⚠ No utterance long enough to embed - speakers left as they are")
+        return None
+
+    matrix = np.stack([embeddings[entry_id] for entry_id in embedded])
+    clusters = cluster_embeddings(matrix, threshold=threshold, max_clusters=max_speakers)
+    cluster_of = dict(zip(embedded, clusters))
+
+    n_clusters = int(clusters.max()) + 1
+    centroids = np.stack([matrix[clusters == cluster].mean(axis=0) for cluster in range(n_clusters)])
+    voiceprints = None
+    if voiceprints_dir and (Path(voiceprints_dir) / "names.json").exists():
+        voiceprints = VoiceprintIndex(voiceprints_dir, dim=matrix.shape[1])
+
+    live_speakers = {entry['entry_id']: entry['speaker'] for entry in transcript}
+    names = name_clusters(clusters, [live_speakers[entry_id] for entry_id in embedded],
+                          session['participants'], centroids, voiceprints)
+
+    speakers = {}
+    previous = cluster_of[embedded[0]]
+    for entry in ordered:
+        previous = cluster_of.get(entry['entry_id'], previous)
+        speakers[entry['entry_id']] = names[previous]
+
+    changed = session_manager.reassign_speakers(speakers)
+    summary = {
+        'finished_at': datetime.now().isoformat(),
+        'seconds': round(time.perf_counter() - started, 1),
+        'utterances': len(shards),
+        'embedded': len(embedded),
+        'speakers': n_clusters,
+        'entries_relabelled': changed,
+    }
+    with session_manager.lock:
+        session['rediarization'] = summary
+
+    print(f"✓ Speakers re-clustered: {n_clusters} voices, {changed} of {len(shards)} entries relabelled "
+          f"in {summary['seconds']:.0f}s")
+    return summary
+
+def rediarize_session(session_path, workers=None, output_path=None):
+    """Re-diarize a saved session file and write it back"""
+    session_path = Path(session_path)
+    manager = MeetingSessionManager()
+    if not manager.load_session(session_path):
+        raise ValueError(f"Cannot load session: {session_path}")
+
+    rediarize(manager, workers=workers)
+
+    output_path = Path(output_path) if output_path else session_path
+    with manager.lock, open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(manager.session_data, f, indent=2, ensure_ascii=False)
+    print(f"💾 Session updated: {output_path}")
+    return manager.session_data
+
+# Post-meeting run: python meeting_rediarizer.py <session.json> [--workers N]
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python meeting_rediarizer.py <sessions/session_*.json> [--workers N]")
+        sys.exit(1)
+
+    args = sys.argv[2:]
+    worker_count = None
+    if '--workers' in args[:-1]:
+        worker_count = int(args[args.index('--workers') + 1])
+
+    rediarize_session(sys.argv[1], workers=worker_count)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Meeting Re-transcriber
+Post-meeting pass that re-decodes the archived audio with a larger model and merges it into the session
+"""
+
+import difflib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from asr_backends import create_backend
+from meeting_session_manager import MeetingSessionManager
+from transcript_quality import filter_segments, max_decode_tokens, segments_confidence, trim_repetition
+
+SAMPLE_RATE = 16000
+SHARD_PADDING_S = 0.2  # context around each utterance so its edges are not clipped
+
+# Per-process model, loaded once by the pool initializer
+_backend = None
+
+def _init_worker(backend_name, model_size, language, threads):
+    global _backend
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    _backend = create_backend(backend_name, model_size=model_size, language=language)
+    _backend.load()
+
+def _transcribe_shard(shard):
+    """Runs in a pool process: (entry_id, offset_s, audio) -> (entry_id, text, confidence, words)"""
+    entry_id, offset, audio = shard
+    result = _backend.transcribe(
+        audio,
+        word_timestamps=True,
+        beam_size=5,
+        max_tokens=max_decode_tokens(len(audio) / SAMPLE_RATE)
+    )
+    segments = filter_segments(result.get('segments', []))
+    words = [{
+        'word': word['word'],
+        'start': round(offset + float(word['start']), 3),
+        'end': round(offset + float(word['end']), 3),
+        'probability': round(float(word['probability']), 3),
+    } for segment in segments for word in segment.get('words', [])]
+    text = trim_repetition(''.join(segment['text'] for segment in segments))
+    return entry_id, text, segments_confidence(segments), words
+
+def load_recording(path, sample_rate=SAMPLE_RATE):
+    """Read the meeting archive WAV as float32"""
+    with wave.open(str(path), 'rb') as wav:
+        if wav.getframerate() != sample_rate or wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError(f"Expected 16-bit mono {sample_rate} Hz audio: {path}")
+        data = wav.readframes(wav.getnframes())
+    return np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+
+def check_recording(transcript, audio, sample_rate=SAMPLE_RATE, tolerance_s=1.0):
+    """Raise if the recording ends before the transcript does (archive not finalized or truncated)"""
+    ends = [entry['audio_end'] for entry in transcript if entry.get('audio_end') is not None]
+    duration = len(audio) / sample_rate
+    if ends and max(ends) > duration + tolerance_s:
+        raise ValueError(f"Recording ends at {duration:.1f}s but the transcript reaches {max(ends):.1f}s "
+                         f"- the archive is incomplete")
+
+def make_shards(transcript, audio, sample_rate=SAMPLE_RATE, padding_s=SHARD_PADDING_S):
+    """One shard per transcript entry that knows where it is in the recording"""
+    padding = int(padding_s * sample_rate)
+    shards = []
+    for entry in transcript:
+        if entry.get('speaker') == 'System' or entry.get('audio_start') is None:
+            continue
+        start = max(0, int(entry['audio_start'] * sample_rate) - padding)
+        end = min(len(audio), int(entry['audio_end'] * sample_rate) + padding)
+        if end - start > padding * 2 and end > start:
+            shards.append((entry['entry_id'], start / sample_rate, audio[start:end].copy()))
+    return shards
+
+def merge_entry(entry, text, confidence, words, min_gain=-0.05):
+    """Merge a re-transcribed text into a live entry; returns the number of words changed
+
+    The speaker label and entry ID are kept. The live text is kept as well
+    (as 'live_text') and wins when the final pass is empty or clearly less
+    confident than the live decode.
+    """
+    live_confidence = entry.get('confidence')
+    if not text or (live_confidence is not None and confidence < live_confidence + min_gain):
+        return 0
+
+    live_words = entry['text'].split()
+    final_words = text.split()
+    matcher = difflib.SequenceMatcher(a=[w.lower() for w in live_words], b=[w.lower() for w in final_words],
+                                      autojunk=False)
+    changed = sum(max(i2 - i1, j2 - j1) for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal')
+    if not changed and entry.get('words'):
+        return 0
+
+    entry.setdefault('live_text', entry['text'])
+    entry['text'] = text
+    entry['word_count'] = len(final_words)
+    entry['confidence'] = confidence
+    entry['words'] = words
+    entry['revised'] = bool(changed)
+    return changed
+
+def retranscribe_session(session_path, model_size="small", backend_name="whisper", workers=None,
+                         language="sq", output_path=None):
+    """Re-transcribe a saved session's recording and merge the result into it"""
+    session_path = Path(session_path)
+    with open(session_path, 'r', encoding='utf-8') as f:
+        session = json.load(f)
+
+    audio_path = session.get('audio_path')
+    if not audio_path or not Path(audio_path).exists():
+        raise FileNotFoundError(f"Session has no meeting recording: {audio_path}")
+
+    audio = load_recording(audio_path)
+    transcript = session['transcript']
+    check_recording(transcript, audio)
+    shards = make_shards(transcript, audio)
+    if not shards:
+        print("⚠ No transcript entries with recording positions - nothing to re-transcribe")
+        return session
+
+    workers = workers or max(1, min(4, (os.cpu_count() or 2) // 2))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"🔁 Re-transcribing {len(shards)} utterances with {backend_name} ({model_size}), "
+          f"{workers} processes × {threads} threads...")
+
+    # Longest shards first so one long utterance does not finish last on its own
+    shards.sort(key=lambda shard: len(shard[2]), reverse=True)
+
+    started = time.perf_counter()
+    entries = {entry['entry_id']: entry for entry in transcript}
+    revised = 0
+    word_edits = 0
+    # spawn: a fork would copy the live transcriber's threads, audio stream and GUI state
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(backend_name, model_size, language, threads),
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        for done, (entry_id, text, confidence, words) in enumerate(
+                pool.map(_transcribe_shard, shards, chunksize=1), start=1):
+            changed = merge_entry(entries[entry_id], text, confidence, words)
+            revised += bool(changed)
+            word_edits += changed
+            if done % 10 == 0 or done == len(shards):
+                print(f"  {done}/{len(shards)} utterances")
+
+    # Word counts follow the revised text, and every statistic derived from them
+    session['statistics']['total_words'] = sum(
+        entry['word_count'] for entry in transcript if entry['speaker'] != 'System')
+    for name, participant in session.get('participants', {}).items():
+        participant['word_count'] = sum(entries[entry_id]['word_count']
+                                        for entry_id in participant.get('transcript_entries', [])
+                                        if entry_id in entries)
+    manager = MeetingSessionManager()
+    manager.session_data = session
+    manager.calculate_final_statistics()
+
+    session['retranscription'] = {
+        'backend': backend_name,
+        'model': model_size,
+        'finished_at': datetime.now().isoformat(),
+        'seconds': round(time.perf_counter() - started, 1),
+        'utterances': len(shards),
+        'entries_revised': revised,
+        'word_edits': word_edits,
+    }
+
+    output_path = Path(output_path) if output_path else session_path
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(session, f, indent=2, ensure_ascii=False)
+
+    print(f"✓ Final transcript: {revised} of {len(shards)} entries revised ({word_edits} word edits) "
+          f"in {session['retranscription']['seconds']:.0f}s → {output_path}")
+    return session
+
+# Post-meeting run: python meeting_retranscriber.py <session.json> [model size] [--workers N]
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python meeting_retranscriber.py <sessions/session_*.json> [model size] [--workers N]")
+        sys.exit(1)
+
+    args = sys.argv[2:]
+    worker_count = None
+    if '--workers' in args[:-1]:
+        index = args.index('--workers')
+        worker_count = int(args[index + 1])
+        del args[index:index + 2]
+
+    retranscribe_session(sys.argv[1], model_size=args[0] if args else "small", workers=worker_count)
@@ -43,9 +43,14 @@ class MeetingSessionManager:
         self.save_thread = None
         self.stop_save_thread = False
         
+        self.session_file = None  # path of the final save of the last ended session
+        
+        # Transcript entries are updated from background threads (word alignment)
+        self.lock = threading.RLock()
+        
         print("📝 Meeting Session Manager initialized")
     
-    def start_session(self, meeting_title=None, meeting_id=None):
+    def start_session(self, meeting_title=None, meeting_id=None, audio_path=None):
         """Start a new meeting session"""
         if self.is_active:
             print("⚠ Session already active")
@@ -58,6 +63,7 @@ class MeetingSessionManager:
             'start_time': datetime.now().isoformat(),
             'end_time': None,
             'duration': None,
+            'audio_path': str(audio_path) if audio_path else None,  # meeting recording, if archived
             'participants': {},
             'transcript': [],
             'statistics': {
@@ -97,7 +103,7 @@ class MeetingSessionManager:
         self.stop_auto_save()
         
         # Final save
-        self.save_session()
+        self.session_file = self.save_session()
         
         self.is_active = False
         print(f"⏹️ Session ended: {self.session_data['meeting_title']}")
@@ -153,34 +159,89 @@ class MeetingSessionManager:
         print(f"👤 Participant left: {name}")
         return True
     
-    def add_transcript_entry(self, speaker, text, timestamp=None, confidence=None):
-        """Add a transcript entry"""
+    def add_transcript_entry(self, speaker, text, timestamp=None, confidence=None,
+                             audio_start=None, audio_end=None, words=None):
+        """Add a transcript entry; returns it (audio_start/audio_end: seconds into the meeting recording)"""
         if not self.is_active:
             return False
         
         entry_time = timestamp or datetime.now()
         
-        entry = {
-            'timestamp': entry_time.isoformat() if isinstance(entry_time, datetime) else entry_time,
-            'speaker': speaker,
-            'text': text,
-            'word_count': len(text.split()),
-            'confidence': confidence,
-            'entry_id': len(self.session_data['transcript']) + 1
-        }
-        
-        self.session_data['transcript'].append(entry)
-        
-        # Update participant stats
-        if speaker in self.session_data['participants']:
-            participant = self.session_data['participants'][speaker]
-            participant['word_count'] += entry['word_count']
-            participant['transcript_entries'].append(entry['entry_id'])
+        with self.lock:
+            entry = {
+                'timestamp': entry_time.isoformat() if isinstance(entry_time, datetime) else entry_time,
+                'speaker': speaker,
+                'text': text,
+                'word_count': len(text.split()),
+                'confidence': confidence,
+                'entry_id': len(self.session_data['transcript']) + 1
+            }
+            if audio_start is not None:
+                entry['audio_start'] = round(audio_start, 3)
+                entry['audio_end'] = round(audio_end, 3)
+            if words is not None:
+                entry['words'] = words
+            
+            self.session_data['transcript'].append(entry)
+            
+            # Update participant stats
+            if speaker in self.session_data['participants']:
+                participant = self.session_data['participants'][speaker]
+                participant['word_count'] += entry['word_count']
+                participant['transcript_entries'].append(entry['entry_id'])
+            
+            # Update session statistics
+            self.session_data['statistics']['total_words'] += entry['word_count']
         
-        # Update session statistics
-        self.session_data['statistics']['total_words'] += entry['word_count']
+        return entry
+    
+    def update_transcript_entry(self, entry_id, **fields):
+        """Set extra fields (e.g. aligned words) on an existing entry"""
+        with self.lock:
+            transcript = self.session_data['transcript']
+            if 0 < entry_id <= len(transcript) and transcript[entry_id - 1]['entry_id'] == entry_id:
+                transcript[entry_id - 1].update(fields)
+                return True
+            return False
+    
+    def reassign_speakers(self, speakers):
+        """Rewrite entry speakers ({entry_id: speaker}) and recompute per-participant totals
+        
+        The live label is kept as 'live_speaker'. Word counts, transcript entries,
+        speaking time (from the recording positions) and participation rates are
+        rebuilt from the transcript. Returns the number of entries relabelled.
+        """
+        with self.lock:
+            transcript = self.session_data['transcript']
+            participants = self.session_data['participants']
+            
+            changed = 0
+            for entry in transcript:
+                speaker = speakers.get(entry['entry_id'])
+                if speaker and speaker != entry['speaker'] and entry['speaker'] != 'System':
+                    entry.setdefault('live_speaker', entry['speaker'])
+                    entry['speaker'] = speaker
+                    changed += 1
+            
+            for participant in participants.values():
+                participant['word_count'] = 0
+                participant['speaking_time'] = 0
+                participant['transcript_entries'] = []
+            for entry in transcript:
+                participant = participants.get(entry['speaker'])
+                if participant is None:
+                    continue
+                participant['word_count'] += entry['word_count']
+                participant['transcript_entries'].append(entry['entry_id'])
+                if entry.get('audio_start') is not None:
+                    participant['speaking_time'] = round(
+                        participant['speaking_time'] + entry['audio_end'] - entry['audio_start'], 3)
+            
+            self.session_data['statistics']['total_words'] = sum(
+                entry['word_count'] for entry in transcript if entry['speaker'] != 'System')
+            self.calculate_final_statistics()
         
-        return True
+        return changed
     
     def update_participant_speaking_time(self, speaker, speaking_duration):
         """Update speaking time for a participant"""
@@ -250,7 +311,7 @@ class MeetingSessionManager:
         filepath = self.sessions_dir / filename
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
+            with self.lock, open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(self.session_data, f, indent=2, ensure_ascii=False)
             
             print(f"💾 Session saved: {filepath}")
@@ -333,7 +394,7 @@ class MeetingSessionManager:
     
     def export_as_json(self, filepath):
         """Export as JSON"""
-        with open(filepath, 'w', encoding='utf-8') as f:
+        with self.lock, open(filepath, 'w', encoding='utf-8') as f:
             json.dump(self.session_data, f, indent=2, ensure_ascii=False)
     
     def export_as_docx(self, filepath):
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Adaptive Model Ladder
+Moves between Whisper model sizes based on the measured real-time factor
+"""
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Rough relative CPU cost per decoded second (parameter counts 39M/74M/244M/769M)
+MODEL_COST = {'tiny': 1.0, 'base': 2.0, 'small': 6.0, 'medium': 20.0, 'large': 40.0}
+
+class ModelLadder:
+    def __init__(self, sizes=('tiny', 'base', 'small'), start='base', upgrade_rtf=0.45,
+                 downgrade_rtf=0.9, max_backlog=3, window=12, min_samples=6, cooldown_s=90.0):
+        self.sizes = list(sizes)
+        self.index = self.sizes.index(start) if start in self.sizes else 0
+
+        # Hysteresis: only upgrade if the bigger model is predicted to stay well under
+        # real time, only downgrade once we are clearly falling behind
+        self.upgrade_rtf = upgrade_rtf
+        self.downgrade_rtf = downgrade_rtf
+        self.max_backlog = max_backlog
+        self.min_samples = min_samples
+        self.cooldown = cooldown_s
+
+        self.samples = deque(maxlen=window)
+        self.last_switch = time.monotonic()
+        self.switching = False
+        self.lock = threading.Lock()
+
+        self.stats = {'upgrades': 0, 'downgrades': 0}
+
+    @property
+    def current_size(self):
+        return self.sizes[self.index]
+
+    @property
+    def real_time_factor(self):
+        """Median decode time / audio duration over the recent window"""
+        with self.lock:
+            return float(np.median(self.samples)) if self.samples else None
+
+    def record(self, decode_seconds, audio_seconds, backlog=0):
+        """Add a measurement; returns a model size to switch to, or None"""
+        if audio_seconds <= 0:
+            return None
+
+        with self.lock:
+            self.samples.append(decode_seconds / audio_seconds)
+
+            if self.switching or len(self.samples) < self.min_samples:
+                return None
+            if time.monotonic() - self.last_switch < self.cooldown and backlog <= self.max_backlog * 2:
+                return None
+
+            rtf = float(np.median(self.samples))
+            target = None
+
+            if (rtf > self.downgrade_rtf or backlog > self.max_backlog) and self.index > 0:
+                target = self.index - 1
+            elif self.index < len(self.sizes) - 1 and backlog == 0:
+                current = self.sizes[self.index]
+                bigger = self.sizes[self.index + 1]
+                predicted = rtf * MODEL_COST.get(bigger, 1.0) / MODEL_COST.get(current, 1.0)
+                if predicted < self.upgrade_rtf:
+                    target = self.index + 1
+
+            if target is None:
+                return None
+
+            self.switching = True
+            return self.sizes[target]
+
+    def complete_switch(self, size, success=True):
+        """Report the outcome of a switch started by `record`"""
+        with self.lock:
+            if success and size in self.sizes:
+                new_index = self.sizes.index(size)
+                if new_index > self.index:
+                    self.stats['upgrades'] += 1
+                elif new_index < self.index:
+                    self.stats['downgrades'] += 1
+                self.index = new_index
+
+            # Measurements from the old model say nothing about the new one
+            self.samples.clear()
+            self.last_switch = time.monotonic()
+            self.switching = False
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Whisper Model Quantization
+Dynamic int8 quantization of openai-whisper Linear layers with an on-disk cache
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+MODELS_DIR = Path("models")
+
+def quantized_cache_path(model_size, cache_dir=MODELS_DIR):
+    """Cache file for a quantized model (tied to the torch version that built it)"""
+    import torch
+    version = torch.__version__.split('+')[0]
+    return Path(cache_dir) / f"whisper-{model_size}-int8-torch{version}.pt"
+
+def quantize_whisper_model(model):
+    """Apply PyTorch dynamic int8 quantization to every Linear layer of a Whisper model"""
+    import torch
+    from torch import nn
+
+    # whisper.model.Linear subclasses nn.Linear, which quantize_dynamic will not
+    # convert. Swap each one for a plain nn.Linear sharing the same weights first.
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if isinstance(child, nn.Linear) and type(child) is not nn.Linear:
+                plain = nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                plain.weight = child.weight
+                if child.bias is not None:
+                    plain.bias = child.bias
+                setattr(parent, name, plain)
+
+    model = model.float().eval()
+    return torch.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+def load_quantized_whisper(model_size="base", cache_dir=MODELS_DIR):
+    """Load the int8 model from cache, building and caching it on first use"""
+    import torch
+    import whisper
+
+    cache_path = quantized_cache_path(model_size, cache_dir)
+    if cache_path.exists():
+        try:
+            model = torch.load(cache_path, map_location='cpu', weights_only=False)
+            print(f"✓ Loaded quantized model from {cache_path}")
+            return model
+        except Exception as e:
+            print(f"⚠ Quantized model cache unreadable, rebuilding: {e}")
+
+    print(f"Quantizing Whisper '{model_size}' to int8...")
+    model = quantize_whisper_model(whisper.load_model(model_size, device='cpu'))
+
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        torch.save(model, cache_path)
+        print(f"💾 Quantized model cached: {cache_path}")
+    except Exception as e:
+        print(f"⚠ Could not cache quantized model: {e}")
+
+    return model
+
+def word_error_rate(reference, hypothesis):
+    """Word-level Levenshtein distance divided by reference length"""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = np.arange(len(hyp) + 1)
+    for i, ref_word in enumerate(ref, start=1):
+        current = np.empty_like(previous)
+        current[0] = i
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return float(previous[-1]) / len(ref)
+
+def compare_quantization(clip_path, reference_text, model_sizes=("base", "small"), runs=3,
+                         report_path=MODELS_DIR / "quantization_report.md"):
+    """Measure accuracy and speed of fp32 vs int8 models on one reference clip"""
+    import whisper
+
+    audio = whisper.load_audio(str(clip_path))
+    duration = len(audio) / whisper.audio.SAMPLE_RATE
+
+    rows = []
+    for model_size in model_sizes:
+        for variant in ("fp32", "int8"):
+            if variant == "fp32":
+                model = whisper.load_model(model_size, device='cpu')
+            else:
+                model = load_quantized_whisper(model_size)
+
+            # First decode pays warm-up costs - keep it out of the timing
+            model.transcribe(audio[:whisper.audio.SAMPLE_RATE], language='sq', fp16=False)
+
+            timings = []
+            text = ""
+            for _ in range(runs):
+                started = time.perf_counter()
+                result = model.transcribe(audio, language='sq', fp16=False, temperature=0.0)
+                timings.append(time.perf_counter() - started)
+                text = result['text'].strip()
+
+            decode_time = float(np.median(timings))
+            rows.append({
+                'model': model_size,
+                'variant': variant,
+                'decode_seconds': decode_time,
+                'real_time_factor': decode_time / duration,
+                'wer': word_error_rate(reference_text, text),
+                'text': text,
+            })
+            print(f"  {model_size:>6} {variant}: RTF {rows[-1]['real_time_factor']:.2f}, WER {rows[-1]['wer']:.1%}")
+            del model
+
+    write_report(rows, clip_path, duration, report_path)
+    return rows
+
+def write_report(rows, clip_path, duration, report_path):
+    """Write the comparison as Markdown plus a JSON sidecar"""
+    report_path = Path(report_path)
+    report_path.parent.mkdir(exist_ok=True)
+
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("# Whisper int8 Quantization Report\n\n")
+        f.write(f"Clip: `{clip_path}` ({duration:.1f}s), generated {datetime.now().isoformat(timespec='seconds')}\n\n")
+        f.write("| Model | Weights | Decode (s) | RTF | WER |\n")
+        f.write("|---|---|---|---|---|\n")
+        for row in rows:
+            f.write(f"| {row['model']} | {row['variant']} | {row['decode_seconds']:.2f} | "
+                    f"{row['real_time_factor']:.2f} | {row['wer']:.1%} |\n")
+
+    with open(report_path.with_suffix('.json'), 'w', encoding='utf-8') as f:
+        json.dump(rows, f, indent=2, ensure_ascii=False)
+
+    print(f"📄 Quantization report written: {report_path}")
+
+# Report generation
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python model_quantization.py <albanian_clip.wav> <reference_transcript.txt> [model sizes...]")
+        sys.exit(1)
+
+    with open(sys.argv[2], 'r', encoding='utf-8') as f:
+        reference = f.read()
+
+    sizes = tuple(sys.argv[3:]) or ("base", "small")
+    compare_quantization(sys.argv[1], reference, model_sizes=sizes)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Process Inference
+Runs an ASR backend in its own process with a fixed torch thread budget; audio is passed through shared memory
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from asr_backends import ASRBackend, BACKENDS, create_backend
+from frame_features import FeatureExtractor
+
+SLOT_SECONDS = 30  # initial shared buffer: one full Whisper window
+
+def thread_budget(processes, reserved_cores=1):
+    """Torch threads per inference process, leaving cores for capture, UI and OCR"""
+    cores = os.cpu_count() or 1
+    return max(1, (cores - reserved_cores) // max(1, processes))
+
+def _serve(conn, backend_name, backend_kwargs, threads):
+    """Inference process: load the model once, then answer calls until told to stop"""
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+    started = time.perf_counter()
+    try:
+        backend = create_backend(backend_name, **backend_kwargs)
+        if backend is None:
+            raise RuntimeError(f"ASR backend '{backend_name}' not available")
+        backend.load()
+    except Exception as e:
+        conn.send(('error', str(e)))
+        return
+    conn.send(('ready', time.perf_counter() - started))
+
+    segment = None
+    extractor = None  # built on the first no-speech probe
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+
+        method, slot_name, n_samples, kwargs = message
+        try:
+            args = ()
+            if slot_name is not None:
+                # Re-attach only when the parent had to grow its buffer
+                if segment is None or segment.name != slot_name:
+                    if segment is not None:
+                        segment.close()
+                    segment = shared_memory.SharedMemory(name=slot_name)
+                args = (np.ndarray((n_samples,), dtype=np.float32, buffer=segment.buf),)
+            if method == 'no_speech_probability' and args:
+                # The log-mel is computed here from the shared audio rather than
+                # pickled through the pipe (a full window is ~1 MB)
+                extractor = extractor or FeatureExtractor(sample_rate=backend.sample_rate)
+                kwargs = dict(kwargs, mel=extractor.compute(args[0]).whisper_mel())
+            result = getattr(backend, method)(*args, **kwargs)
+            args = ()  # release the view before the buffer can be closed
+            conn.send(('ok', result))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+
+    if segment is not None:
+        segment.close()
+
+class ProcessBackend(ASRBackend):
+    """Proxy for a backend living in a dedicated inference process
+
+    Calls block the calling thread (without holding the GIL) until the
+    process answers, so one proxy serves one scheduler worker at a time.
+    Audio is copied into a shared-memory slot instead of being pickled.
+    """
+
+    def __init__(self, backend_name='whisper', model_size='base', language='sq', threads=1, **backend_kwargs):
+        super().__init__(model_size=model_size, language=language)
+        self.backend_name = backend_name
+        self.backend_kwargs = backend_kwargs
+        self.threads = threads
+        self.name = f"{backend_name} (process)"
+
+        self.process = None
+        self.conn = None
+        self.slot = None
+        self.lock = threading.Lock()
+        self.load_seconds = None
+
+    def load(self):
+        if self.model is not None:
+            return self.model
+
+        # spawn: a fork would copy the parent's threads, audio stream and GUI state
+        context = multiprocessing.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        kwargs = dict(self.backend_kwargs, model_size=self.model_size, language=self.language)
+        self.process = context.Process(
+            target=_serve,
+            args=(child_conn, self.backend_name, kwargs, self.threads),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        try:
+            status, value = self.conn.recv()
+        except EOFError:
+            status, value = 'error', f"exit code {self.process.exitcode}"
+        if status != 'ready':
+            self.close()
+            raise RuntimeError(f"Inference process failed to load {self.backend_name}: {value}")
+        self.load_seconds = value
+        self.model = self.process.pid
+        return self.model
+
+    def _audio_slot(self, audio):
+        """Copy audio into the shared buffer, growing it if needed; returns (name, n_samples)"""
+        audio = np.asarray(audio, dtype=np.float32)
+        if self.slot is None or self.slot.size < audio.nbytes:
+            if self.slot is not None:
+                self.slot.close()
+                self.slot.unlink()
+            size = max(audio.nbytes, SLOT_SECONDS * self.sample_rate * np.float32().itemsize)
+            self.slot = shared_memory.SharedMemory(create=True, size=size)
+        np.ndarray((len(audio),), dtype=np.float32, buffer=self.slot.buf)[:] = audio
+        return self.slot.name, len(audio)
+
+    def _call(self, method, audio=None, **kwargs):
+        if self.conn is None:
+            raise RuntimeError("Inference process not running")
+        with self.lock:
+            slot_name, n_samples = self._audio_slot(audio) if audio is not None else (None, 0)
+            try:
+                self.conn.send((method, slot_name, n_samples, kwargs))
+                status, value = self.conn.recv()
+            except (EOFError, OSError, BrokenPipeError):
+                raise RuntimeError(f"Inference process {self.model} exited")
+        if status != 'ok':
+            raise RuntimeError(value)
+        return value
+
+    def transcribe(self, audio, word_timestamps=False, initial_prompt=None,
+                   condition_on_previous_text=False, **options):
+        return self._call('transcribe', audio, word_timestamps=word_timestamps, initial_prompt=initial_prompt,
+                          condition_on_previous_text=condition_on_previous_text, **options)
+
+    def no_speech_probability(self, audio, mel=None):
+        # Only the audio crosses the process boundary; the child computes the mel
+        return self._call('no_speech_probability', audio)
+
+    def align(self, audio, text):
+        return self._call('align', audio, text=text)
+
+    def get_stats(self):
+        if self.conn is None or not hasattr(BACKENDS.get(self.backend_name), 'get_stats'):
+            return None
+        return self._call('get_stats')
+
+    def clone(self, model_size=None):
+        return type(self)(self.backend_name, model_size=model_size or self.model_size, language=self.language,
+                          threads=self.threads, **self.backend_kwargs)
+
+    def describe(self):
+        return f"{self.backend_name} ({self.model_size}, own process × {self.threads} threads)"
+
+    def close(self):
+        """Stop the inference process and free the shared buffer"""
+        with self.lock:
+            if self.conn is not None:
+                try:
+                    self.conn.send(None)
+                except (OSError, BrokenPipeError):
+                    pass
+                self.conn.close()
+                self.conn = None
+            if self.process is not None:
+                self.process.join(timeout=5)
+                if self.process.is_alive():
+                    self.process.terminate()
+                self.process = None
+            if self.slot is not None:
+                self.slot.close()
+                self.slot.unlink()
+                self.slot = None
+            self.model = None
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Speaker Diarizer
+Online speaker labelling from MFCC utterance embeddings and a bounded centroid table
+"""
+
+import string
+import threading
+
+import numpy as np
+
+from frame_features import FeatureExtractor
+
+N_MFCC = 20  # c0 (loudness) is dropped, c1..c19 describe the vocal tract
+LIFTER = 22  # sinusoidal liftering so c1/c2 (overall spectral tilt) do not dominate
+
+def dct_matrix(n_input, n_output):
+    """Orthonormal DCT-II basis (n_output x n_input) turning log-mel into cepstra"""
+    k = np.arange(n_output)[:, None]
+    n = np.arange(n_input)[None, :]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_input)) * np.sqrt(2.0 / n_input)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+def speaker_label(index):
+    """Speaker A, B, ... Z, then Speaker 27, 28, ..."""
+    if index < len(string.ascii_uppercase):
+        return f"Speaker {string.ascii_uppercase[index]}"
+    return f"Speaker {index + 1}"
+
+class SpeakerEmbedder:
+    """Fixed-size speaker embedding of an utterance from its frame features
+
+    MFCCs of the voiced frames, summarized by their mean and standard
+    deviation (a statistics-pooling "x-vector" without the network). The
+    loudness coefficient is left out, so moving closer to the microphone
+    does not change the embedding.
+    """
+
+    def __init__(self, n_mels=80, n_mfcc=N_MFCC, lifter=LIFTER, min_voiced_frames=50):
+        n = np.arange(1, n_mfcc)
+        lifter_weights = 1.0 + (lifter / 2.0) * np.sin(np.pi * n / lifter)
+        self.dct = (dct_matrix(n_mels, n_mfcc)[1:] * lifter_weights[:, None]).astype(np.float32)
+        self.min_voiced_frames = min_voiced_frames  # 0.5 s of voiced speech
+
+    def embed(self, features):
+        """Embedding vector, or None when the utterance has too little voiced speech"""
+        if features is None or len(features) < self.min_voiced_frames:
+            return None
+
+        # Voiced frames: louder than the utterance median and not noise-like
+        voiced = (features.energy > np.median(features.energy)) & (features.flatness < 0.5)
+        if np.count_nonzero(voiced) < self.min_voiced_frames // 2:
+            return None
+
+        mfcc = features.log_mel[voiced] @ self.dct.T
+        return np.concatenate((mfcc.mean(axis=0), mfcc.std(axis=0))).astype(np.float32)
+
+class OnlineDiarizer:
+    """Assigns each utterance to a speaker as it arrives
+
+    Every known speaker is a centroid in a table of at most `max_speakers`
+    rows, so labelling costs one vectorized comparison per speaker. An
+    utterance joins the closest centroid when the cosine similarity clears
+    `threshold`, otherwise it starts a new speaker while there is room; once
+    the table is full it joins the closest speaker anyway.
+    """
+
+    def __init__(self, max_speakers=8, threshold=0.85, max_weight=50, sample_rate=16000):
+        self.max_speakers = max_speakers
+        self.threshold = threshold
+        self.max_weight = max_weight  # centroids keep adapting slowly over a long meeting
+
+        self.embedder = SpeakerEmbedder()
+        self.extractor = FeatureExtractor(sample_rate=sample_rate)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all speakers (call when a new recording starts)"""
+        dim = self.embedder.dct.shape[0] * 2
+        self.centroids = np.zeros((self.max_speakers, dim), dtype=np.float32)
+        self.counts = np.zeros(self.max_speakers, dtype=np.int64)
+        self.n_speakers = 0
+        self.labels = []
+        self.last_speaker = None
+        self.last_embedding = None  # embedding of the most recent utterance (None if too short)
+
+        self.stats = {'utterances': 0, 'embedded': 0, 'new_speakers': 0, 'forced': 0}
+
+    def label(self, index):
+        return speaker_label(index)
+
+    def similarities(self, embedding):
+        """Cosine similarity of an embedding to every known speaker"""
+        centroids = self.centroids[:self.n_speakers]
+        norms = np.linalg.norm(centroids, axis=1) * np.linalg.norm(embedding) + 1e-9
+        return centroids @ embedding / norms
+
+    def assign(self, audio=None, features=None):
+        """Speaker label for an utterance (its frame features, or raw audio)"""
+        if features is None and audio is not None:
+            features = self.extractor.compute(audio)
+        embedding = self.embedder.embed(features)
+
+        with self.lock:
+            self.last_embedding = embedding
+            self.stats['utterances'] += 1
+            if embedding is None:
+                # Too short to judge - most likely the same person carrying on
+                return self.label(self.last_speaker or 0)
+
+            self.stats['embedded'] += 1
+
+            index = None
+            if self.n_speakers:
+                scores = self.similarities(embedding)
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    index = best
+                elif self.n_speakers >= self.max_speakers:
+                    index = best
+                    self.stats['forced'] += 1
+            if index is None:
+                index = self._add(embedding)
+            else:
+                self._update(index, embedding)
+
+            self.last_speaker = index
+            return self.label(index)
+
+    def _add(self, embedding):
+        index = self.n_speakers
+        self.n_speakers += 1
+        self.stats['new_speakers'] += 1
+        self.centroids[index] = embedding
+        self.counts[index] = 1
+        self.labels.append(self.label(index))
+        return index
+
+    def _update(self, index, embedding):
+        weight = min(self.counts[index], self.max_weight)
+        self.centroids[index] += (embedding - self.centroids[index]) / (weight + 1)
+        self.counts[index] += 1
+
+    def centroid(self, label):
+        """Current centroid of a speaker label, or None if the label has no voice yet"""
+        with self.lock:
+            if label not in self.labels:
+                return None
+            return self.centroids[self.labels.index(label)].copy()
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['speakers'] = self.n_speakers
+        return stats
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Speaker Tiles
+Finds which participant tile in the Teams video grid carries the speaking border, and names it
+"""
+
+import time
+
+import numpy as np
+
+# Candidate layouts (rows, columns) of the Teams gallery, smallest first
+GRID_LAYOUTS = ((1, 1), (1, 2), (2, 2), (2, 3), (3, 3), (3, 4), (4, 4))
+
+def indicator_mask(rgb):
+    """Pixels in the speaking-indicator colours (green or Teams blue/purple)
+
+    Same HSV ranges as the monitor's OpenCV masks (hue on OpenCV's 0-180
+    scale: 40-80 green, 100-130 blue; saturation and value above 50),
+    computed with numpy so no conversion copy is needed.
+    """
+    rgb = rgb.astype(np.int32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    value = rgb.max(axis=-1)
+    delta = value - rgb.min(axis=-1)
+    saturated = (value > 50) & (delta * 255 > 50 * np.maximum(value, 1))
+
+    # Hue only for the two channel maxima the ranges can fall into
+    safe = np.maximum(delta, 1)
+    green_max = (g == value) & (g > r) & (g > b)
+    blue_max = (b == value) & (b > r) & (b > g)
+    green_hue = 30 * ((b - r) / safe + 2)   # OpenCV hue when green is the maximum
+    blue_hue = 30 * ((r - g) / safe + 4)    # ...and when blue is
+    green = green_max & (green_hue >= 40) & (green_hue <= 80)
+    blue = blue_max & (blue_hue >= 100) & (blue_hue <= 130)
+    return saturated & (green | blue)
+
+class TileSpeakerLocator:
+    """Scores every tile of every candidate grid at once from an integral image
+
+    A speaking tile has a coloured ring: each of its four edge bands holds a
+    line of indicator colour while its interior does not. The ring sits a
+    few pixels inside the tile (gallery gaps), so each edge takes the best
+    line anywhere in its band. Requiring every edge keeps the corner
+    sub-tiles of a finer layout (two coloured edges) from matching. All
+    sums are integral-image lookups, vectorized over the tiles of a layout.
+    Tile names come from `read_name(label_image)` (OCR) and are cached per
+    tile until the name label's pixels change.
+    """
+
+    def __init__(self, read_name=None, min_score=0.5, band_fraction=0.06, name_ttl=60.0):
+        self.read_name = read_name      # read_name(rgb crop of the name label) -> name or None
+        self.min_score = min_score      # weakest edge line minus interior indicator coverage
+        self.band_fraction = band_fraction
+        self.name_ttl = name_ttl        # re-read names this often even when unchanged
+
+        self.name_cache = {}  # (rows, cols, tile) -> (fingerprint, name, read_at)
+        self.stats = {'frames': 0, 'speaking_frames': 0, 'ocr_reads': 0, 'cache_hits': 0}
+
+    def tile_bounds(self, height, width, rows, cols):
+        ys = np.linspace(0, height, rows + 1).astype(int)
+        xs = np.linspace(0, width, cols + 1).astype(int)
+        y0, x0 = np.meshgrid(ys[:-1], xs[:-1], indexing='ij')
+        y1, x1 = np.meshgrid(ys[1:], xs[1:], indexing='ij')
+        return y0.ravel(), y1.ravel(), x0.ravel(), x1.ravel()
+
+    def score_layout(self, integral, rows, cols):
+        """Border score of every tile in a rows x cols layout"""
+        height, width = integral.shape[0] - 1, integral.shape[1] - 1
+        y0, y1, x0, x1 = self.tile_bounds(height, width, rows, cols)
+        band = max(4, int(min(height // rows, width // cols) * self.band_fraction))
+
+        def coverage(top, bottom, left, right):
+            area = np.maximum((bottom - top) * (right - left), 1)
+            total = integral[bottom, right] - integral[top, right] - integral[bottom, left] + integral[top, left]
+            return total / area
+
+        # Best single row/column within each edge band (the ring is thinner than the band)
+        top = bottom = left = right = 0.0
+        for d in range(band):
+            top = np.maximum(top, coverage(y0 + d, y0 + d + 1, x0 + band, x1 - band))
+            bottom = np.maximum(bottom, coverage(y1 - d - 1, y1 - d, x0 + band, x1 - band))
+            left = np.maximum(left, coverage(y0 + band, y1 - band, x0 + d, x0 + d + 1))
+            right = np.maximum(right, coverage(y0 + band, y1 - band, x1 - d - 1, x1 - d))
+        interior = coverage(y0 + band, y1 - band, x0 + band, x1 - band)
+        return np.minimum.reduce([top, bottom, left, right]) - interior
+
+    def locate(self, rgb, participant_count=None):
+        """[(name or None, score, (rows, cols, tile))] for tiles showing the speaking ring"""
+        self.stats['frames'] += 1
+        mask = indicator_mask(rgb)
+        integral = np.zeros((mask.shape[0] + 1, mask.shape[1] + 1), dtype=np.int32)
+        integral[1:, 1:] = mask.cumsum(axis=0, dtype=np.int32).cumsum(axis=1, dtype=np.int32)
+
+        layouts = GRID_LAYOUTS
+        if participant_count:
+            # The gallery has at least as many tiles as people (up to its 16-tile maximum)
+            layouts = [layout for layout in GRID_LAYOUTS
+                       if layout[0] * layout[1] >= min(participant_count, 16)] or [GRID_LAYOUTS[-1]]
+
+        best = None
+        for rows, cols in layouts:
+            scores = self.score_layout(integral, rows, cols)
+            tile = int(np.argmax(scores))
+            if best is None or scores[tile] > best[0]:
+                best = (float(scores[tile]), rows, cols, tile)
+
+        if best is None or best[0] < self.min_score:
+            return []
+        score, rows, cols, tile = best
+        self.stats['speaking_frames'] += 1
+        return [(self.tile_name(rgb, rows, cols, tile), score, (rows, cols, tile))]
+
+    def tile_name(self, rgb, rows, cols, tile):
+        """Name label of a tile (bottom-left corner), OCR'd only when it changed"""
+        if self.read_name is None:
+            return None
+        y0, y1, x0, x1 = (bounds[tile] for bounds in self.tile_bounds(rgb.shape[0], rgb.shape[1], rows, cols))
+        label = rgb[y0 + int((y1 - y0) * 0.8):y1, x0:x0 + int((x1 - x0) * 0.6)]
+        if label.size == 0:
+            return None
+
+        # Coarse grey thumbnail: stable across video motion behind the label, changes with the text
+        grey = label.mean(axis=-1)
+        h, w = grey.shape
+        fingerprint = grey[:h - h % 4, :w - w % 16].reshape(4, h // 4, 16, w // 16).mean(axis=(1, 3)) \
+            if h >= 4 and w >= 16 else grey
+
+        key = (rows, cols, tile)
+        cached = self.name_cache.get(key)
+        now = time.time()
+        if cached and cached[0].shape == fingerprint.shape and np.abs(cached[0] - fingerprint).mean() < 8.0 \
+                and now - cached[2] < self.name_ttl:
+            self.stats['cache_hits'] += 1
+            return cached[1]
+
+        self.stats['ocr_reads'] += 1
+        try:
+            name = self.read_name(label)
+        except Exception as e:
+            print(f"⚠ Tile name OCR error: {e}")
+            name = None
+        self.name_cache[key] = (fingerprint, name, now)
+        return name
+
+class SpeakingIntervals:
+    """Turns per-tick speaking names into (name, start, end) intervals"""
+
+    def __init__(self, max_gap=None):
+        self.max_gap = max_gap  # seconds without a sighting before an interval ends
+        self.open = {}          # name -> [start, last_seen]
+
+    def update(self, names, now=None, tick=2.0):
+        """Feed this tick's speaking names; returns (started_or_extended, ended) interval lists"""
+        now = time.time() if now is None else now
+        max_gap = self.max_gap if self.max_gap is not None else tick * 1.5
+        current = []
+        for name in names:
+            if not name:
+                continue
+            interval = self.open.get(name)
+            if interval and now - interval[1] <= max_gap:
+                interval[1] = now
+            else:
+                interval = self.open[name] = [now - tick / 2, now]
+            current.append((name, interval[0], now + tick / 2))
+
+        ended = []
+        for name in [name for name in self.open if name not in names]:
+            start, last_seen = self.open.pop(name)
+            ended.append((name, start, last_seen + tick / 2))
+        return current, ended
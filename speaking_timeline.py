@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Speaking Timeline
+Timestamped visual "X is speaking" intervals, indexed for overlap queries against audio utterances
+"""
+
+import bisect
+import threading
+import time
+
+class IntervalIndex:
+    """Parallel lists sorted by start, searched with bisect (not an interval tree)
+
+    An interval overlapping [a, b) must start after a - max_length, so a
+    query bisects to that bound and scans every interval from there to b,
+    overlapping or not. That stays short because speaking turns are short
+    and old intervals are pruned; one very long interval widens every
+    query until it is pruned. Intervals arrive roughly in time order, so
+    list inserts are near-appends.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.values = []
+        self.max_length = 0.0
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, start, end, value):
+        """Insert [start, end); returns its position"""
+        position = bisect.bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.values.insert(position, value)
+        self.max_length = max(self.max_length, end - start)
+        return position
+
+    def overlapping(self, start, end):
+        """(overlap seconds, value) for every interval overlapping [start, end)"""
+        first = bisect.bisect_left(self.starts, start - self.max_length)
+        last = bisect.bisect_left(self.starts, end)
+        matches = []
+        for i in range(first, last):
+            overlap = min(end, self.ends[i]) - max(start, self.starts[i])
+            if overlap > 0:
+                matches.append((overlap, self.values[i]))
+        return matches
+
+    def prune(self, before):
+        """Forget intervals that ended before `before`"""
+        # Starting more than max_length before `before` means it has ended too
+        cut = bisect.bisect_left(self.starts, before - self.max_length)
+        if cut:
+            del self.starts[:cut]
+            del self.ends[:cut]
+            del self.values[:cut]
+            self.max_length = max((end - start for start, end in zip(self.starts, self.ends)), default=0.0)
+
+class SpeakingTimeline:
+    """Turns periodic "X is speaking" observations into intervals and attributes utterances
+
+    Visual detectors poll every couple of seconds. Consecutive positive
+    observations of a name extend one interval; an interval closes on a
+    negative observation or when the name has not been seen for
+    `max_gap` seconds. Each observation is taken to cover `sample_span`
+    seconds around it.
+    """
+
+    def __init__(self, sample_span=2.0, max_gap=4.0, min_overlap=0.3, history_s=600):
+        self.sample_span = sample_span
+        self.max_gap = max_gap
+        self.min_overlap = min_overlap  # share of the utterance a speaker must cover
+        self.history_s = history_s
+
+        self.index = IntervalIndex()
+        self.open = {}  # name -> [start, end] of the interval still growing
+        self.lock = threading.Lock()
+
+        self.stats = {'observations': 0, 'intervals': 0, 'attributed': 0, 'unattributed': 0}
+
+    def reset(self):
+        with self.lock:
+            self.index = IntervalIndex()
+            self.open = {}
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def observe(self, name, active=True, timestamp=None):
+        """Record one visual observation of `name` (epoch seconds)"""
+        if not name or name == 'unknown':
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        half = self.sample_span / 2
+
+        with self.lock:
+            self.stats['observations'] += 1
+            interval = self.open.get(name)
+            if interval and (not active or timestamp - interval[1] > self.max_gap):
+                self._close(name)
+                interval = None
+            if active:
+                if interval:
+                    interval[1] = timestamp + half
+                else:
+                    self.open[name] = [timestamp - half, timestamp + half]
+
+    def observe_interval(self, name, start, end, active=True):
+        """Record a speaking interval reported by the detector itself (epoch seconds)
+
+        Overlapping or nearby reports of the same name grow one interval;
+        `active=False` marks the interval as finished at `end`.
+        """
+        if not name or name == 'unknown':
+            return
+
+        with self.lock:
+            self.stats['observations'] += 1
+            interval = self.open.get(name)
+            if interval and start - interval[1] > self.max_gap:
+                self._close(name)
+                interval = None
+            if interval:
+                interval[0] = min(interval[0], start)
+                interval[1] = max(interval[1], end)
+            else:
+                self.open[name] = [start, end]
+            if not active:
+                self._close(name)
+
+    def _close(self, name):
+        start, end = self.open.pop(name)
+        self.index.add(start, end, name)
+        self.stats['intervals'] += 1
+
+    def attribute(self, start, end):
+        """Name whose speaking indicator overlapped [start, end) the most, or None"""
+        with self.lock:
+            # Intervals still open count up to their last observation
+            now_closed = [name for name, interval in self.open.items() if start - interval[1] > self.max_gap]
+            for name in now_closed:
+                self._close(name)
+
+            totals = {}
+            for overlap, name in self.index.overlapping(start, end):
+                totals[name] = totals.get(name, 0.0) + overlap
+            for name, (open_start, open_end) in self.open.items():
+                overlap = min(end, open_end) - max(start, open_start)
+                if overlap > 0:
+                    totals[name] = totals.get(name, 0.0) + overlap
+
+            self.index.prune(end - self.history_s)
+
+            if totals:
+                name, overlap = max(totals.items(), key=lambda item: item[1])
+                if overlap >= self.min_overlap * max(end - start, 1e-3):
+                    self.stats['attributed'] += 1
+                    return name
+            self.stats['unattributed'] += 1
+            return None
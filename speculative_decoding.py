@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Speculative Decoding
+A small Whisper model drafts tokens, the larger one verifies several per forward pass
+"""
+
+import sys
+import time
+
+import numpy as np
+
+DEFAULT_MAX_TOKENS = 224  # Whisper's sample_len default
+
+class DecoderState:
+    """One Whisper text decoder with its own key/value cache
+
+    Runs the decoder blocks directly so several new tokens can be fed on
+    top of a cache (Whisper's own attention mask assumes one token at a
+    time once the cache is filled) and so the self-attention cache can be
+    cut back after rejected draft tokens.
+    """
+
+    def __init__(self, model, audio_features):
+        import torch
+
+        self.torch = torch
+        self.decoder = model.decoder
+        self.n_head = self.decoder.blocks[0].attn.n_head
+        self.keys = [None] * len(self.decoder.blocks)
+        self.values = [None] * len(self.decoder.blocks)
+        self.length = 0
+
+        # Cross-attention keys/values depend only on the audio - computed once
+        self.cross = [(block.cross_attn.key(audio_features), block.cross_attn.value(audio_features))
+                      for block in self.decoder.blocks]
+
+    def _attention(self, q, k, v, mask=None):
+        batch, n_q, width = q.shape
+        head_width = width // self.n_head
+        q = q.view(batch, n_q, self.n_head, head_width).transpose(1, 2)
+        k = k.view(batch, k.shape[1], self.n_head, head_width).transpose(1, 2)
+        v = v.view(batch, v.shape[1], self.n_head, head_width).transpose(1, 2)
+        out = self.torch.nn.functional.scaled_dot_product_attention(q, k, v, attn_mask=mask)
+        return out.transpose(1, 2).reshape(batch, n_q, width)
+
+    def forward(self, tokens):
+        """Feed new tokens; returns float logits for each of them (n_tokens x vocab)"""
+        torch = self.torch
+        decoder = self.decoder
+        offset = self.length
+        n = len(tokens)
+
+        token_tensor = torch.tensor([tokens], dtype=torch.long)
+        x = decoder.token_embedding(token_tensor) + decoder.positional_embedding[offset:offset + n]
+
+        # New token i may attend to every cached position and to new tokens up to itself
+        mask = torch.ones(n, offset + n, dtype=torch.bool).tril(diagonal=offset)
+
+        for i, block in enumerate(decoder.blocks):
+            h = block.attn_ln(x)
+            k = block.attn.key(h)
+            v = block.attn.value(h)
+            if self.keys[i] is not None:
+                k = torch.cat([self.keys[i], k], dim=1)
+                v = torch.cat([self.values[i], v], dim=1)
+            self.keys[i], self.values[i] = k, v
+            x = x + block.attn.out(self._attention(block.attn.query(h), k, v, mask))
+
+            h = block.cross_attn_ln(x)
+            cross_k, cross_v = self.cross[i]
+            x = x + block.cross_attn.out(self._attention(block.cross_attn.query(h), cross_k, cross_v))
+
+            x = x + block.mlp(block.mlp_ln(x))
+
+        self.length += n
+        x = decoder.ln(x)
+        return (x @ decoder.token_embedding.weight.to(x.dtype).T).float()[0]
+
+    def truncate(self, length):
+        """Forget cached positions from `length` on (rejected draft tokens)"""
+        if length >= self.length:
+            return
+        self.keys = [k[:, :length] for k in self.keys]
+        self.values = [v[:, :length] for v in self.values]
+        self.length = length
+
+class SpeculativeDecoder:
+    """Greedy decoding of `target`, accelerated by drafts from `draft`
+
+    The output is the target model's own greedy transcript: a draft token
+    is only kept when it is exactly what the target picks at that position.
+    Both models must share the tokenizer and mel front end (all
+    multilingual sizes up to large-v2 do).
+    """
+
+    def __init__(self, target, draft, language='sq', draft_tokens=4):
+        from whisper.tokenizer import get_tokenizer
+
+        if target.dims.n_vocab != draft.dims.n_vocab or target.dims.n_mels != draft.dims.n_mels:
+            raise ValueError("Draft and target Whisper models use different vocabularies or mel features")
+
+        self.target = target
+        self.draft = draft
+        self.draft_tokens = draft_tokens
+        self.tokenizer = get_tokenizer(
+            target.is_multilingual,
+            num_languages=getattr(target, 'num_languages', 99),
+            language=language,
+            task='transcribe'
+        )
+
+        # Same suppression as Whisper's default greedy decode, plus timestamps
+        tokenizer = self.tokenizer
+        suppress = list(tokenizer.non_speech_tokens) + [
+            tokenizer.transcribe, tokenizer.translate, tokenizer.sot, tokenizer.sot_prev, tokenizer.sot_lm
+        ]
+        if tokenizer.no_speech is not None:
+            suppress.append(tokenizer.no_speech)
+        self.suppress = sorted(set(suppress))
+        self.suppress_first = tokenizer.encode(" ") + [tokenizer.eot]
+
+        self.stats = {'windows': 0, 'tokens': 0, 'drafted': 0, 'accepted': 0,
+                      'target_passes': 0, 'seconds': 0.0}
+
+    def _filter(self, logits, first=False):
+        logits[:, self.suppress] = float('-inf')
+        logits[:, self.tokenizer.timestamp_begin:] = float('-inf')
+        if first:
+            logits[:, self.suppress_first] = float('-inf')
+        return logits
+
+    def decode_window(self, mel, prompt_tokens=(), max_tokens=DEFAULT_MAX_TOKENS):
+        """Decode one 30 s mel window; returns (text tokens, sum logprob, no-speech probability)"""
+        import torch
+
+        tokenizer = self.tokenizer
+        eot = tokenizer.eot
+
+        prefix = []
+        if prompt_tokens:
+            prefix = [tokenizer.sot_prev] + list(prompt_tokens)[-(self.target.dims.n_text_ctx // 2 - 1):]
+        sot_index = len(prefix)
+        prefix += list(tokenizer.sot_sequence) + [tokenizer.no_timestamps]
+        # Positions past the text context have no positional embedding - with a
+        # full prompt, fewer tokens than the usual sample_len still fit
+        n_text_ctx = min(self.target.dims.n_text_ctx, self.draft.dims.n_text_ctx)
+        max_tokens = max(1, min(max_tokens, n_text_ctx - len(prefix)))
+
+        with torch.no_grad():
+            target = DecoderState(self.target, self.target.embed_audio(mel[None]))
+            draft = DecoderState(self.draft, self.draft.embed_audio(mel[None]))
+
+            logits = target.forward(prefix)
+            no_speech_prob = 0.0
+            if tokenizer.no_speech is not None:
+                no_speech_prob = float(logits[sot_index].softmax(-1)[tokenizer.no_speech])
+            draft.forward(prefix)
+            self.stats['target_passes'] += 1
+
+            first = self._filter(logits[-1:].clone(), first=True)
+            logprobs = first.log_softmax(-1)[0]
+            token = int(first[0].argmax())
+            sum_logprob = float(logprobs[token])
+
+            generated = []
+            unfed = []  # accepted tokens the draft model has not processed yet
+            while True:
+                generated.append(token)
+                if token == eot or len(generated) >= max_tokens:
+                    break
+
+                # Draft a few tokens cheaply
+                drafts = []
+                feed = unfed + [token]
+                unfed = []
+                while len(drafts) < self.draft_tokens and len(generated) + len(drafts) < max_tokens:
+                    candidate = int(self._filter(draft.forward(feed)[-1:])[0].argmax())
+                    drafts.append(candidate)
+                    feed = [candidate]
+                    if candidate == eot:
+                        break
+
+                # One target pass checks all of them
+                verify = self._filter(target.forward([token] + drafts))
+                self.stats['target_passes'] += 1
+                choices = verify.argmax(-1).tolist()
+                logprobs = verify.log_softmax(-1)
+
+                accepted = 0
+                while accepted < len(drafts) and drafts[accepted] == choices[accepted]:
+                    sum_logprob += float(logprobs[accepted, drafts[accepted]])
+                    accepted += 1
+                self.stats['drafted'] += len(drafts)
+                self.stats['accepted'] += accepted
+
+                generated.extend(drafts[:accepted])
+                if eot in drafts[:accepted] or len(generated) >= max_tokens:
+                    break
+
+                # The target's own choice after the accepted drafts comes next
+                token = choices[accepted]
+                sum_logprob += float(logprobs[accepted, token])
+
+                # Roll both caches back to prefix + generated
+                length = len(prefix) + len(generated)
+                target.truncate(length)
+                if accepted == len(drafts):
+                    unfed = [drafts[-1]]  # produced by the draft but never fed to it
+                else:
+                    draft.truncate(length)
+
+        text_tokens = [t for t in generated if t != eot]
+        self.stats['tokens'] += len(generated)
+        self.stats['windows'] += 1
+        return text_tokens, sum_logprob, no_speech_prob
+
+    def transcribe(self, audio, initial_prompt=None, condition_on_previous_text=False,
+                   word_timestamps=False, max_tokens=None):
+        """Whisper-style result dict (one segment per 30 s window)"""
+        import torch
+        import whisper
+        from whisper.audio import HOP_LENGTH, N_SAMPLES, SAMPLE_RATE
+
+        from asr_backends import compression_ratio
+
+        started = time.perf_counter()
+        audio = np.asarray(audio, dtype=np.float32)
+        prompt = self.tokenizer.encode(" " + initial_prompt.strip()) if initial_prompt else []
+
+        segments = []
+        for offset in range(0, max(len(audio), 1), N_SAMPLES):
+            window = audio[offset:offset + N_SAMPLES]
+            mel = whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(torch.from_numpy(window)),
+                self.target.dims.n_mels
+            )
+            tokens, sum_logprob, no_speech_prob = self.decode_window(mel, prompt, max_tokens or DEFAULT_MAX_TOKENS)
+
+            text = self.tokenizer.decode(tokens)
+            segment = {
+                'start': offset / SAMPLE_RATE,
+                'end': (offset + len(window)) / SAMPLE_RATE,
+                'text': text,
+                'tokens': tokens,
+                'temperature': 0.0,
+                'avg_logprob': sum_logprob / (len(tokens) + 1),
+                'no_speech_prob': no_speech_prob,
+                'compression_ratio': compression_ratio(text),
+            }
+            if word_timestamps and tokens:
+                segment['words'] = self.align_tokens(tokens, mel, len(window) // HOP_LENGTH, segment['start'])
+            segments.append(segment)
+
+            if condition_on_previous_text:
+                prompt = prompt + tokens
+
+        self.stats['seconds'] += time.perf_counter() - started
+        return {
+            'text': ''.join(segment['text'] for segment in segments),
+            'segments': [segment for segment in segments if segment['tokens']],
+            'language': self.tokenizer.language,
+        }
+
+    def align_tokens(self, tokens, mel, num_frames, offset_s):
+        """Word timings for decoded tokens via the target model's cross-attention"""
+        import torch
+        from whisper.timing import find_alignment
+
+        with torch.no_grad():
+            timings = find_alignment(self.target, self.tokenizer, tokens, mel, num_frames)
+        return [
+            {'word': t.word, 'start': offset_s + float(t.start), 'end': offset_s + float(t.end),
+             'probability': float(t.probability)}
+            for t in timings if t.word
+        ]
+
+    def get_stats(self):
+        """Counters plus acceptance rate and tokens per target forward pass"""
+        stats = dict(self.stats)
+        stats['acceptance_rate'] = stats['accepted'] / stats['drafted'] if stats['drafted'] else 0.0
+        # Plain greedy decoding needs one target pass per token
+        stats['step_speedup'] = stats['tokens'] / stats['target_passes'] if stats['target_passes'] else 1.0
+        return stats
+
+def compare_decoding(clip_path, target_size="small", draft_size="tiny", language="sq", runs=3):
+    """Time plain greedy decoding against speculative decoding on one clip"""
+    import whisper
+
+    audio = whisper.load_audio(str(clip_path))[:whisper.audio.N_SAMPLES]
+    target = whisper.load_model(target_size, device='cpu')
+    draft = whisper.load_model(draft_size, device='cpu')
+    decoder = SpeculativeDecoder(target, draft, language=language)
+
+    # Warm-up both paths once
+    target.transcribe(audio, language=language, fp16=False, temperature=0.0, without_timestamps=True)
+    decoder.transcribe(audio)
+
+    plain_times, speculative_times = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        plain = target.transcribe(audio, language=language, fp16=False, temperature=0.0,
+                                  without_timestamps=True, condition_on_previous_text=False)
+        plain_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        speculative = decoder.transcribe(audio)
+        speculative_times.append(time.perf_counter() - started)
+
+    stats = decoder.get_stats()
+    plain_s = float(np.median(plain_times))
+    speculative_s = float(np.median(speculative_times))
+    print(f"Plain greedy ({target_size}):       {plain_s:.2f}s")
+    print(f"Speculative ({draft_size} → {target_size}): {speculative_s:.2f}s "
+          f"({plain_s / speculative_s:.2f}x, {stats['acceptance_rate']:.0%} drafts accepted, "
+          f"{stats['step_speedup']:.1f} tokens per target pass)")
+    print(f"Same text: {plain['text'].strip() == speculative['text'].strip()}")
+    return plain_s, speculative_s, stats
+
+# Benchmark: python speculative_decoding.py <albanian_clip.wav> [target size] [draft size]
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python speculative_decoding.py <albanian_clip.wav> [target size] [draft size]")
+        sys.exit(1)
+    compare_decoding(sys.argv[1], *sys.argv[2:4])
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Speech Gate
+Cheap spectral speech/non-speech check run before a full Whisper decode
+"""
+
+import numpy as np
+
+from frame_features import FeatureExtractor
+
+class SpeechGate:
+    """Scores a whole utterance for speech likelihood in a few milliseconds
+
+    Three cues, each mapped to 0..1:
+      - band: share of energy in the 300-3400 Hz speech band (hum and hiss sit outside it)
+      - tonality: low spectral flatness of the loud frames (fans, keyboards are flat)
+      - modulation: 2-8 Hz syllable-rate modulation of the energy envelope
+        (music and steady noise barely modulate at that rate)
+
+    Clear non-speech is rejected, clear speech is accepted, and segments in
+    between can be resolved with the backend's `no_speech_probability` probe.
+
+    The cues come from FrameFeatures (25 ms frames, 10 ms hop); utterances
+    cut by the VAD arrive with theirs already computed.
+    """
+
+    def __init__(self, sample_rate=16000, reject_below=0.4, accept_above=0.7, no_speech_threshold=0.6):
+        self.sample_rate = sample_rate
+        self.extractor = FeatureExtractor(sample_rate=sample_rate)
+        self.hop = self.extractor.hop
+
+        self.reject_below = reject_below
+        self.accept_above = accept_above
+        self.no_speech_threshold = no_speech_threshold  # Whisper's own default
+
+        self.stats = {'checked': 0, 'rejected': 0, 'accepted': 0, 'probed': 0, 'probe_rejected': 0}
+
+    def score(self, audio, features=None):
+        """Speech likelihood in 0..1 (0.5 when the audio is too short to judge)"""
+        if features is None:
+            features = self.extractor.compute(audio)
+        if len(features) < 4:
+            return 0.5
+
+        frame_energy = features.energy
+
+        # Only frames near the loudest part of the utterance carry the signal
+        loud = frame_energy > np.percentile(frame_energy, 50)
+        if not np.any(loud):
+            return 0.0
+
+        band_ratio = features.band_energy[loud].sum() / frame_energy[loud].sum()
+        band = np.clip((band_ratio - 0.4) / 0.4, 0.0, 1.0)
+
+        tonality = np.clip((0.5 - float(np.median(features.flatness[loud]))) / 0.35, 0.0, 1.0)
+
+        # Energy envelope at 100 Hz; needs about a second to resolve 2-8 Hz
+        envelope = np.log(frame_energy)
+        if len(envelope) >= 80:
+            spectrum = np.abs(np.fft.rfft(envelope - envelope.mean())) ** 2
+            rates = np.fft.rfftfreq(len(envelope), self.hop / self.sample_rate)
+            syllabic = spectrum[(rates >= 2) & (rates <= 8)].sum()
+            total = spectrum[(rates >= 0.5) & (rates <= 20)].sum() + 1e-12
+            # Steady sounds have a flat envelope whose tiny wobble says nothing
+            depth = np.clip(envelope.std() / 1.5, 0.0, 1.0)
+            modulation = np.clip((syllabic / total - 0.2) / 0.4, 0.0, 1.0) * depth
+        else:
+            modulation = 0.5
+
+        return float(0.3 * band + 0.35 * tonality + 0.35 * modulation)
+
+    def check(self, audio, backend=None, features=None):
+        """True if the audio should be decoded
+
+        `backend` is only consulted for scores between the two thresholds,
+        and only if it implements a first-decoder-step no-speech probe.
+        """
+        self.stats['checked'] += 1
+        score = self.score(audio, features)
+
+        if score < self.reject_below:
+            self.stats['rejected'] += 1
+            return False
+        if score >= self.accept_above or backend is None:
+            self.stats['accepted'] += 1
+            return True
+
+        try:
+            # The probe reuses the utterance's log-mel rather than computing its own
+            mel = features.whisper_mel() if features is not None else None
+            no_speech = backend.no_speech_probability(audio, mel=mel)
+        except Exception as e:
+            print(f"⚠ No-speech probe failed: {e}")
+            no_speech = None
+        if no_speech is None:
+            self.stats['accepted'] += 1
+            return True
+
+        self.stats['probed'] += 1
+        if no_speech > self.no_speech_threshold:
+            self.stats['probe_rejected'] += 1
+            return False
+        self.stats['accepted'] += 1
+        return True
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Streaming Transcriber
+Sliding-window decoding that commits only words two consecutive hypotheses agree on
+"""
+
+import re
+import threading
+
+def normalize_word(word):
+    """Compare words without case, spacing or punctuation"""
+    return re.sub(r'[^\w]', '', word.lower())
+
+class LocalAgreementStreamer:
+    def __init__(self, sample_rate=16000, step_s=1.0, trim_s=10.0, max_buffer_s=20.0,
+                 prompt_chars=200):
+        self.sample_rate = sample_rate
+        self.step = int(step_s * sample_rate)          # new audio needed before re-decoding
+        self.trim = int(trim_s * sample_rate)          # drop committed audio once the buffer is this long
+        self.max_buffer = int(max_buffer_s * sample_rate)
+        self.prompt_chars = prompt_chars
+
+        self.lock = threading.Lock()
+        self.generation = 0  # bumped whenever in-flight results must be ignored
+        self.reset()
+
+    def reset(self):
+        """Forget all state (call when a new recording starts)"""
+        with self.lock:
+            self.generation += 1
+            self.active = False
+            self.utterance_words = 0     # words committed for the open utterance
+            self.buffer_start = 0        # absolute sample position of the decode window start
+            self.committed_end = 0       # absolute end of the last committed word
+            self.last_request_end = 0
+            self.pending = False         # a non-final decode is in flight
+            self.hypothesis = []         # unconfirmed words from the previous decode
+            self.committed_text = ''
+            self.stats = {'decodes': 0, 'committed_words': 0, 'forced_commits': 0, 'discarded': 0}
+
+    def feed(self, utterance_start, end_position):
+        """Called as speech audio arrives; returns a decode request or None"""
+        with self.lock:
+            if not self.active:
+                self.active = True
+                self.utterance_words = 0
+                self.buffer_start = max(utterance_start, self.committed_end)
+                self.last_request_end = self.buffer_start
+
+            if self.pending or end_position - self.last_request_end < self.step:
+                return None
+
+            self.pending = True
+            self.last_request_end = end_position
+            return self._request(end_position, final=False)
+
+    def finish(self, end_position):
+        """Utterance ended - returns a final decode request for the remaining audio"""
+        with self.lock:
+            if not self.active:
+                return None
+            self.active = False
+            self.last_request_end = end_position
+            return self._request(end_position, final=True)
+
+    def discard(self, end_position):
+        """The VAD dropped the open utterance as too short; returns a final request or None
+
+        An utterance that has already committed words is finished as usual.
+        Otherwise it is forgotten, along with any decode still in flight for
+        it, so the next utterance starts its own window.
+        """
+        with self.lock:
+            if not self.active:
+                return None
+            if self.utterance_words:
+                self.active = False
+                self.last_request_end = end_position
+                return self._request(end_position, final=True)
+
+            self.active = False
+            self.generation += 1
+            self.pending = False  # a decode still in flight for it no longer counts
+            self.hypothesis = []
+            self.buffer_start = self.committed_end
+            self.stats['discarded'] += 1
+            return None
+
+    def _request(self, end_position, final):
+        return {
+            'mode': 'stream',
+            'start': self.buffer_start,
+            'end': end_position,
+            'final': final,
+            'generation': self.generation,
+            'prompt': self.committed_text[-self.prompt_chars:]
+        }
+
+    def on_result(self, request, words):
+        """Merge a decode result; returns the newly committed words
+
+        `words` are dicts with 'word', 'start' and 'end' (seconds relative to
+        the request start), as produced by Whisper word timestamps. A request
+        that was dropped or failed must still come back here (with no words)
+        so the next decode can be issued.
+        """
+        with self.lock:
+            if request.get('generation') != self.generation:
+                return []  # decoded for an utterance that was discarded since
+            self.stats['decodes'] += 1
+            if not request['final']:
+                self.pending = False
+
+            # Absolute positions, skipping anything already committed
+            fresh = []
+            for word in words:
+                start = request['start'] + int(word['start'] * self.sample_rate)
+                end = request['start'] + int(word['end'] * self.sample_rate)
+                if end <= self.committed_end + self.sample_rate // 20:
+                    continue
+                fresh.append({'word': word['word'], 'start': start, 'end': end,
+                              'probability': word.get('probability')})
+
+            if request['final']:
+                # Nothing more will arrive for this utterance - take the last hypothesis as is
+                committed = fresh
+                self.hypothesis = []
+            else:
+                committed = []
+                for previous, current in zip(self.hypothesis, fresh):
+                    if normalize_word(previous['word']) != normalize_word(current['word']):
+                        break
+                    committed.append(current)
+                self.hypothesis = fresh[len(committed):]
+
+                # No agreement for too long - stop the window growing without bound
+                if not committed and request['end'] - self.buffer_start > self.max_buffer and self.hypothesis:
+                    committed = self.hypothesis
+                    self.hypothesis = []
+                    self.stats['forced_commits'] += 1
+
+            if committed:
+                self.committed_end = committed[-1]['end']
+                self.committed_text += ''.join(w['word'] for w in committed)
+                self.utterance_words += len(committed)
+                self.stats['committed_words'] += len(committed)
+
+            if request['final']:
+                self.committed_end = max(self.committed_end, request['end'])
+                if not self.active:
+                    self.buffer_start = self.committed_end
+            elif request['end'] - self.buffer_start > self.trim and self.committed_end > self.buffer_start:
+                # Later decodes only need audio after the last committed word
+                self.buffer_start = self.committed_end
+
+            return committed
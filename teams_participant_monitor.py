@@ -10,23 +10,21 @@ import re
 from datetime import datetime
 import json
 
-# Windows-specific imports
-try:
-    import pygetwindow as gw
-    import pyautogui
-    import cv2
-    import numpy as np
-    from PIL import Image
-    import pytesseract
-    SCREEN_AVAILABLE = True
-except ImportError:
-    SCREEN_AVAILABLE = False
+import numpy as np
 
-try:
-    import psutil
-    PROCESS_AVAILABLE = True
-except ImportError:
-    PROCESS_AVAILABLE = False
+from lazy_imports import has_capability, install_hint, lazy_import
+from speaker_tiles import SpeakingIntervals, TileSpeakerLocator
+
+# Windows-specific screen capture and OCR - probed now, imported on first use
+gw = lazy_import('pygetwindow')
+pyautogui = lazy_import('pyautogui')
+cv2 = lazy_import('cv2')
+Image = lazy_import('PIL.Image')
+pytesseract = lazy_import('pytesseract')
+SCREEN_AVAILABLE = has_capability('screen')
+
+psutil = lazy_import('psutil')
+PROCESS_AVAILABLE = has_capability('process')
 
 class TeamsParticipantMonitor:
     def __init__(self):
@@ -41,9 +39,13 @@ class TeamsParticipantMonitor:
         self.check_interval = 2.0  # seconds
         self.screenshot_region = None
         
+        # Speaking border -> gallery tile -> OCR'd name label, as (name, start, end) intervals
+        self.tile_locator = TileSpeakerLocator(read_name=self.read_tile_name)
+        self.speaking_intervals = SpeakingIntervals()
+        
         print("🔍 Teams Participant Monitor initialized")
         if not SCREEN_AVAILABLE:
-            print("⚠ Screen capture not available - install: pip install pygetwindow pyautogui opencv-python pillow pytesseract")
+            print(f"⚠ Screen capture not available - install: {install_hint('screen')}")
         
     def add_participant_callback(self, callback):
         """Add callback for participant changes"""
@@ -110,6 +112,35 @@ class TeamsParticipantMonitor:
             print(f"⚠ Screenshot error: {e}")
             return None
     
+    def get_video_area_screenshot(self):
+        """Take screenshot of the video gallery (left of the participant panel)"""
+        try:
+            if not self.teams_window:
+                if not self.find_teams_window():
+                    return None
+            
+            left, top, width, height = self.teams_window.left, self.teams_window.top, self.teams_window.width, self.teams_window.height
+            
+            # Gallery fills the window between title bar and controls, beside the participant panel
+            screenshot = pyautogui.screenshot(region=(left, top + 100, int(width * 0.75), height - 200))
+            
+            return np.array(screenshot)
+            
+        except Exception as e:
+            print(f"⚠ Screenshot error: {e}")
+            return None
+    
+    def read_tile_name(self, label):
+        """OCR the name label of a gallery tile"""
+        gray = cv2.cvtColor(np.ascontiguousarray(label), cv2.COLOR_RGB2GRAY)
+        
+        # Labels are small - upscale before OCR, and read as a single line
+        gray = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+        text = pytesseract.image_to_string(gray, config='--psm 7')
+        
+        names = self.extract_names_from_text(text)
+        return names[0] if names else None
+    
     def detect_participants_from_screenshot(self, screenshot):
         """Extract participant names from screenshot using OCR"""
         try:
@@ -163,38 +194,40 @@ class TeamsParticipantMonitor:
         return participants
     
     def detect_active_speakers(self, screenshot):
-        """Detect who is currently speaking from visual cues"""
+        """Names of the participants whose gallery tile shows the speaking border
+        
+        Unnamed entries (None) mean a speaking tile whose label could not be read.
+        """
         try:
-            # Look for visual indicators of active speakers
-            # Teams shows green border, waveform, or speaking indicator
-            
-            # Convert to HSV for better color detection
-            hsv = cv2.cvtColor(screenshot, cv2.COLOR_RGB2HSV)
-            
-            # Look for green indicators (speaking)
-            lower_green = np.array([40, 50, 50])
-            upper_green = np.array([80, 255, 255])
-            green_mask = cv2.inRange(hsv, lower_green, upper_green)
-            
-            # Look for blue indicators (active)
-            lower_blue = np.array([100, 50, 50])
-            upper_blue = np.array([130, 255, 255])
-            blue_mask = cv2.inRange(hsv, lower_blue, upper_blue)
-            
-            # Combine masks
-            speaking_mask = cv2.bitwise_or(green_mask, blue_mask)
-            
-            # Find contours (speaking indicators)
-            contours, _ = cv2.findContours(speaking_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            # Return number of active speakers detected
-            active_count = len([c for c in contours if cv2.contourArea(c) > 100])
+            # Teams draws a green/blue ring around the speaking tile
+            participant_count = len(self.get_current_participants()) or None
+            tiles = self.tile_locator.locate(screenshot, participant_count)
             
-            return active_count > 0
+            return [name for name, score, tile in tiles]
             
         except Exception as e:
             print(f"⚠ Speaker detection error: {e}")
-            return False
+            return []
+    
+    def report_speaking(self, names):
+        """Turn this tick's speaking names into interval events"""
+        current, ended = self.speaking_intervals.update(names, tick=self.check_interval)
+        
+        for name, start, end in current:
+            if name not in self.active_speakers:
+                print(f"🎤 {name} is speaking")
+            self.active_speakers.add(name)
+            self.notify_callbacks('speaking', name, {
+                'active': True, 'start': start, 'end': end, 'timestamp': datetime.fromtimestamp(end)
+            })
+        
+        for name, start, end in ended:
+            self.active_speakers.discard(name)
+            if name in self.participants:
+                self.participants[name]['speaking_time'] += end - start
+            self.notify_callbacks('speaking', name, {
+                'active': False, 'start': start, 'end': end, 'timestamp': datetime.fromtimestamp(end)
+            })
     
     def update_participants(self, new_participants):
         """Update participant list and detect changes"""
@@ -244,20 +277,23 @@ class TeamsParticipantMonitor:
                     # Detect participants
                     participants = self.detect_participants_from_screenshot(screenshot)
                     
-                    # Detect active speakers
-                    has_active_speaker = self.detect_active_speakers(screenshot)
-                    
                     # Update participant list
                     if participants:
                         active_count, left_count = self.update_participants(participants)
-                        
-                        if has_active_speaker:
-                            print(f"🎤 Someone is speaking ({len(participants)} participants)")
-                            self.notify_callbacks('speaking', 'unknown', {'active': True})
                     
                     # Store screenshot for debugging
                     self.last_screenshot = screenshot
                 
+                # Detect active speakers in the video gallery
+                video = self.get_video_area_screenshot()
+                if video is not None:
+                    speaking = self.detect_active_speakers(video)
+                    named = [name for name in speaking if name]
+                    if speaking and not named:
+                        # Ring found but its label is unreadable - no attribution possible
+                        self.notify_callbacks('speaking', 'unknown', {'active': True})
+                    self.report_speaking(named)
+                
                 time.sleep(self.check_interval)
                 
             except Exception as e:
@@ -295,6 +331,9 @@ class TeamsParticipantMonitor:
         if hasattr(self, 'monitor_thread'):
             self.monitor_thread.join(timeout=2)
         
+        # Close the speaking intervals still open
+        self.report_speaking([])
+        
         print("⏹️ Participant monitoring stopped")
     
     def get_current_participants(self):
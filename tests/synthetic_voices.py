@@ -0,0 +1,24 @@
+"""Two distinguishable synthetic voices for speaker tests (harmonics shaped by formants)"""
+
+import numpy as np
+
+RATE = 16000
+
+VOICE_A = (110, [(700, 150), (1200, 200), (2500, 300)])
+VOICE_B = (220, [(400, 120), (2300, 250), (3000, 300)])
+
+def voice(params, seconds, seed=0):
+    f0, formants = params
+    rng = np.random.default_rng(seed)
+    f0 = f0 * (1 + rng.normal(0, 0.02))
+    t = np.arange(int(RATE * seconds)) / RATE
+    phase = 2 * np.pi * np.cumsum(f0 * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))) / RATE
+    signal = np.zeros_like(t)
+    for k in range(1, 40):
+        if k * f0 > 7000:
+            break
+        amplitude = sum(np.exp(-((k * f0 - centre) / width) ** 2) for centre, width in formants) + 0.02
+        signal += amplitude * np.sin(k * phase)
+    envelope = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 2.5 * t + rng.random()))
+    signal = signal * envelope / np.abs(signal).max() * 0.5
+    return (signal + rng.normal(0, 0.002, len(t))).astype(np.float32)
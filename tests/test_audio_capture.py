@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import audio_capture
+from audio_capture import CallbackAudioCapture
+
+BLOCK = 1024
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def feed(capture, clock, blocks, seconds_per_block, stall_after=None, stall_s=0.0):
+    data = np.zeros(BLOCK, dtype=np.int16).tobytes()
+    for i in range(blocks):
+        clock.now += seconds_per_block
+        if i == stall_after:
+            clock.now += stall_s
+        capture._stream_callback(data, BLOCK, {}, 0)
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(1000.0)
+    monkeypatch.setattr(audio_capture.time, 'time', clock)
+    return clock
+
+def test_callback_writes_into_ring(clock):
+    capture = CallbackAudioCapture(buffer_seconds=1)
+    feed(capture, clock, 3, BLOCK / 16000)
+    start, samples = capture.read_block(BLOCK * 3, timeout=0.1)
+    assert start == 0 and len(samples) == BLOCK * 3
+    assert capture.get_stats()['frames_captured'] == BLOCK * 3
+
+def test_position_to_time_follows_device_drift(clock):
+    capture = CallbackAudioCapture()
+    capture.start_time = clock.now
+    # Device clock 1% fast: each block arrives a little early
+    feed(capture, clock, 500, BLOCK / 16000 / 1.01)
+    position = 400 * BLOCK
+    assert capture.position_to_time(position) == pytest.approx(1000.0 + position / 16000 / 1.01, abs=1e-6)
+
+def test_position_to_time_after_a_stall(clock):
+    capture = CallbackAudioCapture()
+    capture.start_time = clock.now
+    feed(capture, clock, 300, BLOCK / 16000, stall_after=100, stall_s=5.0)
+    # Samples before the stall keep their times, samples after it are shifted by it
+    assert capture.position_to_time(50 * BLOCK) == pytest.approx(1000.0 + 50 * BLOCK / 16000, abs=1e-6)
+    assert capture.position_to_time(250 * BLOCK) == pytest.approx(1005.0 + 250 * BLOCK / 16000, abs=1e-6)
+
+def test_position_to_time_without_callbacks():
+    capture = CallbackAudioCapture()
+    capture.start_time = 50.0
+    assert capture.position_to_time(16000) == 51.0
+
+def test_arrival_time_is_the_delivering_callback(clock):
+    capture = CallbackAudioCapture()
+    capture.start_time = clock.now
+    feed(capture, clock, 300, BLOCK / 16000 / 1.01, stall_after=100, stall_s=5.0)
+    # Block 250 arrived with callback 250, whatever the sample count says
+    arrived = 1000.0 + 251 * BLOCK / 16000 / 1.01 + 5.0
+    assert capture.arrival_time(250 * BLOCK + 10) == pytest.approx(arrived, abs=1e-6)
+    # Latency measured against it is the pipeline's, not the clock skew
+    assert clock.now - capture.arrival_time(capture.ring.write_position) == pytest.approx(0.0)
@@ -0,0 +1,91 @@
+import threading
+
+import numpy as np
+
+from audio_queue import (BoundedAudioQueue, POLICY_BLOCK, POLICY_DROP_NEWEST, POLICY_DROP_OLDEST,
+                         POLICY_SPILL)
+
+def drain(queue):
+    items = []
+    while queue.qsize():
+        items.append(queue.get(timeout=0))
+    return items
+
+def test_drop_oldest_keeps_newest_items():
+    dropped = []
+    queue = BoundedAudioQueue(maxsize=3, policy=POLICY_DROP_OLDEST, drop_callback=dropped.append)
+    for i in range(5):
+        assert queue.put(i)
+    assert drain(queue) == [2, 3, 4]
+    assert dropped == [0, 1]
+    assert queue.stats['dropped_oldest'] == 2
+
+def test_drop_newest_rejects_incoming_items():
+    dropped = []
+    queue = BoundedAudioQueue(maxsize=3, policy=POLICY_DROP_NEWEST, drop_callback=dropped.append)
+    results = [queue.put(i) for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert drain(queue) == [0, 1, 2]
+    assert dropped == [3, 4]
+
+def test_block_waits_for_space():
+    queue = BoundedAudioQueue(maxsize=1, policy=POLICY_BLOCK)
+    queue.put('first')
+    done = []
+    producer = threading.Thread(target=lambda: done.append(queue.put('second')))
+    producer.start()
+    producer.join(timeout=0.1)
+    assert producer.is_alive()  # still waiting for room
+
+    assert queue.get(timeout=1) == 'first'
+    producer.join(timeout=2)
+    assert done == [True]
+    assert queue.get(timeout=1) == 'second'
+    assert queue.stats['blocked'] == 1
+
+def test_block_timeout_drops_the_item():
+    dropped = []
+    queue = BoundedAudioQueue(maxsize=1, policy=POLICY_BLOCK, block_timeout=0.05, drop_callback=dropped.append)
+    queue.put('first')
+    assert queue.put('second') is False
+    assert dropped == ['second']
+    assert queue.stats['block_timeouts'] == 1
+
+def test_spill_keeps_every_item_in_order(tmp_path):
+    queue = BoundedAudioQueue(maxsize=4, policy=POLICY_SPILL, spill_dir=tmp_path)
+    for i in range(20):
+        queue.put((i, np.full(3, i, dtype=np.float32)))
+    assert queue.qsize() == 20
+    assert queue.stats['spilled'] == 16
+
+    items = drain(queue)
+    assert [i for i, _ in items] == list(range(20))
+    assert all(samples.tolist() == [i] * 3 for i, samples in items)
+    queue.cleanup()
+    assert not list(tmp_path.iterdir())
+
+def test_switch_from_spill_keeps_order_until_disk_drains(tmp_path):
+    queue = BoundedAudioQueue(maxsize=2, policy=POLICY_SPILL, spill_dir=tmp_path)
+    for i in range(5):
+        queue.put(i)
+    queue.set_policy(POLICY_DROP_OLDEST)
+    queue.put(5)  # still behind the spilled items
+    assert drain(queue) == [0, 1, 2, 3, 4, 5]
+
+    for i in range(3):
+        queue.put(i)
+    assert drain(queue) == [1, 2]
+    queue.cleanup()
+
+def test_queued_arrays_are_copies():
+    queue = BoundedAudioQueue(maxsize=2)
+    samples = np.zeros(4, dtype=np.float32)
+    queue.put((0, samples))
+    samples[:] = 1.0
+    assert queue.get(timeout=0)[1].tolist() == [0.0] * 4
+
+def test_close_wakes_consumer():
+    queue = BoundedAudioQueue(maxsize=2)
+    queue.close()
+    assert queue.get(timeout=1) is None
+    assert queue.put(1) is False
@@ -0,0 +1,49 @@
+import numpy as np
+
+from audio_ring_buffer import INT16_SCALE, AudioRingBuffer
+
+def test_window_across_wraparound_is_contiguous():
+    ring = AudioRingBuffer(10, dtype=np.float32)
+    ring.write(np.arange(7, dtype=np.float32))
+    ring.write(np.arange(7, 14, dtype=np.float32))
+
+    start, samples = ring.view(4, 10)
+    assert start == 4
+    assert samples.tolist() == list(range(4, 14))
+    assert np.shares_memory(samples, ring.buffer)  # zero-copy
+    assert ring.overrun_count == 0
+
+def test_int16_is_normalized_on_write():
+    ring = AudioRingBuffer(8, dtype=np.float32)
+    ring.write(np.array([-32768, 0, 16384], dtype=np.int16))
+    _, samples = ring.view(0, 3)
+    assert samples.tolist() == [-1.0, 0.0, 16384 * INT16_SCALE]
+
+def test_overrun_moves_reader_to_oldest_sample():
+    ring = AudioRingBuffer(10, dtype=np.float32)
+    ring.write(np.arange(25, dtype=np.float32))
+
+    start, samples = ring.view(0, 5)
+    assert start == 15
+    assert samples.tolist() == [15, 16, 17, 18, 19]
+    assert ring.overrun_count == 1
+    assert ring.overrun_samples == 15
+
+def test_oversized_write_keeps_newest_samples():
+    ring = AudioRingBuffer(4, dtype=np.float32)
+    ring.write(np.arange(10, dtype=np.float32))
+    assert ring.write_position == 10
+    assert ring.view(ring.oldest_position, 4)[1].tolist() == [6, 7, 8, 9]
+
+def test_read_is_an_owned_copy():
+    ring = AudioRingBuffer(4, dtype=np.float32)
+    ring.write(np.arange(4, dtype=np.float32))
+    start, copy = ring.read(0, 4)
+    ring.write(np.full(4, -1, dtype=np.float32))
+    assert start == 0 and copy.tolist() == [0, 1, 2, 3]
+    assert not ring.is_valid(0)
+
+def test_wait_for_returns_false_when_closed():
+    ring = AudioRingBuffer(4)
+    ring.close()
+    assert ring.wait_for(1, timeout=1.0) is False
@@ -0,0 +1,60 @@
+import threading
+
+import numpy as np
+
+from asr_backends import FakeBackend
+from audio_capture import CallbackAudioCapture
+from inference_scheduler import InferenceScheduler
+from vad_segmenter import VADSegmenter
+
+from test_vad_segmenter import RATE, silence, tone
+
+BLOCK = 1024
+
+def test_capture_to_ordered_transcripts_with_fake_backend():
+    """Capture callback -> ring buffer -> VAD -> scheduler with two fake models -> ordered results"""
+    utterances = [1.2, 2.0, 0.8]
+    parts = [silence(0.5)]
+    for seconds in utterances:
+        parts += [tone(seconds), silence(1.0)]
+    pcm = (np.concatenate(parts) * 32767).astype(np.int16)
+
+    capture = CallbackAudioCapture(sample_rate=RATE, frames_per_buffer=BLOCK, buffer_seconds=10)
+    vad = VADSegmenter(sample_rate=RATE)
+    delivered = []
+
+    def transcribe(job, backend):
+        return backend.transcribe(job['audio'], word_timestamps=True)
+
+    scheduler = InferenceScheduler(
+        transcribe, lambda job, result: delivered.append((job, result)),
+        num_workers=2, worker_init=lambda worker_id: FakeBackend(model_size='tiny')
+    )
+    scheduler.start()
+
+    def callback_thread():
+        for position in range(0, len(pcm), BLOCK):
+            block = pcm[position:position + BLOCK]
+            capture._stream_callback(block.tobytes(), len(block), None, 0)
+        capture.ring.close()
+
+    producer = threading.Thread(target=callback_thread)
+    producer.start()
+    while True:
+        block = capture.read_block(BLOCK, timeout=1.0)
+        if block is None:
+            break
+        position, samples = block
+        for start, end in vad.process(position, samples):
+            _, audio = capture.window(start, end)
+            scheduler.submit({'audio': audio, 'start': start, 'end': end})
+    producer.join()
+    scheduler.stop()
+
+    assert [job['start'] for job, _ in delivered] == sorted(job['start'] for job, _ in delivered)
+    assert len(delivered) == len(utterances)
+    for (job, result), seconds in zip(delivered, utterances):
+        assert abs((job['end'] - job['start']) / RATE - seconds) < 0.5
+        assert len(result['segments'][0]['words']) == int((job['end'] - job['start']) / RATE / 0.4)
+    assert capture.get_stats()['ring_overruns'] == 0
+    assert scheduler.stats['dropped'] == 0
@@ -0,0 +1,191 @@
+import threading
+import time
+
+from audio_queue import POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_SPILL
+from inference_scheduler import InferenceScheduler
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+def test_results_delivered_in_submit_order():
+    delivered = []
+
+    def handler(job, context):
+        # Later jobs finish first
+        time.sleep(0.05 * (3 - job['n'] % 4))
+        return job['n'] * 10
+
+    scheduler = InferenceScheduler(handler, lambda job, result: delivered.append(result),
+                                   num_workers=3, max_backlog=16, policy=POLICY_BLOCK)
+    scheduler.start()
+    for n in range(8):
+        scheduler.submit({'n': n})
+    scheduler.stop()
+
+    assert delivered == [n * 10 for n in range(8)]
+    assert scheduler.get_stats()['processed'] == 8
+    assert scheduler.backlog == 0
+
+def test_worker_context_passed_to_handler():
+    delivered = []
+    scheduler = InferenceScheduler(lambda job, context: context, lambda job, result: delivered.append(result),
+                                   worker_init=lambda worker_id: f"model-{worker_id}")
+    scheduler.start()
+    scheduler.submit({})
+    scheduler.stop()
+    assert delivered == ["model-0"]
+
+def test_dropped_jobs_do_not_stall_delivery():
+    release = threading.Event()
+    delivered = []
+    dropped = []
+
+    def handler(job, context):
+        release.wait(5)
+        return job['n']
+
+    scheduler = InferenceScheduler(handler, lambda job, result: delivered.append(result),
+                                   max_backlog=1, policy=POLICY_DROP_OLDEST,
+                                   drop_callback=lambda job: dropped.append(job['n']))
+    scheduler.start()
+    scheduler.submit({'n': 0})
+    assert wait_until(lambda: scheduler.in_flight == 1)
+    for n in range(1, 4):
+        scheduler.submit({'n': n})  # 1 and 2 are pushed out by the next one
+    release.set()
+    scheduler.stop()
+
+    assert delivered == [0, 3]
+    assert dropped == [1, 2]
+    assert scheduler.get_stats()['dropped'] == 2
+    assert scheduler.completed == {}
+
+def test_held_job_runs_before_stop_returns():
+    release = threading.Event()
+    delivered = []
+
+    def handler(job, context):
+        if job['n'] == 0:
+            release.wait(5)
+        return job['n']
+
+    def batch_handler(jobs, context):
+        return [job['n'] for job in jobs]
+
+    def deliver(job, result):
+        delivered.append(result)
+        if result == 1:
+            time.sleep(0.3)  # stop() polls the backlog meanwhile; the held job must still count
+
+    scheduler = InferenceScheduler(
+        handler, deliver, max_backlog=8, policy=POLICY_BLOCK,
+        batch_handler=batch_handler,
+        # Stream jobs never join a batch - the second one is held for the next pass
+        can_batch=lambda jobs, job: job.get('mode') != 'stream'
+    )
+    scheduler.start()
+    scheduler.submit({'n': 0})
+    assert wait_until(lambda: scheduler.in_flight == 1)
+    scheduler.submit({'n': 1})
+    scheduler.submit({'n': 2, 'mode': 'stream'})
+    release.set()
+    scheduler.stop()
+
+    assert delivered == [0, 1, 2]
+    assert scheduler.backlog == 0
+
+def test_coalesce_replaces_newest_waiting_job():
+    release = threading.Event()
+    delivered = []
+
+    def handler(job, context):
+        release.wait(5)
+        return job['text']
+
+    scheduler = InferenceScheduler(handler, lambda job, result: delivered.append(result), policy=POLICY_BLOCK)
+    scheduler.start()
+    scheduler.submit({'text': 'a'})
+    assert wait_until(lambda: scheduler.in_flight == 1)
+    scheduler.submit({'text': 'b'})
+    assert scheduler.coalesce(lambda job: dict(job, text=job['text'] + 'c'))
+    release.set()
+    scheduler.stop()
+    assert delivered == ['a', 'bc']
+
+def test_replaced_context_released_after_running_job():
+    started = threading.Event()
+    release = threading.Event()
+    released = []
+    used = []
+
+    def handler(job, context):
+        started.set()
+        release.wait(5)
+        # The context must still be usable until the job is done
+        used.append((context, context not in released))
+        return job['n']
+
+    scheduler = InferenceScheduler(handler, lambda job, result: None, policy=POLICY_BLOCK,
+                                   worker_init=lambda worker_id: 'old', release_context=released.append)
+    scheduler.start()
+    scheduler.submit({'n': 0})
+    assert started.wait(5)
+    scheduler.set_context(0, 'new')
+    time.sleep(0.1)
+    assert released == []
+    release.set()
+    scheduler.submit({'n': 1})
+    scheduler.stop()
+
+    assert used == [('old', True), ('new', True)]
+    assert released == ['old']
+
+def test_spill_policy_keeps_every_job_until_workers_start(tmp_path):
+    delivered = []
+    scheduler = InferenceScheduler(lambda job, context: job, lambda job, result: delivered.append(result),
+                                   max_backlog=2, policy=POLICY_SPILL)
+    scheduler.work_queue.spill_dir = tmp_path
+    for i in range(10):
+        scheduler.submit(i)
+    scheduler.set_policy(POLICY_DROP_OLDEST)
+    scheduler.start()
+    scheduler.stop()
+    assert delivered == list(range(10))
+    assert scheduler.stats['dropped'] == 0
+
+def test_stop_waits_while_backlog_drains_and_reports_leftovers(tmp_path):
+    gate = threading.Event()
+    delivered = []
+
+    def handler(job, context):
+        gate.wait(5)
+        time.sleep(0.02)
+        return job
+
+    scheduler = InferenceScheduler(handler, lambda job, result: delivered.append(result),
+                                   max_backlog=2, policy=POLICY_SPILL)
+    scheduler.work_queue.spill_dir = tmp_path
+    scheduler.start()
+    for i in range(20):
+        scheduler.submit(i)
+    gate.set()
+    # 20 jobs take ~0.4 s, longer than the drain timeout, but the backlog keeps shrinking
+    scheduler.stop(drain_timeout=0.2)
+    assert delivered == list(range(20))
+    assert scheduler.stats['abandoned'] == 0
+
+def test_stop_counts_jobs_it_gives_up_on(tmp_path):
+    release = threading.Event()
+    scheduler = InferenceScheduler(lambda job, context: release.wait(5), lambda job, result: None,
+                                   max_backlog=2, policy=POLICY_SPILL)
+    scheduler.work_queue.spill_dir = tmp_path
+    scheduler.start()
+    for i in range(5):
+        scheduler.submit(i)
+    assert wait_until(lambda: scheduler.in_flight == 1)
+    threading.Timer(0.5, release.set).start()
+    scheduler.stop(drain_timeout=0.1)
+    assert scheduler.stats['abandoned'] == 4
@@ -0,0 +1,44 @@
+from latency_slo import LEVEL_FULL, LEVEL_GREEDY, LEVEL_MERGE, LatencySLO
+
+def test_on_time_stays_full():
+    slo = LatencySLO(target_s=4.0)
+    assert slo.observe(1.0) == LEVEL_FULL
+    assert slo.stats['late'] == 0
+
+def test_zero_and_negative_latency():
+    # Capture time computed from the sample count can be ahead of the wall clock
+    slo = LatencySLO(target_s=4.0)
+    assert slo.observe(0.0) == LEVEL_FULL
+    assert slo.observe(-0.01) == LEVEL_FULL
+    assert slo.observe(-5.0) == LEVEL_FULL
+    assert slo.stats['observations'] == 3
+    assert slo.stats['max_latency'] == 0.0
+
+def test_escalates_with_lateness():
+    slo = LatencySLO(target_s=4.0)
+    assert slo.observe(4.5) == LEVEL_GREEDY
+    assert slo.observe(9.0) == LEVEL_MERGE
+    assert slo.merging
+    assert slo.stats['escalations'] == 2
+
+def test_recovers_one_level_after_a_good_run():
+    slo = LatencySLO(target_s=4.0, recover_after=3)
+    slo.observe(9.0)
+    for _ in range(2):
+        assert slo.observe(0.5) == LEVEL_MERGE
+    assert slo.observe(0.5) == LEVEL_MERGE - 1
+    assert slo.stats['recoveries'] == 1
+
+def test_negative_latency_counts_towards_recovery():
+    slo = LatencySLO(target_s=4.0, recover_after=2)
+    slo.observe(4.5)
+    slo.observe(-0.2)
+    assert slo.observe(-0.2) == LEVEL_FULL
+
+def test_decode_options():
+    slo = LatencySLO(beam_size=5)
+    assert slo.decode_options(LEVEL_FULL) == {'beam_size': 5, 'word_timestamps': True}
+    assert slo.decode_options(LEVEL_MERGE) == {'beam_size': None, 'word_timestamps': False}
+
+def test_full_quality_is_greedy_unless_beam_search_is_requested():
+    assert LatencySLO().decode_options(LEVEL_FULL)['beam_size'] is None
@@ -0,0 +1,79 @@
+import json
+import wave
+
+import numpy as np
+
+from meeting_rediarizer import (average_linkage, cluster_embeddings, name_clusters, rediarize_session,
+                                summarize_embeddings)
+
+from synthetic_voices import RATE, VOICE_A, VOICE_B, voice
+
+def noisy_clusters(centres, per_cluster, noise=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = np.asarray(centres, dtype=np.float32)
+    labels = np.tile(np.arange(len(centres)), per_cluster)
+    return centres[labels] + noise * rng.standard_normal((len(labels), centres.shape[1])), labels
+
+CENTRES = np.eye(6)[:3] + 0.2
+
+def test_clusters_are_numbered_by_first_appearance():
+    embeddings, truth = noisy_clusters(CENTRES[[2, 0, 1]], per_cluster=10)
+    clusters = cluster_embeddings(embeddings, threshold=0.85)
+    assert clusters.tolist() == truth.tolist()
+
+def test_max_clusters_forces_further_merges():
+    embeddings, _ = noisy_clusters(CENTRES, per_cluster=5)
+    assert cluster_embeddings(embeddings, threshold=0.99, max_clusters=8).max() + 1 > 3
+    assert cluster_embeddings(embeddings, threshold=0.99, max_clusters=3).max() + 1 == 3
+
+def test_long_meetings_are_summarized_to_the_same_answer():
+    embeddings, truth = noisy_clusters(CENTRES, per_cluster=400)
+    clusters = cluster_embeddings(embeddings, threshold=0.85, max_items=64)
+    assert clusters.tolist() == truth.tolist()
+
+def test_summary_groups_stay_within_the_item_budget():
+    vectors = np.random.default_rng(1).standard_normal((300, 8)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    sums, sizes, groups = summarize_embeddings(vectors, max_items=32)
+    assert len(sums) <= 32 and sizes.sum() == 300
+    assert np.array_equal(np.bincount(groups, minlength=len(sums)), sizes)
+
+def test_average_linkage_weights_rows_by_size():
+    vectors = np.array([[1, 0], [0.8, 0.6], [0, 1]], dtype=np.float32)
+    assert average_linkage(vectors, [1, 1, 1], threshold=0.7, max_clusters=8).tolist() == [0, 0, 2]
+
+def test_name_clusters_by_votes_then_labels():
+    clusters = np.array([0, 0, 1, 1, 2])
+    live = ['Ana', 'Speaker B', 'Ana', 'Besa', 'Speaker A']
+    names = name_clusters(clusters, live, participants={'Ana': {}, 'Besa': {}})
+    assert names[0] == 'Ana' and names[1] == 'Besa'
+    assert names[2] == 'Speaker A'
+
+def test_rediarize_session_fixes_early_live_labels(tmp_path):
+    names = {'A': 'Arta', 'B': 'Blerim'}
+    order = 'ABAABBAB'
+    audio, transcript, position = [], [], 0.0
+    for i, who in enumerate(order):
+        audio += [voice(VOICE_A if who == 'A' else VOICE_B, 2.0, seed=i), np.zeros(RATE // 2, dtype=np.float32)]
+        live = 'Speaker C' if i == 2 else names[who]  # an early online mistake
+        transcript.append({'entry_id': i + 1, 'speaker': live, 'text': 'fjalë', 'word_count': 1,
+                           'confidence': 0.9, 'audio_start': position, 'audio_end': position + 2.0})
+        position += 2.5
+    with wave.open(str(tmp_path / 'meeting.wav'), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes((np.concatenate(audio) * 32767).astype(np.int16).tobytes())
+
+    def participant():
+        return {'speaking_time': 0, 'word_count': 0, 'transcript_entries': []}
+
+    session = {'audio_path': str(tmp_path / 'meeting.wav'), 'transcript': transcript,
+               'participants': {'Arta': participant(), 'Blerim': participant()},
+               'statistics': {'total_words': len(order)}}
+    (tmp_path / 'session.json').write_text(json.dumps(session))
+
+    result = rediarize_session(tmp_path / 'session.json', workers=1)
+    assert [entry['speaker'] for entry in result['transcript']] == [names[who] for who in order]
+    assert result['transcript'][2]['live_speaker'] == 'Speaker C'
+    assert result['rediarization']['speakers'] == 2
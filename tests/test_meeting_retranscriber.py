@@ -0,0 +1,75 @@
+import json
+import wave
+
+import numpy as np
+import pytest
+
+from meeting_retranscriber import check_recording, make_shards, merge_entry, retranscribe_session
+
+from test_vad_segmenter import RATE, silence, tone
+
+def test_merge_keeps_live_text_and_counts_changed_words():
+    entry = {'text': 'mirë se vini', 'word_count': 3, 'confidence': 0.6}
+    changed = merge_entry(entry, 'mirë se erdhët sot', 0.8, [])
+    assert changed == 2
+    assert entry['live_text'] == 'mirë se vini'
+    assert entry['text'] == 'mirë se erdhët sot'
+    assert entry['word_count'] == 4 and entry['revised']
+
+def test_merge_keeps_live_entry_when_final_pass_is_worse_or_empty():
+    entry = {'text': 'mirë se vini', 'word_count': 3, 'confidence': 0.8}
+    assert merge_entry(entry, 'tjetër gjë', 0.5, []) == 0
+    assert merge_entry(entry, '', 0.9, []) == 0
+    assert entry['text'] == 'mirë se vini' and 'live_text' not in entry
+
+def test_check_recording_rejects_truncated_archive():
+    audio = np.zeros(2 * RATE, dtype=np.float32)
+    check_recording([{'audio_end': 2.5}], audio)
+    with pytest.raises(ValueError):
+        check_recording([{'audio_end': 5.0}], audio)
+
+def test_shards_skip_system_entries_and_pad_edges():
+    audio = np.zeros(4 * RATE, dtype=np.float32)
+    transcript = [
+        {'entry_id': 1, 'speaker': 'Ana', 'audio_start': 1.0, 'audio_end': 2.0},
+        {'entry_id': 2, 'speaker': 'System', 'audio_start': 2.0, 'audio_end': 3.0},
+        {'entry_id': 3, 'speaker': 'Ana'},
+    ]
+    (entry_id, offset, samples), = make_shards(transcript, audio, padding_s=0.2)
+    assert entry_id == 1 and offset == pytest.approx(0.8)
+    assert len(samples) == int(1.4 * RATE)
+
+def test_retranscribe_recomputes_participation(tmp_path):
+    audio = np.concatenate([tone(2.0), silence(0.5), tone(1.2), silence(0.5)])
+    wav_path = tmp_path / 'meeting.wav'
+    with wave.open(str(wav_path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes((audio * 32767).astype(np.int16).tobytes())
+
+    def participant(entries):
+        return {'speaking_time': 0, 'word_count': 1, 'participation_rate': 50.0, 'transcript_entries': entries}
+
+    session = {
+        'audio_path': str(wav_path),
+        'participants': {'Ana': participant([1]), 'Besa': participant([2])},
+        'transcript': [
+            {'entry_id': 1, 'speaker': 'Ana', 'text': 'a', 'word_count': 1, 'confidence': 0.1,
+             'audio_start': 0.0, 'audio_end': 2.0},
+            {'entry_id': 2, 'speaker': 'Besa', 'text': 'b', 'word_count': 1, 'confidence': 0.1,
+             'audio_start': 2.5, 'audio_end': 3.7},
+        ],
+        'statistics': {'total_words': 2, 'average_confidence': 0.1},
+    }
+    session_path = tmp_path / 'session.json'
+    session_path.write_text(json.dumps(session))
+
+    result = retranscribe_session(session_path, backend_name='fake', workers=1)
+
+    words = {name: p['word_count'] for name, p in result['participants'].items()}
+    assert sum(words.values()) > 2  # revised text, not the live counts
+    assert result['statistics']['total_words'] == sum(words.values())
+    for name, p in result['participants'].items():
+        assert p['participation_rate'] == pytest.approx(100 * words[name] / sum(words.values()))
+    assert json.loads(session_path.read_text())['participants'] == result['participants']
@@ -0,0 +1,43 @@
+from model_ladder import ModelLadder
+
+def fill(ladder, rtf, backlog=0, count=6):
+    target = None
+    for _ in range(count):
+        target = ladder.record(rtf, 1.0, backlog) or target
+    return target
+
+def test_upgrades_when_fast_and_nothing_is_waiting():
+    ladder = ModelLadder(sizes=('tiny', 'base', 'small'), start='base', cooldown_s=0)
+    assert fill(ladder, 0.003) == 'small'
+    ladder.complete_switch('small')
+    assert ladder.current_size == 'small'
+    assert ladder.stats['upgrades'] == 1
+    assert ladder.real_time_factor is None  # old model's measurements are dropped
+
+def test_no_upgrade_while_jobs_are_waiting():
+    ladder = ModelLadder(start='base', cooldown_s=0)
+    assert fill(ladder, 0.003, backlog=1) is None
+
+def test_downgrades_when_slower_than_real_time():
+    ladder = ModelLadder(start='base', cooldown_s=0)
+    assert fill(ladder, 1.5) == 'tiny'
+    ladder.complete_switch('tiny')
+    assert ladder.current_size == 'tiny'
+    assert ladder.stats['downgrades'] == 1
+
+def test_downgrades_on_deep_backlog():
+    ladder = ModelLadder(start='base', cooldown_s=0, max_backlog=3)
+    assert fill(ladder, 0.3, backlog=4) == 'tiny'
+
+def test_cooldown_holds_unless_backlog_is_severe():
+    ladder = ModelLadder(start='base', cooldown_s=90.0, max_backlog=3)
+    assert fill(ladder, 1.5) is None
+    assert fill(ladder, 1.5, backlog=7) == 'tiny'
+
+def test_one_switch_at_a_time():
+    ladder = ModelLadder(start='base', cooldown_s=0)
+    assert fill(ladder, 1.5) == 'tiny'
+    assert ladder.record(1.5, 1.0) is None  # still switching
+    ladder.complete_switch('tiny', success=False)
+    assert ladder.current_size == 'base'
+    assert ladder.real_time_factor is None
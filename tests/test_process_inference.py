@@ -0,0 +1,21 @@
+import numpy as np
+
+from asr_backends import FakeBackend
+from process_inference import SLOT_SECONDS, ProcessBackend, thread_budget
+
+def test_process_backend_matches_in_process_backend():
+    audio = (0.1 * np.sin(np.arange(32000) / 8.0)).astype(np.float32)
+    backend = ProcessBackend('fake', model_size='tiny', threads=1)
+    backend.load()
+    try:
+        assert backend.transcribe(audio) == FakeBackend(model_size='tiny').transcribe(audio)
+        # The child computes the mel itself; the fake backend has no probe
+        assert backend.no_speech_probability(audio, mel=np.zeros((80, 3000), dtype=np.float32)) is None
+        assert backend.slot.size >= SLOT_SECONDS * 16000 * np.float32().itemsize
+    finally:
+        backend.close()
+    assert backend.slot is None and backend.process is None
+
+def test_thread_budget_never_below_one():
+    assert thread_budget(1000) == 1
+    assert thread_budget(1) >= 1
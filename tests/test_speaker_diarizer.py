@@ -0,0 +1,41 @@
+import numpy as np
+
+from frame_features import FeatureExtractor
+from speaker_diarizer import OnlineDiarizer, SpeakerEmbedder, speaker_label
+
+from synthetic_voices import RATE, VOICE_A, VOICE_B, voice
+
+def test_labels():
+    assert speaker_label(0) == 'Speaker A'
+    assert speaker_label(25) == 'Speaker Z'
+    assert speaker_label(26) == 'Speaker 27'
+
+def test_embedding_ignores_loudness_and_needs_voiced_speech():
+    extractor = FeatureExtractor(sample_rate=RATE)
+    embedder = SpeakerEmbedder()
+    audio = voice(VOICE_A, 2.0)
+    quiet, loud = embedder.embed(extractor.compute(audio * 0.2)), embedder.embed(extractor.compute(audio))
+    assert np.dot(quiet, loud) / (np.linalg.norm(quiet) * np.linalg.norm(loud)) > 0.99
+    assert embedder.embed(extractor.compute(audio[:RATE // 4])) is None
+
+def test_two_voices_get_two_stable_labels():
+    diarizer = OnlineDiarizer(sample_rate=RATE)
+    order = 'ABAABBAB'
+    labels = [diarizer.assign(voice(VOICE_A if who == 'A' else VOICE_B, 2.0, seed=i))
+              for i, who in enumerate(order)]
+    assert labels == ['Speaker A' if who == 'A' else 'Speaker B' for who in order]
+    assert diarizer.get_stats()['speakers'] == 2
+    assert diarizer.centroid('Speaker B') is not None and diarizer.centroid('Speaker C') is None
+
+def test_short_utterance_keeps_the_last_speaker():
+    diarizer = OnlineDiarizer(sample_rate=RATE)
+    diarizer.assign(voice(VOICE_A, 2.0))
+    diarizer.assign(voice(VOICE_B, 2.0))
+    assert diarizer.assign(voice(VOICE_A, 0.2)) == 'Speaker B'
+    assert diarizer.last_embedding is None
+
+def test_full_table_joins_the_closest_speaker():
+    diarizer = OnlineDiarizer(max_speakers=1, sample_rate=RATE)
+    diarizer.assign(voice(VOICE_A, 2.0))
+    assert diarizer.assign(voice(VOICE_B, 2.0)) == 'Speaker A'
+    assert diarizer.stats['forced'] == 1
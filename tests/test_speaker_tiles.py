@@ -0,0 +1,55 @@
+import numpy as np
+
+from speaker_tiles import SpeakingIntervals, TileSpeakerLocator, indicator_mask
+
+GREEN = (60, 200, 80)
+PURPLE_BLUE = (90, 100, 230)
+
+def gallery(rows, cols, speaking=None, ring=GREEN, height=480, width=640, inset=3, thickness=3):
+    """Grey video tiles with a white name label; `speaking` gets a coloured ring"""
+    frame = np.full((height, width, 3), 40, dtype=np.uint8)
+    tile_h, tile_w = height // rows, width // cols
+    for tile in range(rows * cols):
+        y0, x0 = (tile // cols) * tile_h, (tile % cols) * tile_w
+        frame[y0 + int(tile_h * 0.85):y0 + int(tile_h * 0.95), x0 + 10:x0 + 10 + 8 * (tile + 2)] = 230
+        if tile == speaking:
+            top, left = y0 + inset, x0 + inset
+            bottom, right = y0 + tile_h - inset, x0 + tile_w - inset
+            frame[top:top + thickness, left:right] = ring
+            frame[bottom - thickness:bottom, left:right] = ring
+            frame[top:bottom, left:left + thickness] = ring
+            frame[top:bottom, right - thickness:right] = ring
+    return frame
+
+def test_indicator_colours():
+    pixels = np.array([[GREEN, PURPLE_BLUE, (40, 40, 40), (230, 230, 230), (220, 40, 40)]], dtype=np.uint8)
+    assert indicator_mask(pixels).tolist() == [[True, True, False, False, False]]
+
+def test_locates_the_ringed_tile_in_its_layout():
+    locator = TileSpeakerLocator()
+    for rows, cols, tile in ((2, 2, 3), (2, 3, 1), (3, 3, 4)):
+        (name, score, where), = locator.locate(gallery(rows, cols, speaking=tile, ring=PURPLE_BLUE))
+        assert where == (rows, cols, tile)
+        assert name is None and score >= locator.min_score
+
+def test_no_ring_no_speaker():
+    locator = TileSpeakerLocator()
+    assert locator.locate(gallery(2, 2)) == []
+    assert locator.stats['speaking_frames'] == 0
+
+def test_tile_names_are_read_once_while_the_label_is_unchanged():
+    reads = []
+    locator = TileSpeakerLocator(read_name=lambda label: reads.append(label.shape) or 'Ana Berisha')
+    frame = gallery(2, 2, speaking=2)
+    for _ in range(3):
+        assert locator.locate(frame)[0][0] == 'Ana Berisha'
+    assert len(reads) == 1 and locator.stats['cache_hits'] == 2
+
+def test_speaking_intervals_open_extend_and_close():
+    intervals = SpeakingIntervals()
+    current, ended = intervals.update(['Ana'], now=100.0)
+    assert current == [('Ana', 99.0, 101.0)] and ended == []
+    current, ended = intervals.update(['Ana', 'Besa'], now=102.0)
+    assert ('Ana', 99.0, 103.0) in current
+    current, ended = intervals.update(['Besa'], now=104.0)
+    assert ended == [('Ana', 99.0, 103.0)]
@@ -0,0 +1,36 @@
+from speaking_timeline import IntervalIndex, SpeakingTimeline
+
+def test_overlapping_finds_long_interval_started_before_query():
+    index = IntervalIndex()
+    index.add(0.0, 30.0, 'long')
+    for t in range(10):
+        index.add(t + 40.0, t + 40.5, 'short')
+    assert [value for _, value in index.overlapping(20.0, 25.0)] == ['long']
+    assert len(index.overlapping(41.2, 42.2)) == 2
+
+def test_prune_shrinks_search_bound():
+    index = IntervalIndex()
+    index.add(0.0, 100.0, 'a')
+    index.add(200.0, 201.0, 'b')
+    index.prune(150.0)
+    assert len(index) == 1
+    assert index.max_length == 1.0
+
+def test_attribute_from_observations():
+    timeline = SpeakingTimeline(sample_span=2.0, max_gap=4.0)
+    for t in (100.0, 102.0, 104.0):
+        timeline.observe('Ana', timestamp=t)
+    timeline.observe('Ana', active=False, timestamp=106.0)
+    timeline.observe_interval('Besa', 110.0, 115.0, active=False)
+
+    assert timeline.attribute(101.0, 104.0) == 'Ana'
+    assert timeline.attribute(111.0, 114.0) == 'Besa'
+    assert timeline.attribute(200.0, 203.0) is None
+
+def test_reset_clears_intervals_and_stats():
+    timeline = SpeakingTimeline()
+    timeline.observe_interval('Ana', 0.0, 5.0, active=False)
+    timeline.attribute(1.0, 4.0)
+    timeline.reset()
+    assert len(timeline.index) == 0
+    assert all(value == 0 for value in timeline.stats.values())
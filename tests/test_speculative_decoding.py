@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip('torch')
+whisper_model = pytest.importorskip('whisper.model')
+
+from speculative_decoding import DecoderState
+
+def tiny_decoder():
+    torch.manual_seed(0)
+    decoder = whisper_model.TextDecoder(n_vocab=64, n_ctx=16, n_state=16, n_head=2, n_layer=2)
+    with torch.no_grad():
+        for parameter in decoder.parameters():
+            parameter.normal_(std=0.2)  # the positional embedding starts uninitialized
+    return decoder.eval()
+
+def test_incremental_decode_after_truncation_matches_a_full_pass():
+    decoder = tiny_decoder()
+    audio_features = torch.randn(1, 6, 16)
+    tokens = [1, 2, 3, 4, 5, 6]
+
+    with torch.no_grad():
+        reference = decoder(torch.tensor([tokens]), audio_features)[0].float()
+
+        state = DecoderState(SimpleNamespace(decoder=decoder), audio_features)
+        first = state.forward(tokens[:3])
+        state.forward([40, 41])  # draft tokens the target rejects
+        state.truncate(3)
+        rest = state.forward(tokens[3:])  # several tokens on top of the cache at once
+
+    assert state.length == len(tokens)
+    assert all(k.shape[1] == len(tokens) for k in state.keys)
+    assert torch.allclose(first, reference[:3], atol=1e-4)
+    assert torch.allclose(rest, reference[3:], atol=1e-4)
+
+def test_truncate_past_the_end_is_a_no_op():
+    decoder = tiny_decoder()
+    with torch.no_grad():
+        state = DecoderState(SimpleNamespace(decoder=decoder), torch.randn(1, 6, 16))
+        state.forward([1, 2])
+    state.truncate(5)
+    assert state.length == 2
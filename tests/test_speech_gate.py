@@ -0,0 +1,47 @@
+import numpy as np
+
+from asr_backends import FakeBackend
+from speech_gate import SpeechGate
+
+RATE = 16000
+T = np.arange(2 * RATE) / RATE
+
+def syllables():
+    """Voiced harmonics in the speech band, modulated at a syllable rate (4 Hz)"""
+    voiced = (0.3 * np.sin(2 * np.pi * 200 * T) + np.sin(2 * np.pi * 400 * T)
+              + 0.8 * np.sin(2 * np.pi * 800 * T) + 0.5 * np.sin(2 * np.pi * 1600 * T))
+    return (0.2 * voiced * (0.05 + 0.95 * np.sin(2 * np.pi * 2 * T) ** 2)).astype(np.float32)
+
+def hiss():
+    return (0.1 * np.random.default_rng(0).standard_normal(len(T))).astype(np.float32)
+
+class ProbeBackend(FakeBackend):
+    def __init__(self, no_speech):
+        super().__init__()
+        self.no_speech = no_speech
+        self.probes = 0
+
+    def no_speech_probability(self, audio, mel=None):
+        self.probes += 1
+        return self.no_speech
+
+def test_scores_separate_speech_from_noise():
+    gate = SpeechGate(sample_rate=RATE)
+    assert gate.score(syllables()) > gate.accept_above
+    assert gate.score(hiss()) < gate.reject_below
+    assert gate.score(syllables()[:400]) == 0.5  # too short to judge
+
+def test_clear_cases_skip_the_probe():
+    gate = SpeechGate(sample_rate=RATE)
+    backend = ProbeBackend(no_speech=0.99)
+    assert gate.check(syllables(), backend)
+    assert not gate.check(hiss(), backend)
+    assert backend.probes == 0
+    assert gate.stats['accepted'] == 1 and gate.stats['rejected'] == 1
+
+def test_uncertain_audio_is_decided_by_the_probe():
+    gate = SpeechGate(sample_rate=RATE, reject_below=0.0, accept_above=1.1)
+    assert not gate.check(syllables(), ProbeBackend(no_speech=0.9))
+    assert gate.check(syllables(), ProbeBackend(no_speech=0.1))
+    assert gate.check(syllables(), ProbeBackend(no_speech=None))  # no probe: decode to be safe
+    assert gate.stats['probed'] == 2 and gate.stats['probe_rejected'] == 1
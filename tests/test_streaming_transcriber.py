@@ -0,0 +1,55 @@
+from streaming_transcriber import LocalAgreementStreamer
+
+RATE = 16000
+
+def words(*items):
+    return [{'word': word, 'start': start, 'end': end} for word, start, end in items]
+
+def test_agreeing_hypotheses_commit():
+    streamer = LocalAgreementStreamer(sample_rate=RATE)
+    first = streamer.feed(0, RATE)
+    assert streamer.on_result(first, words((' a', 0.1, 0.4))) == []
+    second = streamer.feed(0, 2 * RATE)
+    committed = streamer.on_result(second, words((' a', 0.1, 0.4), (' b', 0.5, 0.9)))
+    assert [w['word'] for w in committed] == [' a']
+
+def test_discarded_blip_does_not_leak_into_next_utterance():
+    streamer = LocalAgreementStreamer(sample_rate=RATE)
+    blip = streamer.feed(5 * RATE, 6 * RATE)
+    assert blip is not None
+
+    # VAD drops the blip while its decode is still in flight
+    assert streamer.discard(6 * RATE) is None
+    assert not streamer.active
+    assert streamer.on_result(blip, words((' noise', 0.0, 0.2))) == []
+
+    request = streamer.feed(20 * RATE, 21 * RATE)
+    assert request['start'] == 20 * RATE
+    assert streamer.on_result(request, words((' hello', 0.1, 0.5))) == []
+    final = streamer.finish(22 * RATE)
+    assert [w['word'] for w in streamer.on_result(final, words((' hello', 0.1, 0.5)))] == [' hello']
+    assert streamer.stats['discarded'] == 1
+
+def test_discard_finishes_an_utterance_with_committed_words():
+    streamer = LocalAgreementStreamer(sample_rate=RATE)
+    streamer.on_result(streamer.feed(0, RATE), words((' a', 0.1, 0.4)))
+    streamer.on_result(streamer.feed(0, 2 * RATE), words((' a', 0.1, 0.4)))
+    final = streamer.discard(2 * RATE)
+    assert final is not None and final['final']
+
+def test_dropped_or_failed_decode_does_not_block_later_decodes():
+    streamer = LocalAgreementStreamer(sample_rate=RATE)
+    request = streamer.feed(0, RATE)
+    assert streamer.feed(0, 2 * RATE) is None  # waiting for the first decode
+    # The scheduler dropped it (or the handler failed): it comes back with no words
+    assert streamer.on_result(request, []) == []
+    assert streamer.feed(0, 3 * RATE) is not None
+
+def test_discard_clears_pending_decode():
+    streamer = LocalAgreementStreamer(sample_rate=RATE)
+    stale = streamer.feed(0, RATE)
+    streamer.discard(RATE)
+    request = streamer.feed(5 * RATE, 6 * RATE)
+    assert request is not None
+    streamer.on_result(stale, [])  # late answer for the blip leaves the new decode pending
+    assert streamer.feed(5 * RATE, 8 * RATE) is None
@@ -0,0 +1,45 @@
+import pytest
+
+from transcript_quality import (MAX_DECODE_TOKENS, MIN_DECODE_TOKENS, assess_result, filter_segments,
+                                is_hallucination, max_decode_tokens, segment_confidence, segments_confidence,
+                                trim_repetition)
+
+def segment(text=' mirë', start=0.0, end=1.0, avg_logprob=-0.2, no_speech_prob=0.05, compression_ratio=1.2):
+    return {'text': text, 'start': start, 'end': end, 'avg_logprob': avg_logprob,
+            'no_speech_prob': no_speech_prob, 'compression_ratio': compression_ratio}
+
+def test_decode_budget_grows_with_duration_and_is_capped():
+    assert max_decode_tokens(0) == MIN_DECODE_TOKENS
+    assert max_decode_tokens(2.0) > max_decode_tokens(1.0)
+    assert max_decode_tokens(30.0) == MAX_DECODE_TOKENS
+
+def test_confidence_from_decoder_statistics():
+    assert segment_confidence(segment(avg_logprob=0.0, no_speech_prob=0.0)) == 1.0
+    assert segment_confidence(segment(avg_logprob=-0.2)) > segment_confidence(segment(avg_logprob=-0.8))
+    assert segment_confidence(segment(compression_ratio=3.0)) == 0.0
+
+def test_hallucinations_are_filtered():
+    loop = segment(compression_ratio=3.0)
+    silence = segment(no_speech_prob=0.9, avg_logprob=-1.2)
+    unsure = segment(avg_logprob=-1.8)
+    good = segment()
+    assert all(is_hallucination(s) for s in (loop, silence, unsure))
+    assert filter_segments([loop, good, silence, unsure]) == [good]
+
+def test_confidence_is_weighted_by_duration():
+    long_good = segment(start=0.0, end=9.0, avg_logprob=0.0, no_speech_prob=0.0)
+    short_bad = segment(start=9.0, end=10.0, compression_ratio=3.0)
+    assert segments_confidence([long_good, short_bad]) == pytest.approx(0.9)
+    assert segments_confidence([]) == 0.0
+
+def test_trim_repetition_collapses_loops():
+    assert trim_repetition('po po po po po') == 'po po'
+    assert trim_repetition('faleminderit shumë, faleminderit shumë, faleminderit shumë') == \
+        'faleminderit shumë, faleminderit shumë,'
+    assert trim_repetition(' mirë se vini ') == 'mirë se vini'
+
+def test_assess_result_drops_bad_segments():
+    result = {'segments': [segment(' Mirëdita.'), segment(' Mirëdita.' * 10, compression_ratio=4.0)]}
+    text, confidence = assess_result(result)
+    assert text == 'Mirëdita.'
+    assert 0.0 < confidence < 1.0
@@ -0,0 +1,40 @@
+import numpy as np
+
+from utterance_packer import UtterancePacker
+
+RATE = 16000
+
+def test_pack_places_utterances_between_separators():
+    packer = UtterancePacker(sample_rate=RATE, separator_s=0.5)
+    audios = [np.ones(RATE, dtype=np.float32), np.full(2 * RATE, 2.0, dtype=np.float32)]
+    packed, spans = packer.pack(audios)
+    assert spans == [(0.0, 1.0), (1.5, 3.5)]
+    assert len(packed) == int(3.5 * RATE)
+    assert not packed[RATE:int(1.5 * RATE)].any()
+    assert packed[int(2.0 * RATE)] == 2.0
+
+def test_fits_respects_one_encoder_window():
+    packer = UtterancePacker(sample_rate=RATE, max_window_s=30.0, separator_s=0.6)
+    assert packer.fits([10 * RATE], 19 * RATE)
+    assert not packer.fits([10 * RATE], 20 * RATE)  # the separator pushes it over
+
+def test_assign_words_by_midpoint_and_nearest_span():
+    packer = UtterancePacker(sample_rate=RATE)
+    spans = [(0.0, 1.0), (1.6, 3.0)]
+    words = [
+        {'word': ' mirë', 'start': 0.1, 'end': 0.5},
+        {'word': ' dita', 'start': 0.8, 'end': 1.3},   # midpoint 1.05: in the separator, nearer the first
+        {'word': ' si', 'start': 1.4, 'end': 1.7},     # midpoint 1.55: nearer the second
+        {'word': ' jeni', 'start': 2.0, 'end': 2.5},
+    ]
+    result = {'segments': [{'text': '', 'start': 0.0, 'end': 3.0, 'words': words}]}
+    assert packer.split(result, spans) == ['mirë dita', 'si jeni']
+
+def test_assign_whole_segments_without_word_timestamps():
+    packer = UtterancePacker(sample_rate=RATE)
+    spans = [(0.0, 1.0), (1.6, 3.0)]
+    result = {'segments': [{'text': ' Po.', 'start': 0.0, 'end': 0.9},
+                           {'text': ' Jo.', 'start': 1.7, 'end': 2.9}]}
+    groups = packer.assign(result, spans)
+    assert [[unit['word'] for unit, _ in group] for group in groups] == [[' Po.'], [' Jo.']]
+    assert groups[1][0][1] is result['segments'][1]
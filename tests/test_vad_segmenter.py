@@ -0,0 +1,55 @@
+import numpy as np
+
+from vad_segmenter import VADSegmenter
+
+RATE = 16000
+
+def tone(seconds, amplitude=0.2):
+    """Voiced-speech stand-in: loud, harmonic, not spectrally flat"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    wave = np.sin(2 * np.pi * 180 * t) + 0.5 * np.sin(2 * np.pi * 360 * t) + 0.3 * np.sin(2 * np.pi * 720 * t)
+    return (amplitude * wave).astype(np.float32)
+
+def silence(seconds, seed=0):
+    return (0.001 * np.random.default_rng(seed).standard_normal(int(seconds * RATE))).astype(np.float32)
+
+def segment(vad, audio, block=1024):
+    segments = []
+    for position in range(0, len(audio), block):
+        segments += vad.process(position, audio[position:position + block])
+    return segments
+
+def test_one_utterance_with_pre_roll_and_tail():
+    vad = VADSegmenter(sample_rate=RATE)
+    segments = segment(vad, np.concatenate([silence(1), tone(1), silence(1)]))
+    assert len(segments) == 1
+    start, end = segments[0]
+    assert 0.75 * RATE <= start < 1.0 * RATE    # up to 200 ms of pre-roll
+    assert 2.0 * RATE < end <= 2.3 * RATE       # speech end plus a little trailing silence
+
+def test_blip_shorter_than_min_speech_is_discarded():
+    vad = VADSegmenter(sample_rate=RATE)
+    assert segment(vad, np.concatenate([silence(1), tone(0.1), silence(1)])) == []
+    assert vad.stats['discarded'] == 1
+    assert not vad.in_speech
+
+def test_long_speech_is_split_below_max_utterance():
+    vad = VADSegmenter(sample_rate=RATE, max_utterance_s=15.0)
+    segments = segment(vad, np.concatenate([silence(1), tone(20), silence(1)]))
+    assert len(segments) == 2
+    assert segments[0][1] == segments[1][0]  # contiguous: nothing lost at the cut
+    assert all(end - start <= 15 * RATE for start, end in segments)
+    assert vad.stats['forced_splits'] == 1
+
+def test_flush_closes_open_utterance():
+    vad = VADSegmenter(sample_rate=RATE)
+    assert segment(vad, np.concatenate([silence(1), tone(1)])) == []
+    assert vad.in_speech
+    (start, end), = vad.flush()
+    assert end == vad.last_speech_end
+    assert not vad.in_speech
+
+def test_silence_yields_nothing():
+    vad = VADSegmenter(sample_rate=RATE)
+    assert segment(vad, silence(3)) == []
+    assert vad.stats['speech_frames'] == 0
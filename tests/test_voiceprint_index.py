@@ -0,0 +1,41 @@
+import numpy as np
+
+from voiceprint_index import VoiceprintIndex
+
+def unit(dim, index):
+    vector = np.zeros(dim, dtype=np.float32)
+    vector[index] = 1.0
+    return vector
+
+def test_lookup_names_only_close_voices(tmp_path):
+    index = VoiceprintIndex(tmp_path, dim=4, threshold=0.9)
+    assert index.lookup(unit(4, 0)) == (None, 0.0)
+    index.enroll('Ana', unit(4, 0) * 3)
+    index.enroll('Besa', unit(4, 1))
+
+    name, score = index.lookup(unit(4, 0) + 0.1 * unit(4, 2))
+    assert name == 'Ana' and score > 0.99
+    name, score = index.lookup(unit(4, 0) + unit(4, 1))
+    assert name is None and score < 0.9
+
+def test_enrollment_is_a_running_mean(tmp_path):
+    index = VoiceprintIndex(tmp_path, dim=4)
+    index.enroll('Ana', unit(4, 0))
+    index.enroll('Ana', unit(4, 1))
+    assert len(index) == 1 and index.counts == [2]
+    assert np.allclose(index.matrix[0], [np.sqrt(0.5), np.sqrt(0.5), 0, 0], atol=1e-6)
+    assert index.dirty
+
+def test_index_persists_and_grows(tmp_path):
+    index = VoiceprintIndex(tmp_path, dim=32)
+    for i in range(20):  # past the initial 16 rows
+        index.enroll(f"Person {i}", unit(32, i))
+    index.save()
+
+    reopened = VoiceprintIndex(tmp_path, dim=32)
+    assert len(reopened) == 20 and reopened.capacity == 32
+    assert reopened.lookup(unit(32, 17))[0] == 'Person 17'
+
+def test_changed_embedding_size_starts_a_new_index(tmp_path):
+    VoiceprintIndex(tmp_path, dim=4).enroll('Ana', unit(4, 0))
+    assert len(VoiceprintIndex(tmp_path, dim=8)) == 0
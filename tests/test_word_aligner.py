@@ -0,0 +1,56 @@
+import threading
+import time
+
+import numpy as np
+
+from asr_backends import FakeBackend
+from word_aligner import WordAligner
+
+from test_vad_segmenter import tone
+
+class ForcedAlignBackend(FakeBackend):
+    def align(self, audio, text):
+        return [{'word': word, 'start': i * 0.5, 'end': i * 0.5 + 0.4, 'probability': 0.87654}
+                for i, word in enumerate(text.split())]
+
+def run(aligner, jobs):
+    aligner.start()
+    for key, audio, text in jobs:
+        aligner.submit(key, audio, text)
+    aligner.stop()
+
+def test_forced_alignment_when_the_backend_has_it():
+    aligned = {}
+    aligner = WordAligner(ForcedAlignBackend, lambda key, words: aligned.setdefault(key, words))
+    run(aligner, [(1, tone(1.0), 'mirë se vini')])
+    assert [(w['word'], w['start'], w['probability']) for w in aligned[1]] == \
+        [('mirë', 0.0, 0.877), ('se', 0.5, 0.877), ('vini', 1.0, 0.877)]
+
+def test_falls_back_to_a_word_timestamp_decode():
+    aligned = {}
+    aligner = WordAligner(FakeBackend, lambda key, words: aligned.setdefault(key, words))
+    run(aligner, [(1, tone(1.2), 'tre fjalë'), (2, tone(0.1), '')])
+    assert len(aligned[1]) == 3  # one fake word per 0.4 s
+    assert 2 not in aligned and aligner.stats['submitted'] == 1
+
+def test_waits_while_live_transcription_is_busy():
+    busy = threading.Event()
+    busy.set()
+    aligned = []
+    aligner = WordAligner(FakeBackend, lambda key, words: aligned.append(key), is_busy=busy.is_set)
+    aligner.start()
+    aligner.submit(1, tone(1.0), 'po')
+    time.sleep(0.5)
+    assert aligned == []
+    busy.clear()
+    aligner.stop()
+    assert aligned == [1] and aligner.stats['yield_seconds'] > 0.3
+
+def test_errors_are_counted_not_raised():
+    class Broken(FakeBackend):
+        def align(self, audio, text):
+            raise RuntimeError("no model")
+
+    aligner = WordAligner(Broken, lambda key, words: None)
+    run(aligner, [(1, np.zeros(16000, dtype=np.float32), 'po')])
+    assert aligner.stats['failed'] == 1 and aligner.stats['aligned'] == 0
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Transcript Quality
+Per-segment confidence, hallucination filtering and repetition trimming for Whisper results
+"""
+
+import math
+import re
+
+# Whisper's own fallback thresholds
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+# Token budget per decode window: fast Albanian speech stays well under 12 tokens/s,
+# a repetition loop keeps going until the limit
+TOKENS_PER_SECOND = 12
+MIN_DECODE_TOKENS = 16
+MAX_DECODE_TOKENS = 224  # Whisper's sample_len default (half the text context)
+
+def max_decode_tokens(duration_s):
+    """Upper bound on tokens worth decoding for this much audio"""
+    return int(min(MAX_DECODE_TOKENS, MIN_DECODE_TOKENS + TOKENS_PER_SECOND * duration_s))
+
+def segment_confidence(segment):
+    """Confidence in 0..1 from a segment's decoder statistics
+
+    exp(avg_logprob) is the geometric-mean token probability; it is scaled
+    by the chance that there is speech at all. Repetition loops score zero.
+    """
+    if segment.get('compression_ratio', 0.0) > COMPRESSION_RATIO_THRESHOLD:
+        return 0.0
+    token_probability = math.exp(min(segment.get('avg_logprob', LOGPROB_THRESHOLD), 0.0))
+    return token_probability * (1.0 - segment.get('no_speech_prob', 0.0))
+
+def is_hallucination(segment):
+    """Segments Whisper would have retried or skipped: loops, silence, very unsure text"""
+    if segment.get('compression_ratio', 0.0) > COMPRESSION_RATIO_THRESHOLD:
+        return True
+    avg_logprob = segment.get('avg_logprob', 0.0)
+    if segment.get('no_speech_prob', 0.0) > NO_SPEECH_THRESHOLD and avg_logprob < LOGPROB_THRESHOLD:
+        return True
+    return avg_logprob < LOGPROB_THRESHOLD * 1.5
+
+def filter_segments(segments):
+    """Drop hallucinated segments"""
+    return [segment for segment in segments if not is_hallucination(segment)]
+
+def segments_confidence(segments):
+    """Duration-weighted mean segment confidence (0.0 for no segments)"""
+    if not segments:
+        return 0.0
+    weights = [max(segment['end'] - segment['start'], 0.1) for segment in segments]
+    total = sum(weight * segment_confidence(segment) for weight, segment in zip(weights, segments))
+    return total / sum(weights)
+
+def trim_repetition(text, max_repeats=2, max_ngram=8):
+    """Collapse a phrase repeated back to back more than `max_repeats` times"""
+    words = text.split()
+    if len(words) <= max_repeats:
+        return text.strip()
+
+    keys = [re.sub(r'[^\w]', '', word.lower()) for word in words]
+    changed = False
+    for n in range(1, max_ngram + 1):
+        i = 0
+        while i + n * (max_repeats + 1) <= len(words):
+            repeats = 1
+            while keys[i + repeats * n:i + (repeats + 1) * n] == keys[i:i + n]:
+                repeats += 1
+            if repeats > max_repeats:
+                del words[i + max_repeats * n:i + repeats * n]
+                del keys[i + max_repeats * n:i + repeats * n]
+                changed = True
+            i += 1
+
+    return ' '.join(words) if changed else text.strip()
+
+def assess_result(result):
+    """Clean a Whisper-style result; returns (text, confidence)"""
+    segments = filter_segments(result.get('segments', []))
+    text = trim_repetition(''.join(segment['text'] for segment in segments))
+    return text, segments_confidence(segments)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Utterance Packer
+Concatenates queued utterances into one 30-second Whisper window and splits the result back
+"""
+
+import numpy as np
+
+WHISPER_WINDOW_SECONDS = 30.0
+
+class UtterancePacker:
+    def __init__(self, sample_rate=16000, max_window_s=WHISPER_WINDOW_SECONDS, separator_s=0.6):
+        self.sample_rate = sample_rate
+        self.max_samples = int(max_window_s * sample_rate)
+        self.separator = np.zeros(int(separator_s * sample_rate), dtype=np.float32)
+
+        self.stats = {'packed_windows': 0, 'packed_utterances': 0}
+
+    def packed_length(self, lengths):
+        """Samples needed to pack utterances of the given lengths"""
+        if not lengths:
+            return 0
+        return sum(lengths) + len(self.separator) * (len(lengths) - 1)
+
+    def fits(self, lengths, extra_length):
+        """True if one more utterance still fits in a single encoder window"""
+        return self.packed_length(list(lengths) + [extra_length]) <= self.max_samples
+
+    def pack(self, audios):
+        """Concatenate utterances with short silences; returns (audio, spans in seconds)"""
+        total = self.packed_length([len(a) for a in audios])
+        packed = np.zeros(total, dtype=np.float32)
+
+        spans = []
+        offset = 0
+        for i, audio in enumerate(audios):
+            if i:
+                offset += len(self.separator)
+            packed[offset:offset + len(audio)] = audio
+            spans.append((offset / self.sample_rate, (offset + len(audio)) / self.sample_rate))
+            offset += len(audio)
+
+        self.stats['packed_windows'] += 1
+        self.stats['packed_utterances'] += len(audios)
+        return packed, spans
+
+    def assign(self, result, spans):
+        """Group the result's words by packed utterance; returns [[(word, segment), ...], ...]
+
+        Words (or whole segments when there are no word timestamps) go to the
+        utterance whose span contains their midpoint, or the nearest one if
+        the midpoint falls into a separator.
+        """
+        groups = [[] for _ in spans]
+        starts = np.array([span[0] for span in spans])
+        ends = np.array([span[1] for span in spans])
+
+        for segment in result.get('segments', []):
+            units = segment.get('words') or [{'word': segment['text'], 'start': segment['start'], 'end': segment['end']}]
+            for unit in units:
+                middle = (unit['start'] + unit['end']) / 2
+                distance = np.maximum(starts - middle, 0) + np.maximum(middle - ends, 0)
+                groups[int(np.argmin(distance))].append((unit, segment))
+
+        return groups
+
+    def split(self, result, spans):
+        """Split a Whisper result back into one text per packed utterance"""
+        return [''.join(unit['word'] for unit, _ in group).strip() for group in self.assign(result, spans)]
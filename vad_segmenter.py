@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Voice Activity Segmenter
+Frame-level VAD that turns the capture stream into utterance-aligned segments
+"""
+
+import numpy as np
+
+from frame_features import FrameFeatureStream
+
+class VADSegmenter:
+    def __init__(self, sample_rate=16000, features=None, energy_threshold=0.01,
+                 noise_ratio=3.0, flatness_threshold=0.45, zcr_threshold=0.35,
+                 hangover_ms=400, min_speech_ms=250, pre_roll_ms=200,
+                 max_utterance_s=15.0, split_search_s=1.5):
+        self.sample_rate = sample_rate
+
+        # Decisions are made per feature hop (10 ms); the features are kept for
+        # the speech gate and speaker detection of the utterances found here
+        self.features = features or FrameFeatureStream(sample_rate=sample_rate)
+        self.frame_length = self.features.hop
+        frame_ms = self.frame_length * 1000 / sample_rate
+
+        # Decision thresholds
+        self.energy_threshold = energy_threshold      # absolute RMS floor
+        self.noise_ratio = noise_ratio                # speech must be this far above the noise floor
+        self.flatness_threshold = flatness_threshold  # noise has a flat spectrum, voiced speech does not
+        self.zcr_threshold = zcr_threshold            # fricatives: high ZCR is fine if energy is clearly up
+
+        # Timing, in frames
+        self.hangover_frames = max(1, int(hangover_ms / frame_ms))
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.pre_roll_frames = int(pre_roll_ms / frame_ms)
+        self.max_utterance_frames = int(max_utterance_s * 1000 / frame_ms)
+        self.split_search_frames = int(split_search_s * 1000 / frame_ms)
+
+        self.reset()
+
+    def reset(self):
+        """Forget all state (call when a new recording starts)"""
+        self.features.reset()
+        self.noise_floor = self.energy_threshold / self.noise_ratio
+
+        self.in_speech = False
+        self.utterance_start = 0      # absolute sample position
+        self.last_segment_end = 0     # pre-roll never reaches back into the previous segment
+        self.last_speech_end = 0      # end of last voiced frame
+        self.silence_run = 0
+        self.speech_frames = 0
+        self.frame_energies = []      # per-frame RMS of the open utterance (for split points)
+
+        self.stats = {'frames': 0, 'speech_frames': 0, 'segments': 0, 'forced_splits': 0, 'discarded': 0}
+
+    def classify(self, rms, zcr, flatness):
+        """Per-frame speech decision"""
+        threshold = np.maximum(self.energy_threshold, self.noise_floor * self.noise_ratio)
+        loud = rms > threshold
+        tonal = flatness < self.flatness_threshold
+        fricative = (zcr > self.zcr_threshold) & (rms > threshold * 2)
+        return loud & (tonal | fricative)
+
+    def process(self, position, samples):
+        """Feed a block of samples at absolute `position`; returns finished (start, end) segments"""
+        features = self.features.process(position, samples)
+        n_frames = len(features)
+        if n_frames == 0:
+            return []
+
+        rms = features.rms
+        is_speech = self.classify(rms, features.zcr, features.flatness)
+
+        # Track the noise floor on non-speech frames
+        quiet = rms[~is_speech]
+        if len(quiet):
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * float(np.median(quiet))
+
+        self.stats['frames'] += n_frames
+        self.stats['speech_frames'] += int(np.count_nonzero(is_speech))
+
+        segments = []
+        for i in range(n_frames):
+            frame_start = (features.first_frame + i) * self.frame_length
+            self._step(frame_start, bool(is_speech[i]), float(rms[i]), segments)
+        return segments
+
+    def _step(self, frame_start, speech, energy, segments):
+        """Advance the speech/silence state machine by one frame"""
+        frame_end = frame_start + self.frame_length
+
+        if not self.in_speech:
+            if speech:
+                self.in_speech = True
+                pre_roll = self.pre_roll_frames * self.frame_length
+                self.utterance_start = max(self.last_segment_end, frame_start - pre_roll)
+                self.last_speech_end = frame_end
+                self.silence_run = 0
+                self.speech_frames = 1
+                self.frame_energies = [energy]
+            return
+
+        self.frame_energies.append(energy)
+        if speech:
+            self.last_speech_end = frame_end
+            self.silence_run = 0
+            self.speech_frames += 1
+        else:
+            self.silence_run += 1
+
+        if self.silence_run >= self.hangover_frames:
+            # Keep a little of the trailing silence so final consonants survive
+            tail = min(self.silence_run, self.hangover_frames // 2) * self.frame_length
+            self._close(self.last_speech_end + tail, segments)
+            return
+
+        if len(self.frame_energies) >= self.max_utterance_frames:
+            self._force_split(frame_end, segments)
+
+    def _force_split(self, frame_end, segments):
+        """Cut an over-long utterance at its quietest recent frame"""
+        search = self.frame_energies[-self.split_search_frames:]
+        quietest = int(np.argmin(search))
+        cut_frame = len(self.frame_energies) - len(search) + quietest + 1
+        cut = frame_end - (len(self.frame_energies) - cut_frame) * self.frame_length
+
+        segments.append((self.utterance_start, cut))
+        self.last_segment_end = cut
+        self.stats['segments'] += 1
+        self.stats['forced_splits'] += 1
+
+        # The remainder continues as a new utterance
+        self.utterance_start = cut
+        self.frame_energies = self.frame_energies[cut_frame:]
+        self.speech_frames = len(self.frame_energies)
+
+    def _close(self, end, segments):
+        if self.speech_frames >= self.min_speech_frames:
+            segments.append((self.utterance_start, end))
+            self.last_segment_end = end
+            self.stats['segments'] += 1
+        else:
+            self.stats['discarded'] += 1
+
+        self.in_speech = False
+        self.frame_energies = []
+        self.speech_frames = 0
+        self.silence_run = 0
+
+    def flush(self):
+        """Close any open utterance (call when recording stops)"""
+        segments = []
+        if self.in_speech:
+            self._close(self.last_speech_end, segments)
+        return segments
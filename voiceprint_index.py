@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Voiceprint Index
+On-disk speaker embeddings (memory-mapped float32 matrix + names.json) for recognizing recurring participants
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+class VoiceprintIndex:
+    """One L2-normalized voiceprint row per known person
+
+    Lookup is a single matrix-vector product over the memory-mapped rows.
+    Enrollment folds new utterance embeddings into the person's row as a
+    running mean, so a voiceprint improves with every meeting.
+    """
+
+    def __init__(self, directory="voiceprints", dim=38, threshold=0.9, max_weight=200):
+        self.directory = Path(directory)
+        self.dim = dim
+        self.threshold = threshold    # cosine similarity needed to name a voice
+        self.max_weight = max_weight  # voices drift slowly (microphones, colds) - keep adapting
+
+        self.matrix_path = self.directory / "embeddings.f32"
+        self.names_path = self.directory / "names.json"
+
+        self.names = []
+        self.counts = []
+        self.updated = []
+        self.matrix = None
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Open the index, or start an empty one"""
+        self.directory.mkdir(exist_ok=True)
+        if self.names_path.exists() and self.matrix_path.exists():
+            try:
+                with open(self.names_path, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                if metadata['dim'] != self.dim:
+                    raise ValueError(f"embedding size changed ({metadata['dim']} → {self.dim})")
+                self.names = metadata['names']
+                self.counts = metadata['counts']
+                self.updated = metadata['updated']
+                self._open(metadata['capacity'])
+                return
+            except Exception as e:
+                print(f"⚠ Voiceprint index unusable, starting a new one: {e}")
+                self.names, self.counts, self.updated = [], [], []
+        self._open(16, create=True)
+
+    def _open(self, capacity, create=False):
+        if not create and os.path.getsize(self.matrix_path) != capacity * self.dim * 4:
+            raise ValueError("embeddings file does not match names.json")
+        self.matrix = np.memmap(self.matrix_path, dtype=np.float32, mode='w+' if create else 'r+',
+                                shape=(capacity, self.dim))
+        self.capacity = capacity
+
+    def _grow(self):
+        """Double the matrix file (rows are copied once, lookups stay a single product)"""
+        rows = np.array(self.matrix[:len(self.names)])
+        self.matrix.flush()
+        self.matrix = None  # closes the mapping before the file is recreated
+        self._open(self.capacity * 2, create=True)
+        self.matrix[:len(rows)] = rows
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, embedding):
+        """(name, similarity) of the closest voiceprint; name is None below the threshold"""
+        if not self.names or embedding is None:
+            return None, 0.0
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) + 1e-9)
+        scores = self.matrix[:len(self.names)] @ query
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        return (self.names[best] if score >= self.threshold else None), score
+
+    def enroll(self, name, embedding):
+        """Add an utterance embedding to a person's voiceprint"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector = vector / (np.linalg.norm(vector) + 1e-9)
+
+        if name in self.names:
+            row = self.names.index(name)
+            weight = min(self.counts[row], self.max_weight)
+            merged = self.matrix[row] + (vector - self.matrix[row]) / (weight + 1)
+            self.matrix[row] = merged / (np.linalg.norm(merged) + 1e-9)
+            self.counts[row] += 1
+            self.updated[row] = datetime.now().isoformat()
+            self.dirty = True
+            return
+
+        if len(self.names) >= self.capacity:
+            self._grow()
+        self.matrix[len(self.names)] = vector
+        self.names.append(name)
+        self.counts.append(1)
+        self.updated.append(datetime.now().isoformat())
+        # A new person is written out at once; count updates wait for save()
+        self.save()
+        print(f"🎙 Enrolled voiceprint for {name}")
+
+    def save(self):
+        """Flush the matrix and atomically rewrite the names file"""
+        if self.matrix is None:
+            return
+        self.matrix.flush()
+        metadata = {
+            'dim': self.dim,
+            'capacity': self.capacity,
+            'names': self.names,
+            'counts': self.counts,
+            'updated': self.updated,
+        }
+        temporary = self.names_path.with_suffix('.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        os.replace(temporary, self.names_path)
+        self.dirty = False
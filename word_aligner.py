@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Word Aligner
+Low-priority background pass that adds word timings to already-published transcripts
+"""
+
+import threading
+import time
+
+from audio_queue import BoundedAudioQueue, POLICY_SPILL
+
+class WordAligner:
+    def __init__(self, backend_factory, on_aligned, is_busy=None, max_pending=32):
+        self.backend_factory = backend_factory  # backend_factory() -> loaded backend (its own model) or None
+        self.on_aligned = on_aligned            # on_aligned(key, words), words relative to the audio start
+        self.is_busy = is_busy                  # is_busy() -> True while live transcription needs the CPU
+
+        # Alignment may fall far behind in a busy meeting - spill rather than forget
+        self.queue = BoundedAudioQueue(maxsize=max_pending, policy=POLICY_SPILL)
+        self.backend = None
+        self.thread = None
+        self.running = False
+
+        self.stats = {'submitted': 0, 'aligned': 0, 'failed': 0, 'yield_seconds': 0.0}
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.align_loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, key, audio, text):
+        """Queue a published transcript for word alignment"""
+        if self.running and text:
+            self.stats['submitted'] += 1
+            self.queue.put((key, audio, text))
+
+    def align_loop(self):
+        while self.running:
+            item = self.queue.get(timeout=0.5)
+            if item is None:
+                if self.queue.closed:
+                    break
+                continue
+
+            # Live decoding always goes first
+            waited = time.perf_counter()
+            while self.is_busy and self.is_busy() and self.running:
+                time.sleep(0.2)
+            self.stats['yield_seconds'] += time.perf_counter() - waited
+
+            key, audio, text = item
+            try:
+                if self.backend is None:
+                    self.backend = self.backend_factory()
+                if self.backend is None:
+                    continue
+                words = self.align(audio, text)
+                self.stats['aligned'] += 1
+                self.on_aligned(key, words)
+            except Exception as e:
+                self.stats['failed'] += 1
+                print(f"⚠ Word alignment error: {e}")
+
+    def align(self, audio, text):
+        """Word timings for known text - forced alignment if the backend has it, else a re-decode"""
+        words = self.backend.align(audio, text)
+        if words is None:
+            result = self.backend.transcribe(audio, word_timestamps=True)
+            words = [word for segment in result['segments'] for word in segment.get('words', [])]
+        return [{
+            'word': word['word'],
+            'start': round(float(word['start']), 3),
+            'end': round(float(word['end']), 3),
+            'probability': round(float(word['probability']), 3) if word.get('probability') is not None else None,
+        } for word in words]
+
+    def stop(self, drain_timeout=10.0):
+        """Finish queued alignments for up to `drain_timeout` seconds, then stop"""
+        self.queue.close()
+        deadline = time.time() + drain_timeout
+        while self.thread and self.thread.is_alive() and self.queue.qsize() and time.time() < deadline:
+            time.sleep(0.1)
+
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=5)
+            self.thread = None
+        self.queue.cleanup()
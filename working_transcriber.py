@@ -12,37 +12,44 @@ from datetime import datetime
 import tkinter as tk
 from tkinter import messagebox
 import numpy as np
-import queue
 import json
 
-# Try to import available packages
-try:
-    import pyaudiowpatch as pyaudio
-    AUDIO_AVAILABLE = True
-except ImportError:
-    try:
-        import pyaudio
-        AUDIO_AVAILABLE = True
-    except ImportError:
-        AUDIO_AVAILABLE = False
-
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
+from lazy_imports import has_capability, install_hint, lazy_import
 
-try:
-    import torch
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
+# Optional packages are probed without importing them; heavy modules
+# (torch, whisper, PyAudio) load on first use, after the window is up
+pyaudio = lazy_import('pyaudiowpatch', 'pyaudio')
+AUDIO_AVAILABLE = has_capability('audio') or has_capability('audio_fallback')
+WHISPER_AVAILABLE = has_capability('whisper')
+TORCH_AVAILABLE = has_capability('torch')
 
 from live_transcript_ui import LiveTranscriptUI
+from audio_capture import CallbackAudioCapture
+from audio_queue import BoundedAudioQueue, POLICY_DROP_OLDEST, POLICY_SPILL
+from audio_archive import AudioArchiveWriter
+from inference_scheduler import InferenceScheduler
+from vad_segmenter import VADSegmenter
+from frame_features import FrameFeatureStream
+from speaker_diarizer import OnlineDiarizer
+from voiceprint_index import VoiceprintIndex
+from speaking_timeline import SpeakingTimeline
+from streaming_transcriber import LocalAgreementStreamer
+from utterance_packer import UtterancePacker
+from speech_gate import SpeechGate
+from transcript_quality import assess_result, filter_segments, max_decode_tokens, segment_confidence, trim_repetition
+from meeting_session_manager import MeetingSessionManager
+from asr_backends import create_backend, BACKENDS
+from process_inference import ProcessBackend, thread_budget
+from model_ladder import ModelLadder
+from latency_slo import LatencySLO, LEVEL_FULL
+from word_aligner import WordAligner
+from meeting_rediarizer import rediarize_session
+from meeting_retranscriber import retranscribe_session
 from teams_participant_monitor import TeamsParticipantMonitor
 
 class WorkingAlbanianTranscriber:
-    def __init__(self):
+    def __init__(self, streaming=False, asr_backend='whisper', model_size='base', adaptive_model=False,
+                 latency_target=4.0, final_model=None, inference_processes=0, rediarize=False):
         print("🎭 Starting Albanian Teams Transcriber...")
         
         # Initialize UI first
@@ -58,36 +65,182 @@ class WorkingAlbanianTranscriber:
         # Audio settings
         self.sample_rate = 16000
         self.chunk_size = 1024
-        self.audio_format = pyaudio.paInt16 if AUDIO_AVAILABLE else None
+        self.audio_format = None  # resolved when recording starts (imports PyAudio)
         self.channels = 1
         
         # State
         self.is_recording = False
         self.audio_stream = None
+        self.audio_capture = CallbackAudioCapture(
+            sample_rate=self.sample_rate,
+            channels=self.channels,
+            frames_per_buffer=self.chunk_size
+        )
         self.transcription_thread = None
-        self.audio_queue = queue.Queue()
+        
+        # Captured blocks flow through a bounded queue into the meeting audio archive
+        self.audio_queue = None
+        self.audio_queue_size = 512  # blocks held in memory (~33 s at 1024 samples)
+        self.audio_queue_policy = POLICY_SPILL
+        self.audio_archive = None
+        self.audio_archive_path = None
         
         # Performance settings
-        self.buffer_duration = 3  # seconds of audio to process at once
+        self.max_utterance_duration = 15  # seconds; longer speech is split at its quietest point
+        self.inference_workers = 1  # each extra worker loads its own model
+        self.max_inference_backlog = 8  # utterances waiting for a worker before the oldest is dropped (spilled while the model loads)
+        self.inference_scheduler = None
         self.silence_threshold = 0.01
         self.speaker_count = 0
         
+        # Speakers are told apart by voice (MFCC embeddings), not loudness, and
+        # keep their label for the whole meeting
+        self.diarizer = OnlineDiarizer(sample_rate=self.sample_rate)
+        
+        # Voiceprints of people from earlier meetings name diarized speakers directly
+        try:
+            self.voiceprints = VoiceprintIndex(dim=self.diarizer.centroids.shape[1])
+            if len(self.voiceprints):
+                print(f"🎙 {len(self.voiceprints)} known voiceprints")
+        except OSError as e:
+            print(f"⚠ Voiceprint index not available: {e}")
+            self.voiceprints = None
+        # Only voices a speaking indicator has named are enrolled, and only once
+        # enough of their audio has been seen - a wrong voiceprint outlives the meeting
+        self.confirmed_speakers = set()  # speaker labels named by visual attribution
+        self.pending_voiceprints = {}    # speaker label -> [embeddings, seconds] not yet enrolled
+        self.min_enroll_s = 20.0
+        
+        # Visual "X is speaking" indicators as time intervals, joined to utterances by overlap
+        self.speaking_timeline = SpeakingTimeline()
+        
+        # One STFT pass over the stream gives per-frame energy, ZCR, flatness,
+        # centroid and log-mel; VAD, speech gate and speaker detection share it
+        self.frame_features = FrameFeatureStream(sample_rate=self.sample_rate)
+        
+        # Voice activity detection cuts the stream into whole utterances
+        self.vad = VADSegmenter(
+            sample_rate=self.sample_rate,
+            features=self.frame_features,
+            energy_threshold=self.silence_threshold,
+            max_utterance_s=self.max_utterance_duration
+        )
+        
+        # Streaming mode re-decodes the open utterance every second and shows
+        # words as soon as two consecutive decodes agree on them
+        self.streaming_mode = streaming
+        self.streamer = LocalAgreementStreamer(sample_rate=self.sample_rate)
+        self.stream_entry = None  # UI entry the open utterance's words are appended to
+        
+        # Under backlog, queued utterances share one 30 s Whisper encoder pass
+        self.packer = UtterancePacker(sample_rate=self.sample_rate)
+        
+        # Music, typing and fan noise are rejected before the expensive decode
+        self.speech_gate = SpeechGate(sample_rate=self.sample_rate)
+        
+        # Target end-to-end latency: when transcripts lag further behind, decoding
+        # degrades (greedy, no word timing, merged utterances) until it catches up
+        self.latency_slo = LatencySLO(target_s=latency_target)
+        self.merge_gap = int(1.0 * self.sample_rate)  # utterances closer than this may be merged
+        
+        # Transcripts below this confidence (from Whisper's segment statistics) are dropped
+        self.min_confidence = 0.35
+        
+        # Session record with per-entry confidence and position in the meeting recording
+        self.session_manager = MeetingSessionManager()
+        self.stream_record = None  # streaming words waiting to become one session entry
+        
+        # Live decoding skips word timestamps; this adds them to the session afterwards
+        self.word_aligner = None
+        
+        # Optional post-meeting pass with a larger model over the archived recording
+        self.final_model = final_model
+        self.asr_backend_name = asr_backend
+        # ...and one that re-clusters the speakers over the whole recording
+        self.rediarize = rediarize
+        
         # Participant tracking
         self.current_participants = {}
         self.speaker_participant_map = {}  # Map detected speakers to real participants
         
-        # Initialize Whisper if available
-        self.whisper_model = None
-        if WHISPER_AVAILABLE:
-            try:
-                print("Loading Whisper model...")
-                self.whisper_model = whisper.load_model("base")
-                print("✓ Whisper model loaded")
-            except Exception as e:
-                print(f"⚠ Whisper model failed to load: {e}")
+        # The speech recognition model loads in the background so the UI appears
+        # at once; capture can start and inference workers wait for `model_ready`
+        self.asr_backend = create_backend(asr_backend, model_size=model_size)
+        
+        # Optionally each inference worker runs its model in its own process with
+        # a fixed torch thread budget, away from capture, UI and OCR
+        if inference_processes and self.asr_backend is not None:
+            self.inference_workers = inference_processes
+            # The word aligner's clone runs in one more process of its own
+            threads = thread_budget(inference_processes + 1)
+            extra = {'cpu_threads': threads} if self.asr_backend.name == 'faster-whisper' else {}
+            self.asr_backend = ProcessBackend(self.asr_backend.name, model_size=model_size, threads=threads, **extra)
+            print(f"⚙️ {inference_processes} inference processes × {threads} threads")
+        self.model_ready = threading.Event()
+        self.model_load_seconds = None
+        if self.asr_backend is None:
+            self.streaming_mode = False
+            self.model_ready.set()
+        
+        # Real-time factor (decode time / audio time) drives the optional model ladder
+        self.real_time_factor = None
+        self.model_ladder = None
+        if adaptive_model and self.asr_backend is not None:
+            self.model_ladder = ModelLadder(sizes=('tiny', 'base', 'small'), start=model_size)
+            print(f"📶 Adaptive model ladder: {' → '.join(self.model_ladder.sizes)}")
+        self.ui.update_model_status(self.describe_model_status())
         
         # Connect UI callbacks
         self.setup_ui_callbacks()
+        
+        if not self.model_ready.is_set():
+            threading.Thread(target=self.load_model, daemon=True).start()
+    
+    def load_model(self):
+        """Load and warm up the speech recognition model off the UI thread"""
+        backend = self.asr_backend
+        started = time.perf_counter()
+        try:
+            print(f"Loading {backend.describe()} model in the background...")
+            backend.load()
+            self.ui.update_model_status(f"Warming up {backend.model_size}...")
+            self.warm_up_backend(backend)
+            self.model_load_seconds = time.perf_counter() - started
+            print(f"✓ Speech recognition model ready in {self.model_load_seconds:.1f}s")
+        except Exception as e:
+            print(f"⚠ Speech recognition model failed to load: {e}")
+            self.asr_backend = None
+            self.model_ladder = None
+            self.streaming_mode = False
+        finally:
+            self.model_ready.set()
+            self.update_backlog_policy()
+            self.ui.update_model_status(self.describe_model_status())
+    
+    def update_backlog_policy(self):
+        """Keep every utterance while the model loads; once it can decode, shed the oldest under load"""
+        scheduler = self.inference_scheduler
+        if scheduler is not None:
+            # Dropping during the load would lose the start of the meeting, which
+            # nothing is decoding yet - spill it to disk until the workers catch up
+            scheduler.set_policy(POLICY_DROP_OLDEST if self.model_ready.is_set() else POLICY_SPILL)
+    
+    def wait_for_model(self):
+        """Utterances buffered while the model loads are only transcribed once it is ready"""
+        backlog = self.inference_scheduler.backlog
+        if self.model_ready.is_set() or not backlog:
+            return
+        print(f"⏳ Waiting for the speech model to transcribe {backlog} buffered utterances...")
+        while not self.model_ready.wait(timeout=0.1):
+            # Keep the window responsive - the loader reports its progress through it
+            self.ui.window.update()
+    
+    def warm_up_backend(self, backend):
+        """Decode one second of silence so the first real utterance skips one-off setup costs"""
+        try:
+            backend.transcribe(np.zeros(self.sample_rate, dtype=np.float32), word_timestamps=True)
+        except Exception as e:
+            print(f"⚠ Model warm-up failed: {e}")
     
     def on_participant_event(self, event_type, participant_name, details):
         """Handle participant join/leave/speaking events"""
@@ -102,6 +255,7 @@ class WorkingAlbanianTranscriber:
             message = f"👤 {participant_name} joined the meeting"
             print(f"✅ {message}")
             self.ui.add_transcript_entry("System", message, timestamp)
+            self.session_manager.add_participant(participant_name, timestamp, method='screen')
             
         elif event_type == 'leave':
             if participant_name in self.current_participants:
@@ -109,12 +263,18 @@ class WorkingAlbanianTranscriber:
             message = f"👤 {participant_name} left the meeting"
             print(f"❌ {message}")
             self.ui.add_transcript_entry("System", message, timestamp)
+            self.session_manager.remove_participant(participant_name, timestamp)
             
         elif event_type == 'speaking':
-            # Update last speaking time for speaker detection
-            for participant in self.current_participants:
-                if self.current_participants[participant]['status'] == 'active':
-                    self.current_participants[participant]['last_speaking'] = timestamp
+            # Named indicators go on the speaking timeline; 'unknown' ones carry no attribution
+            active = details.get('active', True) if details else True
+            if details and 'start' in details and 'end' in details:
+                # Tile detection reports the interval itself
+                self.speaking_timeline.observe_interval(participant_name, details['start'], details['end'], active)
+            else:
+                self.speaking_timeline.observe(participant_name, active, timestamp.timestamp())
+            if active and participant_name in self.current_participants:
+                self.current_participants[participant_name]['last_speaking'] = timestamp
     
     def get_likely_speaker_name(self, speaker_id):
         """Map detected speaker to actual participant name"""
@@ -123,27 +283,29 @@ class WorkingAlbanianTranscriber:
             active_participants = [name for name, info in self.current_participants.items() 
                                  if info['status'] == 'active']
             
-            if not active_participants:
-                return speaker_id
-            
             # Simple mapping based on speaker ID
             if speaker_id in self.speaker_participant_map:
                 return self.speaker_participant_map[speaker_id]
             
+            # A voice we know from earlier meetings
+            participant_name = self.recognize_voice(speaker_id, active_participants)
+            if participant_name:
+                self.speaker_participant_map[speaker_id] = participant_name
+                return participant_name
+            
+            if not active_participants:
+                return speaker_id
+            
             # Try to assign speakers to participants
             if len(active_participants) == 1:
                 # Only one participant, likely them
+                # (OCR often misses people, so this guess is never enrolled)
                 participant_name = active_participants[0]
                 self.speaker_participant_map[speaker_id] = participant_name
                 return participant_name
             
-            elif len(active_participants) >= 2:
-                # Multiple participants - assign based on speaker pattern
-                speaker_index = ord(speaker_id[-1]) % len(active_participants) if speaker_id else 0
-                participant_name = active_participants[speaker_index]
-                self.speaker_participant_map[speaker_id] = participant_name
-                return participant_name
-            
+            # Several candidates and an unknown voice - keep the diarizer label
+            # until a voiceprint or visual cue settles it
             return speaker_id
             
         except Exception as e:
@@ -156,11 +318,13 @@ class WorkingAlbanianTranscriber:
         print(f"  Audio capture: {'✓' if AUDIO_AVAILABLE else '✗'}")
         print(f"  Whisper AI: {'✓' if WHISPER_AVAILABLE else '✗'}")
         print(f"  PyTorch: {'✓' if TORCH_AVAILABLE else '✗'}")
+        for name, backend_class in BACKENDS.items():
+            print(f"  ASR backend '{name}': {'✓' if backend_class.is_available() else '✗'}")
         
         if not AUDIO_AVAILABLE:
-            print("  ⚠ Audio capture not available - install pyaudiowpatch")
+            print(f"  ⚠ Audio capture not available - {install_hint('audio')}")
         if not WHISPER_AVAILABLE:
-            print("  ⚠ Whisper not available - install openai-whisper")
+            print(f"  ⚠ Whisper not available - {install_hint('whisper')}")
         
         print()
         
@@ -189,18 +353,49 @@ class WorkingAlbanianTranscriber:
             
             # Initialize audio stream
             self.audio = pyaudio.PyAudio()
+            self.audio_format = pyaudio.paInt16
             
             # Try to find system audio device (for Teams capture)
             device_index = self.find_system_audio_device()
             
-            self.audio_stream = self.audio.open(
-                format=self.audio_format,
-                channels=self.channels,
-                rate=self.sample_rate,
-                input=True,
-                input_device_index=device_index,
-                frames_per_buffer=self.chunk_size
+            # Callback-driven stream writes straight into the capture ring buffer
+            self.audio_stream = self.audio_capture.start(
+                self.audio,
+                device_index=device_index,
+                audio_format=self.audio_format
+            )
+            
+            # Start archiving captured audio
+            self.audio_queue = BoundedAudioQueue(
+                maxsize=self.audio_queue_size,
+                policy=self.audio_queue_policy
+            )
+            self.audio_archive = AudioArchiveWriter(self.audio_queue, sample_rate=self.sample_rate)
+            self.audio_archive_path = self.audio_archive.start()
+            self.session_manager.start_session(audio_path=self.audio_archive_path)
+            
+            # Start the inference workers
+            self.inference_scheduler = InferenceScheduler(
+                handler=self.process_audio_buffer,
+                result_callback=self.handle_transcription_result,
+                num_workers=self.inference_workers,
+                max_backlog=self.max_inference_backlog,
+                worker_init=self.create_inference_context,
+                batch_handler=self.process_audio_batch,
+                can_batch=self.can_pack_job,
+                release_context=self.release_backend,
+                drop_callback=self.handle_dropped_job
+            )
+            self.update_backlog_policy()
+            self.inference_scheduler.start()
+            
+            # Word timings are filled in only while the inference workers are idle
+            self.word_aligner = WordAligner(
+                self.create_alignment_backend,
+                self.handle_alignment,
+                is_busy=lambda: self.inference_scheduler is not None and self.inference_scheduler.backlog > 0
             )
+            self.word_aligner.start()
             
             # Start transcription thread
             self.transcription_thread = threading.Thread(target=self.transcription_loop, daemon=True)
@@ -215,6 +410,8 @@ class WorkingAlbanianTranscriber:
             
             print("🎤 Recording started...")
             self.ui.add_transcript_entry("System", "🎤 Recording started - speak now!", datetime.now())
+            if not self.model_ready.is_set():
+                self.ui.add_transcript_entry("System", "⏳ Speech model still loading - audio is buffered until it is ready", datetime.now())
             
         except Exception as e:
             self.is_recording = False
@@ -245,121 +442,514 @@ class WorkingAlbanianTranscriber:
             return None
     
     def transcription_loop(self):
-        """Main transcription loop with improved performance"""
-        audio_buffer = []
-        last_process_time = time.time()
+        """Main transcription loop: capture blocks -> VAD -> utterance segments"""
+        self.vad.reset()
+        self.diarizer.reset()
+        self.speaker_participant_map = {}
+        self.confirmed_speakers = set()
+        self.pending_voiceprints = {}
+        self.speaking_timeline.reset()
+        self.streamer.reset()
+        self.stream_entry = None
         
         while self.is_recording:
             try:
-                # Read audio data
-                if self.audio_stream:
-                    data = self.audio_stream.read(self.chunk_size, exception_on_overflow=False)
-                    audio_buffer.append(data)
-                    
-                    # Add to queue for real-time processing
-                    self.audio_queue.put(data)
+                # Wait for the next block from the capture callback (no polling)
+                block = self.audio_capture.read_block(self.chunk_size, timeout=0.5)
+                if block is None:
+                    continue
+                
+                position, samples = block
+                
+                # Hand a copy to the archive writer (bounded, never grows without limit)
+                self.audio_queue.put((position, samples))
                 
-                # Process every buffer_duration seconds of audio
-                current_time = time.time()
-                if current_time - last_process_time >= self.buffer_duration:
-                    if audio_buffer:
-                        threading.Thread(target=self.process_audio_buffer, args=(audio_buffer.copy(),), daemon=True).start()
-                        audio_buffer = []
-                        last_process_time = current_time
+                # Only complete utterances reach the transcriber
+                discarded = self.vad.stats['discarded']
+                for start, end in self.vad.process(position, samples):
+                    if self.streaming_mode:
+                        self.submit_stream_request(self.streamer.finish(end))
+                    else:
+                        self.submit_segment(start, end)
                 
-                time.sleep(0.05)  # Reduced sleep for better responsiveness
+                # A blip too short to keep must not leave the streamer's window open
+                if self.streaming_mode and self.vad.stats['discarded'] != discarded:
+                    self.submit_stream_request(self.streamer.discard(position + len(samples)))
+                
+                # Streaming: keep re-decoding the utterance that is still open
+                if self.streaming_mode and self.vad.in_speech:
+                    self.submit_stream_request(
+                        self.streamer.feed(self.vad.utterance_start, position + len(samples))
+                    )
                 
             except Exception as e:
                 print(f"⚠ Transcription error: {e}")
                 time.sleep(0.5)
+        
+        # Recording stopped mid-sentence - transcribe what we have
+        for start, end in self.vad.flush():
+            if self.streaming_mode:
+                self.submit_stream_request(self.streamer.finish(end))
+            else:
+                self.submit_segment(start, end)
+    
+    def submit_segment(self, start, end):
+        """Queue an utterance for transcription"""
+        # The scheduler copies the ring buffer view into its bounded work queue
+        if self.latency_slo.merging and self.inference_scheduler.coalesce(
+                lambda job: self.merge_segment(job, start, end)):
+            self.ui.update_backlog(self.inference_scheduler.backlog)
+            return
+        
+        start, audio = self.audio_capture.window(start, end)
+        if len(audio) == 0:
+            return
+        self.inference_scheduler.submit({
+            'audio': audio,
+            'features': self.frame_features.slice(start, start + len(audio)),
+            'start': start,
+            'end': start + len(audio),
+            'captured_at': self.audio_capture.arrival_time(start + len(audio))
+        })
+        self.ui.update_backlog(self.inference_scheduler.backlog)
+    
+    def merge_segment(self, job, start, end):
+        """Extend a queued utterance to cover the next one (one decode, no separators)"""
+        if job.get('mode') == 'stream' or start - job['end'] > self.merge_gap:
+            return None
+        if end - job['start'] > self.packer.max_samples:
+            return None
+        
+        merged_start, audio = self.audio_capture.window(job['start'], end)
+        if merged_start != job['start'] or len(audio) == 0:
+            return None  # the older audio has already left the ring buffer
+        # captured_at stays with the older utterance so its deadline still counts
+        return dict(job, audio=audio, end=merged_start + len(audio),
+                    features=self.frame_features.slice(merged_start, merged_start + len(audio)))
+    
+    def submit_stream_request(self, request):
+        """Queue a sliding-window decode of the open utterance"""
+        if request is None:
+            return
+        start, audio = self.audio_capture.window(request['start'], request['end'])
+        if len(audio) == 0:
+            return
+        request['start'] = start
+        request['audio'] = audio
+        request['captured_at'] = self.audio_capture.arrival_time(start + len(audio))
+        self.inference_scheduler.submit(request)
+        self.ui.update_backlog(self.inference_scheduler.backlog)
+    
+    def create_inference_context(self, worker_id):
+        """Give each inference worker its own model (backends are not thread-safe)"""
+        # Jobs queue up in the scheduler until the background load finishes
+        self.model_ready.wait()
+        if worker_id == 0 or self.asr_backend is None:
+            return self.asr_backend
+        print(f"Loading {self.asr_backend.describe()} model for worker {worker_id}...")
+        backend = self.asr_backend.clone()
+        backend.load()
+        self.warm_up_backend(backend)
+        return backend
+    
+    def process_audio_buffer(self, job, backend=None):
+        """Transcribe one VAD utterance on an inference worker"""
+        audio_np = job['audio']
+        features = job.get('features')
+        energy = self.utterance_energy(audio_np, features)
+        started = time.perf_counter()
+        
+        if job.get('mode') == 'stream':
+            words = self.transcribe_words(audio_np, backend, job['prompt'])
+            self.record_decode_time(time.perf_counter() - started, len(audio_np))
+            return {'words': words, 'energy': energy}
+        
+        if not self.speech_gate.check(audio_np, backend, features):
+            return None
+        
+        # Lagging utterances are decoded more cheaply (the level follows delivery latency)
+        level = self.latency_slo.level
+        
+        # Transcribe with available method
+        # Segment-level text only - word timings come later from the alignment pass
+        options = dict(self.latency_slo.decode_options(level), word_timestamps=False)
+        text, confidence = self.transcribe_audio(audio_np, backend, options)
+        self.record_decode_time(time.perf_counter() - started, len(audio_np))
+        
+        if text and text.strip() and len(text.strip()) > 3:
+            return {'text': text, 'energy': energy, 'confidence': confidence}
+        return None
+    
+    def utterance_energy(self, audio, features=None):
+        """RMS of an utterance, from its frame features when the VAD already computed them"""
+        if features is not None:
+            return features.overall_rms()
+        # Dot product avoids a squared temporary
+        return float(np.sqrt(np.dot(audio, audio) / max(len(audio), 1)))
+    
+    def can_pack_job(self, jobs, job):
+        """Only whole utterances that still fit in one Whisper window are packed"""
+        if self.asr_backend is None or job.get('mode') == 'stream':
+            return False
+        if any(queued.get('mode') == 'stream' for queued in jobs):
+            return False
+        return self.packer.fits([len(queued['audio']) for queued in jobs], len(job['audio']))
+    
+    def process_audio_batch(self, jobs, backend=None):
+        """Transcribe several backlogged utterances in a single encoder pass"""
+        backend = backend if backend is not None else self.asr_backend
+        
+        # Gated-out utterances keep their slot (None) but are not packed
+        speech_jobs = [job for job in jobs if self.speech_gate.check(job['audio'], backend, job.get('features'))]
+        if not speech_jobs:
+            return [None] * len(jobs)
+        packed, spans = self.packer.pack([job['audio'] for job in speech_jobs])
+        
+        # The oldest utterance sets the quality level; without word timing the
+        # split falls back to segment midpoints
+        level = self.latency_slo.level
+        options = self.latency_slo.decode_options(level)
+        
+        try:
+            started = time.perf_counter()
+            result = backend.transcribe(
+                packed,
+                max_tokens=max_decode_tokens(len(packed) / self.sample_rate),
+                **options
+            )
+            self.record_decode_time(time.perf_counter() - started, sum(len(job['audio']) for job in speech_jobs))
+            
+            # Hallucinated segments go before the split so no utterance inherits them
+            result = dict(result, segments=filter_segments(result.get('segments', [])))
+            decoded = {}
+            for job, group in zip(speech_jobs, self.packer.assign(result, spans)):
+                # A segment can straddle utterances - each word carries its segment's score
+                text = ''.join(unit['word'] for unit, _ in group).strip()
+                confidence = float(np.mean([segment_confidence(segment) for _, segment in group])) if group else 0.0
+                keep = confidence >= self.min_confidence
+                decoded[id(job)] = (trim_repetition(text) if keep else '', confidence)
+        except Exception as e:
+            print(f"⚠ Packed transcription error: {e}")
+            decoded = {id(job): self.transcribe_audio(job['audio'], backend, options) for job in speech_jobs}
+        
+        results = []
+        for job in jobs:
+            audio_np = job['audio']
+            text, confidence = decoded.get(id(job), ('', None))
+            energy = self.utterance_energy(audio_np, job.get('features'))
+            results.append({'text': text, 'energy': energy, 'confidence': confidence} if len(text) > 3 else None)
+        return results
+    
+    def record_decode_time(self, decode_seconds, audio_samples):
+        """Track the real-time factor and let the ladder pick a model that keeps up"""
+        audio_seconds = audio_samples / self.sample_rate
+        if audio_seconds <= 0:
+            return
+        
+        rtf = decode_seconds / audio_seconds
+        self.real_time_factor = rtf if self.real_time_factor is None else 0.8 * self.real_time_factor + 0.2 * rtf
+        
+        if self.model_ladder:
+            # Runs on a worker whose own job still counts in the backlog - only the
+            # jobs waiting behind it say whether the model is keeping up
+            backlog = self.inference_scheduler.queued if self.inference_scheduler else 0
+            target = self.model_ladder.record(decode_seconds, audio_seconds, backlog)
+            if target:
+                threading.Thread(target=self.switch_model_size, args=(target,), daemon=True).start()
+    
+    def switch_model_size(self, model_size):
+        """Load a different model size in the background and hot-swap it into the workers"""
+        previous = self.asr_backend.model_size
+        print(f"📶 Switching model {previous} → {model_size} (RTF {self.real_time_factor:.2f})")
+        try:
+            backends = []
+            for worker_id in range(self.inference_workers):
+                backend = self.asr_backend.clone(model_size=model_size)
+                backend.load()
+                self.warm_up_backend(backend)
+                backends.append(backend)
+            
+            # Workers release their old model themselves once the job in hand is done;
+            # closing it here could pull it out from under a running decode
+            old_backend = self.asr_backend
+            scheduled = []
+            if self.inference_scheduler:
+                scheduled = list(self.inference_scheduler.contexts.values())
+                for worker_id, backend in enumerate(backends):
+                    self.inference_scheduler.set_context(worker_id, backend)
+            self.asr_backend = backends[0]
+            if not any(backend is old_backend for backend in scheduled):
+                self.release_backend(old_backend)
+            self.model_ladder.complete_switch(model_size, success=True)
+            print(f"✓ Now transcribing with {self.asr_backend.describe()}")
+        except Exception as e:
+            print(f"⚠ Model switch failed: {e}")
+            self.model_ladder.complete_switch(model_size, success=False)
     
-    def process_audio_buffer(self, audio_buffer):
-        """Process accumulated audio buffer with enhanced features"""
+    def release_backend(self, backend):
+        """Shut down a backend that owns an inference process (no-op for in-process models)"""
+        if backend is not None and hasattr(backend, 'close'):
+            backend.close()
+    
+    def describe_model_status(self):
+        """Short model / speed summary for the UI"""
+        if self.asr_backend is None:
+            return "Unavailable"
+        if not self.model_ready.is_set():
+            return f"Loading {self.asr_backend.model_size}..."
+        status = self.asr_backend.model_size
+        if self.real_time_factor is not None:
+            status += f" · RTF {self.real_time_factor:.2f}"
+        if self.latency_slo.level != LEVEL_FULL:
+            status += f" · {self.latency_slo.describe()}"
+        return status
+    
+    def handle_transcription_result(self, job, result):
+        """Publish a finished utterance - called in capture order"""
+        self.ui.update_backlog(self.inference_scheduler.backlog if self.inference_scheduler else 0)
+        self.ui.update_model_status(self.describe_model_status())
+        if job.get('mode') == 'stream':
+            # A failed decode still answers the streamer, or it waits for it forever
+            self.handle_stream_result(job, result or {'words': []})
+            return
+        if not result:
+            return
+        
+        # End-to-end latency: speech end to transcript on screen
+        self.latency_slo.observe(time.time() - job['captured_at'])
+        
         try:
-            # Convert audio buffer to numpy array
-            audio_data = b''.join(audio_buffer)
-            audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+            text = result['text']
             
-            # Check for silence
-            energy = np.sqrt(np.mean(audio_np ** 2))
-            if energy < self.silence_threshold:
-                return
+            # Simple speaker detection based on audio characteristics
+            speaker_id = self.detect_speaker(job['audio'], text, job.get('features'))
             
-            # Transcribe with available method
-            text = self.transcribe_audio(audio_np)
+            # Whoever's speaking indicator covered the utterance wins; otherwise
+            # map the voice to actual participant name if available
+            visual_name = self.visual_speaker(speaker_id, job['start'], job['end'])
+            speaker_name = visual_name or self.get_likely_speaker_name(speaker_id)
+            self.enroll_voiceprint(speaker_id, speaker_name, visual_name,
+                                   (job['end'] - job['start']) / self.sample_rate)
+            
+            print(f"🎯 [{speaker_name}] {text}")
+            timestamp = datetime.now()
+            self.ui.add_transcript_entry(speaker_name, text, timestamp)
+            entry = self.session_manager.add_transcript_entry(
+                speaker_name, text, timestamp,
+                confidence=result['confidence'],
+                audio_start=job['start'] / self.sample_rate,
+                audio_end=job['end'] / self.sample_rate
+            )
+            if entry and self.word_aligner:
+                self.word_aligner.submit((entry['entry_id'], entry['audio_start']), job['audio'], text)
+            
+            # Update statistics
+            self.ui.update_session_stats(len(text.split()), (result['confidence'] or 0) * 100)
             
-            if text and text.strip() and len(text.strip()) > 3:
-                # Simple speaker detection based on audio characteristics
-                speaker_id = self.detect_speaker(audio_np, text)
-                
-                # Map to actual participant name if available
-                speaker_name = self.get_likely_speaker_name(speaker_id)
-                
-                print(f"🎯 [{speaker_name}] {text}")
-                self.ui.add_transcript_entry(speaker_name, text, datetime.now())
-                
-                # Update statistics
-                self.ui.update_session_stats(len(text.split()), energy * 100)
-                
         except Exception as e:
             print(f"⚠ Audio processing error: {e}")
     
-    def detect_speaker(self, audio_data, text):
-        """Simple speaker detection based on audio characteristics"""
+    def handle_dropped_job(self, job):
+        """The backlog discarded a job before it was decoded - called in capture order"""
+        if job.get('mode') == 'stream':
+            self.handle_stream_result(job, {'words': []})
+    
+    def handle_stream_result(self, job, result):
+        """Show newly agreed words, continuing the utterance's transcript entry"""
         try:
-            # Basic speaker detection using audio energy and frequency
-            energy = np.sqrt(np.mean(audio_data ** 2))
-            
-            # Simple heuristic: higher energy usually means different speaker
-            if energy > 0.05:
-                speaker_id = "Speaker A"
-            elif energy > 0.02:
-                speaker_id = "Speaker B" 
-            else:
-                speaker_id = "Speaker C"
+            committed = self.streamer.on_result(job, result['words'])
+            if committed:
+                text = ''.join(w['word'] for w in committed).strip()
+                transcript = self.ui.transcript_data
+                if self.stream_entry is not None and transcript and transcript[-1] is self.stream_entry:
+                    self.ui.append_transcript_text(text)
+                else:
+                    # First words of the utterance, or a system message got in between
+                    self.record_stream_entry()
+                    speaker_id = self.detect_speaker(job['audio'], text, job.get('features'))
+                    visual_name = self.visual_speaker(speaker_id, job['start'], job['start'] + len(job['audio']))
+                    speaker_name = visual_name or self.get_likely_speaker_name(speaker_id)
+                    self.enroll_voiceprint(speaker_id, speaker_name, visual_name,
+                                           len(job['audio']) / self.sample_rate)
+                    timestamp = datetime.now()
+                    self.ui.add_transcript_entry(speaker_name, text, timestamp)
+                    self.stream_entry = transcript[-1]
+                    self.stream_record = {'speaker': speaker_name, 'timestamp': timestamp, 'words': []}
+                self.stream_record['words'].extend(committed)
                 
-            return speaker_id
+                probabilities = [w['probability'] for w in committed if w.get('probability') is not None]
+                print(f"🎯 {text}")
+                self.ui.update_session_stats(len(text.split()), np.mean(probabilities) * 100 if probabilities else 0)
+            
+            if job['final']:
+                self.stream_entry = None
+                self.record_stream_entry()
+                
+        except Exception as e:
+            print(f"⚠ Streaming result error: {e}")
+    
+    def record_stream_entry(self):
+        """Add the finished streaming utterance to the session as one entry"""
+        record, self.stream_record = self.stream_record, None
+        if not record or not record['words']:
+            return
+        
+        words = record['words']
+        probabilities = [w['probability'] for w in words if w.get('probability') is not None]
+        self.session_manager.add_transcript_entry(
+            record['speaker'],
+            ''.join(w['word'] for w in words).strip(),
+            record['timestamp'],
+            confidence=float(np.mean(probabilities)) if probabilities else None,
+            audio_start=words[0]['start'] / self.sample_rate,
+            audio_end=words[-1]['end'] / self.sample_rate,
+            # Streaming decodes already have word timings
+            words=[{
+                'word': w['word'],
+                'start': round(w['start'] / self.sample_rate, 3),
+                'end': round(w['end'] / self.sample_rate, 3),
+                'probability': w.get('probability')
+            } for w in words]
+        )
+    
+    def create_alignment_backend(self):
+        """The aligner's own model, so alignment never blocks a live decode"""
+        self.model_ready.wait()
+        if self.asr_backend is None:
+            return None
+        backend = self.asr_backend.clone()
+        backend.load()
+        return backend
+    
+    def handle_alignment(self, key, words):
+        """Store word timings (seconds into the meeting recording) on their session entry"""
+        entry_id, audio_start = key
+        for word in words:
+            word['start'] = round(audio_start + word['start'], 3)
+            word['end'] = round(audio_start + word['end'], 3)
+        self.session_manager.update_transcript_entry(entry_id, words=words)
+    
+    def visual_speaker(self, speaker_id, start, end):
+        """Participant whose visual speaking indicator overlapped the utterance most, or None
+
+        A visual match also names the diarized voice if it has no name yet.
+        """
+        name = self.speaking_timeline.attribute(
+            self.audio_capture.position_to_time(start),
+            self.audio_capture.position_to_time(end)
+        )
+        if name is None:
+            return None
+        if speaker_id not in self.speaker_participant_map and name not in self.speaker_participant_map.values():
+            self.speaker_participant_map[speaker_id] = name
+            self.confirmed_speakers.add(speaker_id)
+        elif self.speaker_participant_map.get(speaker_id) == name:
+            # An earlier guess (voiceprint, lone participant) now seen on screen
+            self.confirmed_speakers.add(speaker_id)
+        return name
+    
+    def recognize_voice(self, speaker_id, active_participants):
+        """Name from the voiceprint index for a diarized speaker, if one matches"""
+        if not self.voiceprints or not len(self.voiceprints):
+            return None
+        name, _ = self.voiceprints.lookup(self.diarizer.centroid(speaker_id))
+        if name is None or (active_participants and name not in active_participants):
+            return None
+        if name in self.speaker_participant_map.values():
+            return None  # already speaking under another label
+        return name
+    
+    def enroll_voiceprint(self, speaker_id, speaker_name, visual_name, duration_s):
+        """Learn the voice of a confirmed speaker from the utterance just labelled
+
+        Enrolls only utterances whose own speaking indicator agrees with the
+        voice's name, and holds them back until `min_enroll_s` seconds of the
+        voice have been confirmed that way.
+        """
+        embedding = self.diarizer.last_embedding
+        if not self.voiceprints or embedding is None or speaker_id not in self.confirmed_speakers:
+            return
+        if visual_name is None or visual_name != speaker_name:
+            return  # no independent visual agreement for this utterance
+        if self.speaker_participant_map.get(speaker_id) != speaker_name:
+            return  # this utterance was attributed to someone else
+        
+        pending = self.pending_voiceprints.setdefault(speaker_id, [[], 0.0])
+        pending[0].append(embedding)
+        pending[1] += duration_s
+        if pending[1] < self.min_enroll_s:
+            return
+        try:
+            for embedding in pending[0]:
+                self.voiceprints.enroll(speaker_name, embedding)
+            pending[0] = []
+        except OSError as e:
+            print(f"⚠ Voiceprint enrollment error: {e}")
+    
+    def detect_speaker(self, audio_data, text, features=None):
+        """Label the utterance's speaker with the online diarizer"""
+        try:
+            # Called in capture order, so the centroid table follows the meeting as it happens
+            return self.diarizer.assign(audio_data, features)
             
         except:
             self.speaker_count += 1
             return f"Speaker {self.speaker_count}"
     
-    def transcribe_audio(self, audio_data):
-        """Transcribe audio using available method with optimizations"""
+    def transcribe_audio(self, audio_data, backend=None, options=None):
+        """Transcribe audio using available method with optimizations; returns (text, confidence)"""
+        backend = backend if backend is not None else self.asr_backend
+        options = options or self.latency_slo.decode_options(LEVEL_FULL)
         try:
-            if self.whisper_model is not None:
-                # Use Whisper for high-quality transcription
-                result = self.whisper_model.transcribe(
-                    audio_data, 
-                    language='sq',  # Albanian
-                    fp16=False,     # Better compatibility
-                    temperature=0.0, # More deterministic
-                    word_timestamps=True,
-                    condition_on_previous_text=True
+            if backend is not None:
+                # Use the configured ASR backend for high-quality transcription;
+                # the token cap stops repetition loops long before Whisper's own limit
+                result = backend.transcribe(
+                    audio_data,
+                    condition_on_previous_text=True,
+                    max_tokens=max_decode_tokens(len(audio_data) / self.sample_rate),
+                    **options
                 )
                 
-                # Extract text and confidence
-                text = result['text'].strip()
-                confidence = getattr(result, 'confidence', 0.8)
+                # Drop hallucinated segments, collapse repeats, score the rest
+                text, confidence = assess_result(result)
                 
                 # Filter out low confidence or very short transcriptions
-                if confidence > 0.5 and len(text) > 2:
-                    return text
-                return ""
+                if confidence >= self.min_confidence and len(text) > 2:
+                    return text, confidence
+                return "", confidence
                 
             else:
                 # Fallback to basic speech recognition
-                return self.fallback_transcription(audio_data)
+                return self.fallback_transcription(audio_data), None
                 
         except Exception as e:
             print(f"⚠ Transcription error: {e}")
-            return self.fallback_transcription(audio_data)
+            return self.fallback_transcription(audio_data), None
+    
+    def transcribe_words(self, audio_data, backend=None, prompt=None):
+        """Decode audio into words with timestamps (seconds from the audio start)"""
+        backend = backend if backend is not None else self.asr_backend
+        if backend is None:
+            return []
+        try:
+            result = backend.transcribe(
+                audio_data,
+                word_timestamps=True,
+                initial_prompt=prompt or None,
+                max_tokens=max_decode_tokens(len(audio_data) / self.sample_rate)
+            )
+            segments = filter_segments(result['segments'])
+            return [word for segment in segments for word in segment.get('words', [])]
+        except Exception as e:
+            print(f"⚠ Streaming transcription error: {e}")
+            return []
     
     def fallback_transcription(self, audio_data):
         """Fallback transcription method"""
         try:
             # Simple energy-based voice activity detection
-            energy = np.sqrt(np.mean(audio_data ** 2))
+            energy = np.sqrt(np.dot(audio_data, audio_data) / max(len(audio_data), 1))
             if energy > 0.01:  # Threshold for voice activity
                 return f"[Audio detected - energy: {energy:.3f}]"
             return ""
@@ -370,10 +960,94 @@ class WorkingAlbanianTranscriber:
         """Stop recording and transcription"""
         self.is_recording = False
         
+        if self.transcription_thread:
+            self.transcription_thread.join(timeout=2)
+            self.transcription_thread = None
+        
         if self.audio_stream:
-            self.audio_stream.stop_stream()
-            self.audio_stream.close()
+            self.audio_capture.stop()
             self.audio_stream = None
+            
+            stats = self.audio_capture.get_stats()
+            print(f"📊 Capture: {stats['frames_captured']} frames, "
+                  f"{stats['input_overflows']} overflows, {stats['ring_overruns']} overruns, "
+                  f"{stats['reader_underruns']} underruns")
+        
+        if self.inference_scheduler:
+            self.wait_for_model()
+            self.inference_scheduler.stop()
+            inference_stats = self.inference_scheduler.get_stats()
+            print(f"📊 Inference: {inference_stats['processed']} utterances, "
+                  f"{inference_stats['batched_jobs']} packed into {inference_stats['batches']} windows, "
+                  f"{inference_stats['dropped']} dropped, {inference_stats['busy_seconds']:.1f}s busy")
+            
+            # Speculative decoding: draft acceptance across all worker models
+            decode_stats = [stats for stats in (backend.get_stats() for backend in self.inference_scheduler.contexts.values()
+                                                if hasattr(backend, 'get_stats')) if stats]
+            if decode_stats:
+                drafted = sum(stats['drafted'] for stats in decode_stats)
+                accepted = sum(stats['accepted'] for stats in decode_stats)
+                tokens = sum(stats['tokens'] for stats in decode_stats)
+                passes = sum(stats['target_passes'] for stats in decode_stats)
+                print(f"📊 Speculative decoding: {accepted / max(drafted, 1):.0%} of {drafted} drafted tokens "
+                      f"accepted, {tokens / max(passes, 1):.1f} tokens per target pass")
+            
+            # Worker processes end with the recording; the main model stays loaded
+            for backend in self.inference_scheduler.contexts.values():
+                if backend is not self.asr_backend:
+                    self.release_backend(backend)
+            self.inference_scheduler = None
+            self.ui.update_backlog(0)
+            
+            slo_stats = self.latency_slo.stats
+            print(f"📊 Latency: {slo_stats['late']} of {slo_stats['observations']} checks over "
+                  f"{self.latency_slo.target:.0f}s, max {slo_stats['max_latency']:.1f}s, "
+                  f"{slo_stats['escalations']} degradations, {slo_stats['recoveries']} recoveries")
+            
+            gate_stats = self.speech_gate.stats
+            print(f"📊 Speech gate: {gate_stats['rejected'] + gate_stats['probe_rejected']} of "
+                  f"{gate_stats['checked']} utterances skipped as non-speech "
+                  f"({gate_stats['probed']} needed the Whisper probe)")
+            
+            diarizer_stats = self.diarizer.get_stats()
+            print(f"📊 Speakers: {diarizer_stats['speakers']} voices in {diarizer_stats['embedded']} of "
+                  f"{diarizer_stats['utterances']} utterances long enough to embed")
+            timeline_stats = self.speaking_timeline.stats
+            if timeline_stats['observations']:
+                print(f"📊 Visual attribution: {timeline_stats['attributed']} of "
+                      f"{timeline_stats['attributed'] + timeline_stats['unattributed']} utterances matched "
+                      f"a speaking indicator")
+            if self.voiceprints and self.voiceprints.dirty:
+                self.voiceprints.save()
+        
+        if self.streaming_mode:
+            self.record_stream_entry()
+        
+        if self.word_aligner:
+            self.word_aligner.stop()
+            self.release_backend(self.word_aligner.backend)
+            align_stats = self.word_aligner.stats
+            print(f"📊 Word alignment: {align_stats['aligned']} of {align_stats['submitted']} entries, "
+                  f"{align_stats['failed']} failed")
+            self.word_aligner = None
+        self.session_manager.end_session()
+        
+        # The recording must be complete on disk before any post-meeting pass reads it
+        if self.audio_archive:
+            self.audio_archive.stop()
+            queue_stats = self.audio_queue.get_stats()
+            print(f"📊 Audio queue ({queue_stats['policy']}): high water {queue_stats['high_water']}, "
+                  f"dropped {queue_stats['dropped_oldest'] + queue_stats['dropped_newest'] + queue_stats['block_timeouts']}, "
+                  f"spilled {queue_stats['spilled']}")
+            self.audio_queue.cleanup()
+            self.audio_archive = None
+        
+        if (self.final_model or self.rediarize) and self.session_manager.session_file:
+            # Not a daemon: the final transcript is worth waiting for on exit
+            threading.Thread(
+                target=self.run_post_meeting_passes,
+                args=(self.session_manager.session_file,)
+            ).start()
         
         if hasattr(self, 'audio'):
             self.audio.terminate()
@@ -384,6 +1058,41 @@ class WorkingAlbanianTranscriber:
         print("⏹️ Recording stopped")
         self.ui.add_transcript_entry("System", "⏹️ Recording stopped", datetime.now())
     
+    def run_post_meeting_passes(self, session_file):
+        """Final transcript first, then speakers - both rewrite the saved session in turn"""
+        if self.final_model:
+            self.run_final_transcription(session_file)
+        if self.rediarize:
+            self.run_rediarization(session_file)
+    
+    def run_rediarization(self, session_file):
+        """Re-cluster the speakers over the whole recording and relabel the saved session"""
+        self.ui.add_transcript_entry("System", "🔁 Re-identifying speakers over the whole meeting...", datetime.now())
+        try:
+            session = rediarize_session(session_file)
+            summary = session.get('rediarization', {})
+            self.ui.add_transcript_entry(
+                "System",
+                f"✓ Speakers updated: {summary.get('entries_relabelled', 0)} entries relabelled",
+                datetime.now()
+            )
+        except Exception as e:
+            print(f"⚠ Re-diarization failed: {e}")
+    
+    def run_final_transcription(self, session_file):
+        """Re-transcribe the meeting with the final model and merge it into the saved session"""
+        self.ui.add_transcript_entry("System", f"🔁 Building final transcript with the {self.final_model} model...", datetime.now())
+        try:
+            session = retranscribe_session(session_file, model_size=self.final_model, backend_name=self.asr_backend_name)
+            summary = session.get('retranscription', {})
+            self.ui.add_transcript_entry(
+                "System",
+                f"✓ Final transcript saved: {summary.get('entries_revised', 0)} entries improved",
+                datetime.now()
+            )
+        except Exception as e:
+            print(f"⚠ Final transcription failed: {e}")
+    
     def run(self):
         """Start the application"""
         try: